@@ -0,0 +1,26 @@
+# 掉落配置 (修改后调用 data.item_data.rebuild_loot_tables() 重新编译掉落表)
+
+# 默认稀有度权重 (装备 / 细胞 / 核心 / 技能通用)
+DEFAULT_RARITY_WEIGHTS = {'white': 50, 'green': 30, 'blue': 15, 'purple': 4, 'orange': 1}
+
+# 普通怪 / 精英怪掉落物品的概率
+ENEMY_DROP_CHANCE = 0.05
+ELITE_DROP_CHANCE = 1.0  # Elites always drop something
+
+# 怪物掉落的物品类别权重
+ENEMY_DROP_CATEGORY_WEIGHTS = {
+    'other': 40,      # food/potion
+    'equipment': 30,
+    'skill': 20,
+    'cell': 10,       # core
+}
+
+# 宝箱稀有度 -> 装备稀有度
+CHEST_RARITY_MAP = {
+    'white': 'white',
+    'green': 'green',
+    'blue': 'blue',
+    'purple': 'purple',
+    'gold': 'orange',
+    'orange': 'orange'
+}
@@ -33,6 +33,7 @@ ITEMS_IMG_DIR = os.path.join(SPRITES_DIR, "items")
 UI_IMG_DIR = os.path.join(SPRITES_DIR, "ui")
 PROJECTILE_IMG_DIR = os.path.join(SPRITES_DIR, "projectile")
 VIDEO_DIR = os.path.join(ASSETS_DIR, "videos")
+DATA_DIR = resource_path("data")
 
 # Core Assets
 CORE_IMG_DIR = os.path.join(SPRITES_DIR, "cores")
@@ -80,6 +81,16 @@ DEFAULT_CONFIG = {
     'theme': 'light', # light, dark
     'attack_sfx_enabled': True, # 攻击音效开关
     'tutorial_completed': False, # 新手教学完成状态
+    'save_format': 'binary', # 存档格式: binary (.sav) / json (.json)
+    'compress_saves': True, # 二进制存档使用 zlib 压缩
+    'compact_saves': False, # JSON 存档不缩进 (体积更小, 写入更快)
+    'autosave_enabled': True, # 自动存档
+    'autosave_interval': 60.0, # 自动存档间隔 (秒)
+    'autosave_compact_every': 10, # 每隔多少次差分存档写一次完整存档
+    'autosave_enemies_per_frame': 200, # 自动存档每帧最多采集的敌人数量
+    'autosave_objects_per_frame': 200, # 自动存档每帧最多采集的掉落物 / 子弹数量
+    'floating_text_cap': 80, # 同屏飘字上限 (超出时优先保留暴击和大数字)
+    'damage_text_merge_window': 0.3, # 同一目标在这段时间 (秒) 内的伤害合并为一个数字
     'key_bindings': {
         'basic_attack': MOUSE_LEFT, # 普通攻击
         'up': pygame.K_w,
@@ -98,6 +109,7 @@ DEFAULT_CONFIG = {
 
 # 全局配置变量
 CONFIG_FILE = "config.json"
+CONFIG_READONLY = False # 录像回放时置为 True, 避免回放改写本地配置
 game_config = copy.deepcopy(DEFAULT_CONFIG)
 
 def load_config():
@@ -125,6 +137,8 @@ def load_config():
             print(f"Error loading config: {e}")
 
 def save_config():
+    if CONFIG_READONLY:
+        return
     try:
         with open(CONFIG_FILE, 'w') as f:
             json.dump(game_config, f, indent=4)
@@ -362,17 +376,18 @@ def get_font(size):
     # 最后使用默认字体
     return pygame.font.Font(None, size)
 
-font = None
-small_font = None
-medium_font = None
-title_font = None
+FONT_SIZES = {'font': 36, 'small_font': 24, 'medium_font': 28, 'title_font': 60}
 
 def init_fonts():
     global font, small_font, medium_font, title_font
-    font = get_font(36)
-    small_font = get_font(24)
-    medium_font = get_font(28)
-    title_font = get_font(60)
+    font = get_font(FONT_SIZES['font'])
+    small_font = get_font(FONT_SIZES['small_font'])
+    medium_font = get_font(FONT_SIZES['medium_font'])
+    title_font = get_font(FONT_SIZES['title_font'])
 
-# Initialize fonts immediately
-init_fonts()
+def __getattr__(name):
+    # 字体在第一次使用 settings.font 等时才加载 (查找系统字体较慢, 不放在导入阶段)
+    if name in FONT_SIZES:
+        init_fonts()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
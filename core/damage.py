@@ -1,4 +1,5 @@
 import random
+import numpy as np
 
 def calculate_crit_multiplier(attacker):
     """
@@ -22,6 +23,99 @@ def calculate_crit_multiplier(attacker):
         
     return crit_multiplier, is_crit
 
+def snapshot_attacker(attacker):
+    """
+    读取攻击者的结算属性 (穿透 / 暴击 / 伤害加成)。
+    批量结算时对同一攻击者只读取一次。
+    """
+    attacker_stats = {}
+    if attacker:
+        attacker_stats['phys_pen'] = getattr(attacker, 'phys_pen', 0)
+        attacker_stats['magic_pen'] = getattr(attacker, 'magic_pen', 0)
+        attacker_stats['crit_chance'] = getattr(attacker, 'crit_chance', 0)
+        attacker_stats['crit_dmg'] = getattr(attacker, 'crit_dmg', 150)
+        attacker_stats['damage_bonus'] = getattr(attacker, 'damage_bonus', 0)
+    return attacker_stats
+
+def snapshot_targets(targets, damage_type):
+    """
+    读取一组目标在该伤害类型下的 (防御数组, 百分比减免数组)。
+    碰撞伤害按物理防御计算, 并叠加碰撞减免 (与 calculate_damage 一致)。
+    """
+    is_collision = (damage_type == 'collision')
+    calc_type = 'physical' if is_collision else damage_type
+    
+    defenses = np.zeros(len(targets))
+    reductions = np.zeros(len(targets))
+    for i, target in enumerate(targets):
+        if calc_type == 'physical':
+            defenses[i] = getattr(target, 'phys_def', 0)
+        elif calc_type == 'magic':
+            defenses[i] = getattr(target, 'magic_def', 0)
+        reductions[i] = getattr(target, 'final_damage_reduction', 0)
+        if is_collision:
+            reductions[i] += getattr(target, 'collision_damage_reduction', 0)
+    return defenses, reductions
+
+def calculate_damage_batch(base_amounts, damage_type, defenses, reductions, attacker_stats=None):
+    """
+    批量伤害结算 (AoE / 连锁等一次命中多个目标的场景)
+    
+    与 calculate_damage 的 6 步顺序完全一致, 只是按目标向量化:
+    base_amounts: 基础伤害, 标量或与目标数相同长度的数组
+    defenses / reductions: snapshot_targets() 的结果
+    attacker_stats: snapshot_attacker() 的结果, None 表示无攻击者 (无穿透 / 暴击 / 加成)
+    
+    返回 (伤害 int 数组, 暴击 bool 数组)
+    """
+    attacker_stats = attacker_stats or {}
+    defenses = np.asarray(defenses, dtype=float)
+    count = len(defenses)
+    base = np.broadcast_to(np.asarray(base_amounts, dtype=float), (count,))
+    bonus = attacker_stats.get('damage_bonus', 0)
+    
+    # 特殊规则：真实伤害, 直接进入第 6 步
+    if damage_type == 'true':
+        final_damage = base * (1 + bonus / 100.0)
+        return final_damage.astype(np.int64), np.zeros(count, dtype=bool)
+    
+    # Step 1: 基础伤害确定 (base_amounts)
+    calc_type = 'physical' if damage_type == 'collision' else damage_type
+    
+    # Step 2: 穿透计算 (Effective Def = max(0, Def - Pen))
+    penetration = 0
+    if calc_type == 'physical':
+        penetration = attacker_stats.get('phys_pen', 0)
+    elif calc_type == 'magic':
+        penetration = attacker_stats.get('magic_pen', 0)
+    effective_defense = np.maximum(0, defenses - penetration)
+    
+    # Step 3: 数值防御结算 (Actual = max(1, Base - Eff_Def))
+    actual_damage = np.maximum(1, base - effective_defense)
+    
+    # Step 4: 百分比减免 (Max 60%)
+    reduction_pct = np.minimum(60, np.asarray(reductions, dtype=float))
+    reduced_damage = actual_damage * (1 - reduction_pct / 100.0)
+    
+    # Step 5: 暴击计算 (每个目标独立判定, 使用 random 以保证录像回放一致)
+    crit_mask = np.zeros(count, dtype=bool)
+    crit_multiplier = 1.0
+    if attacker_stats:
+        crit_chance = attacker_stats.get('crit_chance', 0)
+        crit_dmg_base = attacker_stats.get('crit_dmg', 150)
+        if crit_chance > 100:
+            crit_dmg_base += (crit_chance - 100) * 10
+            crit_chance = 100
+        rolls = np.array([random.uniform(0, 100) for _ in range(count)])
+        crit_mask = rolls <= crit_chance
+        crit_multiplier = np.where(crit_mask, crit_dmg_base / 100.0, 1.0)
+    crit_damage_val = reduced_damage * crit_multiplier
+    
+    # Step 6: 伤害加成 (最终乘区)
+    final_damage = crit_damage_val * (1 + bonus / 100.0)
+    
+    return final_damage.astype(np.int64), crit_mask
+
 def calculate_damage(base_amount, damage_type, target, attacker=None):
     """
     伤害结算核心逻辑 (Balance Anchor Implementation)
@@ -38,13 +132,7 @@ def calculate_damage(base_amount, damage_type, target, attacker=None):
     
     # 获取必要的属性
     # Attacker stats
-    attacker_stats = {}
-    if attacker:
-        attacker_stats['phys_pen'] = getattr(attacker, 'phys_pen', 0)
-        attacker_stats['magic_pen'] = getattr(attacker, 'magic_pen', 0)
-        attacker_stats['crit_chance'] = getattr(attacker, 'crit_chance', 0)
-        attacker_stats['crit_dmg'] = getattr(attacker, 'crit_dmg', 150)
-        attacker_stats['damage_bonus'] = getattr(attacker, 'damage_bonus', 0)
+    attacker_stats = snapshot_attacker(attacker)
     
     # Target stats
     target_stats = {}
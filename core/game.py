@@ -5,6 +5,8 @@ import math
 import random
 import json
 import datetime
+import time
+import functools
 
 # Ensure project root is on sys.path when running this file directly.
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -19,37 +21,27 @@ if PROJECT_ROOT not in sys.path:
 import config.game_config as settings
 from config.game_config import GameState, CHARACTERS, game_config, save_config, DEFAULT_CONFIG, MOUSE_LEFT, MOUSE_RIGHT, MOUSE_MIDDLE
 from entities.player import Player
-from entities.pickup import Pickup, XPOrb
+from entities.pickup import Pickup, XPOrb, pickup_from_save_data
+from entities.projectile import Projectile, MeleeSwing
+from ui.trail import Trail
 from core.map import MapManager
 from entities.interactables import Chest
 from systems.combat_system import EnemyManager
 from ui.renderer import GameRenderer
 from ui.widgets import Camera, Button, CharacterCard, Slider, SaveSlotButton, ThemeButton, KeybindButton
-from data.item_data import SKILL_ITEMS, EQUIPMENT_ITEMS, OTHER_ITEMS, CELL_ITEMS, ENEMY_INFO, REACTION_INFO, get_item_by_id
-from core.item import SkillItem
+from data.item_data import SKILL_ITEMS, EQUIPMENT_ITEMS, OTHER_ITEMS, CELL_ITEMS, EQUIPMENT_TEMPLATES, get_item_by_id
+from core.item import SkillItem, Equipment
 from systems.upgrade_system import upgrade_system
 from systems.mission_system import MissionManager
-from utils.debug import DevManager
+from systems.save_system import save_writer, SaveSlotStore, encode_save, encode_json_save, SAVE_VERSION
+from systems.autosave_system import AutosaveManager
+from systems.pickup_system import PickupManager
 from utils.sound_manager import SoundManager
 from utils.resource_manager import resource_manager
+from utils.input_manager import input_manager
 from data.attributes import STATS
-from data.changelog import CHANGELOG_DATA
-
-class FloatingText:
-    def __init__(self, x, y, text, color):
-        self.pos = pygame.math.Vector2(x, y)
-        self.text = text
-        self.color = color
-        self.timer = 0
-        self.duration = 1.0
-        self.vel = pygame.math.Vector2(random.uniform(-50, 50), -100)
-    
-    def update(self, dt):
-        self.timer += dt
-        self.pos += self.vel * dt
-        
-    def is_alive(self):
-        return self.timer < self.duration
+from utils.startup_profiler import startup_profiler
+from ui.floating_text import FloatingText, FloatingTextManager
 
 class GameManager:
     def __init__(self):
@@ -62,27 +54,33 @@ class GameManager:
         self.splash_duration_hold = 1.0 # Hold time (s)
         self.splash_alpha = 0
         
-        pygame.init()
-        flags = pygame.FULLSCREEN if game_config['fullscreen'] else 0
-        self.screen = pygame.display.set_mode((settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT), flags)
-        pygame.display.set_caption("方块的升级")
+        with startup_profiler.section("pygame.init + display"):
+            pygame.init()
+            flags = pygame.FULLSCREEN if game_config['fullscreen'] else 0
+            self.screen = pygame.display.set_mode((settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT), flags)
+            pygame.display.set_caption("方块的升级")
         
         # Initialize Resource Manager
         print("Initializing ResourceManager...")
-        resource_manager.initialize()
+        with startup_profiler.section("ResourceManager"):
+            resource_manager.initialize()
         
         self.clock = pygame.time.Clock()
-        self.sound_manager = SoundManager()
-        self.renderer = GameRenderer(self.screen)
+        with startup_profiler.section("SoundManager"):
+            self.sound_manager = SoundManager()
+        with startup_profiler.section("GameRenderer"):
+            self.renderer = GameRenderer(self.screen)
         self.mission_manager = MissionManager(self)
         
-        self.floating_texts = []
+        self.floating_text_manager = FloatingTextManager()
         
         self.save_dir = os.path.join(os.getcwd(), "saves")
         if not os.path.exists(self.save_dir):
             os.makedirs(self.save_dir)
         self.save_slots = [None] * 3 
-        self.load_saves() 
+        with startup_profiler.section("load_saves"):
+            self.load_saves() 
+        self.autosave_manager = AutosaveManager(self.save_dir)
 
         self.rebinding_action = None 
 
@@ -92,7 +90,7 @@ class GameManager:
         self.camera = self.renderer.camera
         self.map_manager = MapManager()
         self.enemy_manager = EnemyManager()
-        self.pickups = []
+        self.pickup_manager = PickupManager()
         
         self.game_time = 0
         self.tutorial_step = 0
@@ -107,7 +105,7 @@ class GameManager:
         self.show_stats_panel = False # 统计面板开关
         self.destruction_count = 0 # Track destroyed objects for Heart drop
         self.dev_mode = False # 开发者模式
-        self.dev_manager = DevManager(self)
+        self._dev_manager = None
         
         # Guide
         self.guide_tabs = ['skills', 'equipment', 'cores', 'reactions', 'enemies', 'drops']
@@ -124,9 +122,18 @@ class GameManager:
         except ValueError:
             self.current_res_index = 0
 
-        self.init_ui()
+        with startup_profiler.section("init_ui"):
+            self.init_ui()
+
+    @property
+    def dev_manager(self):
+        # 开发者工具第一次打开时才导入
+        if self._dev_manager is None:
+            from utils.debug import DevManager
+            self._dev_manager = DevManager(self)
+        return self._dev_manager
 
-    def spawn_damage_text(self, pos, amount, damage_type='physical', is_player_damage=False):
+    def spawn_damage_text(self, pos, amount, damage_type='physical', is_player_damage=False, is_crit=False):
         color = (200, 200, 200) 
         
         if is_player_damage:
@@ -136,12 +143,11 @@ class GameManager:
             elif damage_type == 'true': color = (255, 215, 0) 
             elif damage_type == 'physical': color = (230, 230, 230) 
         
-        amount_int = int(amount)
-        if amount_int > 0:
-            self.floating_texts.append(FloatingText(pos.x, pos.y, str(amount_int), color))
+        # 同一目标短时间内的伤害合并显示
+        self.floating_text_manager.spawn_damage(pos, amount, color, is_crit)
 
     def spawn_floating_text(self, pos, text, color):
-        self.floating_texts.append(FloatingText(pos.x, pos.y, text, color))
+        self.floating_text_manager.spawn_text(pos, text, color)
 
     def show_error_message(self, text):
         # Center of screen or above player
@@ -179,22 +185,14 @@ class GameManager:
                         from entities.pickup import Pickup
                         # Use generic Pickup for Item
                         p = Pickup(obj.pos.x, obj.pos.y, 'item', item=item)
-                        self.pickups.append(p)
+                        self.pickup_manager.add(p)
                         self.spawn_floating_text(obj.pos, "掉落: 基因药水", (255, 215, 0))
                         self.sound_manager.play_sound("ui_upgrade") # Use upgrade sound for special drop
 
     def load_saves(self):
-        for i in range(3):
-            path = os.path.join(self.save_dir, f"save_{i}.json")
-            if os.path.exists(path):
-                try:
-                    with open(path, 'r', encoding='utf-8') as f:
-                        self.save_slots[i] = json.load(f)
-                except Exception as e:
-                    print(f"Error loading save {i}: {e}")
-                    self.save_slots[i] = None
-            else:
-                self.save_slots[i] = None
+        # 只读取存档索引 (头部信息), 完整存档在读档时才解析
+        self.save_store = SaveSlotStore(self.save_dir, len(self.save_slots))
+        self.save_slots = self.save_store.get_headers()
 
     def _serialize_item(self, item):
         if item is None:
@@ -210,13 +208,22 @@ class GameManager:
             return get_item_by_id(data)
         if isinstance(data, dict):
             item_id = data.get('id')
-            return get_item_by_id(item_id)
+            if 'main_stat' in data and item_id in EQUIPMENT_TEMPLATES:
+                item = Equipment.from_dict(data, EQUIPMENT_TEMPLATES[item_id])
+            else:
+                item = get_item_by_id(item_id)
+            if item:
+                item.count = data.get('count', 1)
+                item.devour_progress = data.get('devour_progress', 0)
+                item.awakened_level = data.get('awakened_level', 0)
+            return item
         return None
 
-    def save_game_to_slot(self, slot_index):
-        if not self.player: return
-        
-        data = {
+    def build_save_snapshot(self, include_objects=True):
+        # 在主线程生成快照: 只包含基础类型, 之后交给后台线程序列化
+        # include_objects=False 时敌人 / 掉落物 / 子弹列表留空, 由调用方按 get_deferred_save_sources() 分帧采集 (自动存档)
+        return {
+            "save_version": SAVE_VERSION,
             "timestamp": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             "game_time": self.game_time,
             "char_id": self.player.data['id'],
@@ -224,7 +231,7 @@ class GameManager:
             "level": self.player.level,
             "current_xp": self.player.current_xp,
             "xp_to_next_level": self.player.xp_to_next_level,
-            "stats": self.player.stats,
+            "stats": dict(self.player.stats),
             "current_hp": self.player.current_hp,
             "current_mp": self.player.current_mp,
             "pos": (self.player.pos.x, self.player.pos.y),
@@ -238,22 +245,90 @@ class GameManager:
             },
             "destruction_count": self.destruction_count,
             "camera_pos": (self.camera.pos.x, self.camera.pos.y),
-            "enemies": self.enemy_manager.get_save_data()
+            "enemies": self.enemy_manager.get_save_data() if include_objects else [],
+            "world": self.build_world_snapshot(include_objects)
+        }
+
+    def build_world_snapshot(self, include_objects=True):
+        # 地图只保存种子 + 区块差异; 随机数状态一起保存, 读档后的后续过程与存档时一致
+        return {
+            "map": self.map_manager.get_save_data(),
+            "pickups": [self._serialize_pickup(p) for p in self.pickup_manager] if include_objects else [],
+            "projectiles": [p.get_save_data() for p in self.player.projectiles] if include_objects else [],
+            "melee_attacks": [m.get_save_data() for m in self.player.melee_attacks],
+            "enemy_projectiles": [p.get_save_data() for p in self.enemy_manager.enemy_projectiles] if include_objects else [],
+            "mission": self.mission_manager.get_save_data(),
+            "spawn_director": self.enemy_manager.spawn_director.get_save_data(),
+            "rng_state": random.getstate()
         }
+
+    def _serialize_pickup(self, pickup):
+        return pickup.get_save_data(self._serialize_item)
+
+    def get_deferred_save_sources(self):
+        """
+        build_save_snapshot(include_objects=False) 留空的对象列表:
+        [(快照中的路径, 取当前列表的函数, 序列化函数, 是否保存的判断)]
+        """
+        return [
+            (('enemies',), lambda: self.enemy_manager.enemies, self.enemy_manager.get_enemy_save_data,
+             lambda e: e.alive and not e.is_dying),
+            (('world', 'pickups'), lambda: self.pickup_manager.pickups, self._serialize_pickup, None),
+            (('world', 'projectiles'), lambda: self.player.projectiles, lambda p: p.get_save_data(), None),
+            (('world', 'enemy_projectiles'), lambda: self.enemy_manager.enemy_projectiles, lambda p: p.get_save_data(), None),
+        ]
+
+    def load_world_snapshot(self, world):
+        self.map_manager.load_from_data(world['map'])
+        self.pickup_manager.clear()
+        for p in world.get('pickups', []):
+            self.pickup_manager.add(pickup_from_save_data(p, self._deserialize_item), merge=False)
+        self.player.projectiles = [self._load_projectile(p, self.player) for p in world.get('projectiles', [])]
+        self.player.melee_attacks = [MeleeSwing.from_save_data(m, self.player) for m in world.get('melee_attacks', [])]
+        self.enemy_manager.enemy_projectiles = [self._load_projectile(p) for p in world.get('enemy_projectiles', [])]
+        self.mission_manager.load_from_data(world.get('mission', {}))
+        self.enemy_manager.spawn_director.load_from_data(world.get('spawn_director', {}))
+        if world.get('rng_state'):
+            version, state, gauss_next = world['rng_state']
+            random.setstate((version, tuple(state), gauss_next))
+
+    def _load_projectile(self, data, owner=None):
+        cls = Trail if data.get('class') == 'Trail' else Projectile
+        return cls.from_save_data(data, owner)
+
+    def save_game_to_slot(self, slot_index):
+        if not self.player: return
         
-        path = os.path.join(self.save_dir, f"save_{slot_index}.json")
-        try:
-            with open(path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-            print(f"Game saved to slot {slot_index}")
-            self.save_slots[slot_index] = data 
-        except Exception as e:
-            print(f"Error saving game: {e}")
+        data = self.build_save_snapshot()
+        if game_config.get('save_format', 'binary') == 'json':
+            path = self.save_store.slot_path(slot_index, ".json")
+            encode = functools.partial(encode_json_save, compact=game_config.get('compact_saves', False))
+        else:
+            path = self.save_store.slot_path(slot_index, ".sav")
+            encode = functools.partial(encode_save, compress=game_config.get('compress_saves', True))
+
+        def on_saved(path, error):
+            if error is None:
+                self.save_store.on_save_written(slot_index, path)
+                print(f"Game saved to slot {slot_index}")
+
+        save_writer.submit(path, data, encode=encode, on_done=on_saved)
+        self.save_store.record_save(slot_index, data)
+        self.save_slots[slot_index] = self.save_store.get_header(slot_index)
 
     def load_game_from_slot(self, slot_index):
-        data = self.save_slots[slot_index]
+        data = self.save_store.load(slot_index)
         if not data: return
-        
+        self.load_game_from_data(data)
+        print(f"Game loaded from slot {slot_index}")
+
+    def load_autosave(self):
+        data = self.autosave_manager.load()
+        if not data: return
+        self.load_game_from_data(data)
+        print("Game loaded from autosave")
+
+    def load_game_from_data(self, data):
         char_id = data['char_id']
         char_data = next((c for c in CHARACTERS if c['id'] == char_id), None)
         if not char_data:
@@ -265,7 +340,7 @@ class GameManager:
         self.player.current_xp = data.get('current_xp', 0)
         self.player.xp_to_next_level = data.get('xp_to_next_level', 100)
         
-        self.player.stats = data['stats']
+        self.player.stats = dict(data['stats'])
         self.player.current_hp = data['current_hp']
         self.player.current_mp = data['current_mp']
         self.player.pos = pygame.math.Vector2(data['pos'][0], data['pos'][1])
@@ -290,6 +365,9 @@ class GameManager:
             if 'heart_slot' in inv_state:
                 self.player.inventory.heart_slot = self._deserialize_item(inv_state['heart_slot'])
 
+        # stats / 细胞是整体替换的, 刷新属性缓存
+        self.player.invalidate_stats()
+
         self.destruction_count = data.get('destruction_count', 0)
 
         self.camera.pos = pygame.math.Vector2(data['camera_pos'][0], data['camera_pos'][1])
@@ -298,12 +376,14 @@ class GameManager:
         if 'enemies' in data:
             self.enemy_manager.load_from_data(data['enemies'])
             
-        self.pickups = []
+        self.pickup_manager.clear()
+        self.mission_manager = MissionManager(self)
         self.game_time = data.get('game_time', 0)
+        if 'world' in data:
+            self.load_world_snapshot(data['world'])
         
         self.state = GameState.GAME
         self.sound_manager.play_game_bgm()
-        print(f"Game loaded from slot {slot_index}")
 
     def layout_buttons_centered(self, buttons, start_y, gap):
         for i, btn in enumerate(buttons):
@@ -441,6 +521,8 @@ class GameManager:
         tab = self.guide_tabs[self.guide_tab_index]
         self.guide_items = []
         
+        # 图鉴数据只在打开图鉴时导入
+        from data.guide_data import ENEMY_INFO, REACTION_INFO
         if tab == 'reactions':
              # Reactions are hardcoded for now or we iterate REACTION_INFO
              self.guide_items = list(REACTION_INFO.values())
@@ -461,7 +543,7 @@ class GameManager:
         self.game_time = 0
         self.map_manager = MapManager() # Reset map
         self.enemy_manager = EnemyManager() 
-        self.pickups = []
+        self.pickup_manager.clear()
         
         # Reset Mission Manager
         self.mission_manager = MissionManager(self)
@@ -518,7 +600,7 @@ class GameManager:
             self.trigger_level_up(skip_anim=True)
 
     def handle_input(self):
-        events = pygame.event.get()
+        events = input_manager.get_events()
         for event in events:
             if event.type == pygame.QUIT:
                 self.running = False
@@ -593,6 +675,12 @@ class GameManager:
                                 btn.center_horizontal(settings.SCREEN_WIDTH)
                                 btn.rect.y = start_y + i * 120
                                 self.save_load_buttons.append(btn)
+                            autosave_data = self.autosave_manager.get_header()
+                            if autosave_data:
+                                btn = SaveSlotButton(0, 0, 400, 100, None, autosave_data, "load_autosave", title="自动存档")
+                                btn.center_horizontal(settings.SCREEN_WIDTH)
+                                btn.rect.y = start_y + len(self.save_slots) * 120
+                                self.save_load_buttons.append(btn)
                         elif action == "guide_from_menu":
                             self.state = GameState.GUIDE
                             self.guide_from_menu = True
@@ -760,6 +848,8 @@ class GameManager:
                         slot_index = int(action.split("_")[-1])
                         if self.save_slots[slot_index]: 
                             self.load_game_from_slot(slot_index)
+                    elif action == "load_autosave":
+                        self.load_autosave()
 
             elif self.state == GameState.SETTINGS:
                 if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
@@ -866,7 +956,7 @@ class GameManager:
                     start_x = (settings.SCREEN_WIDTH - total_w) // 2
                     start_y = (settings.SCREEN_HEIGHT - card_h) // 2
                     
-                    mouse_pos = pygame.mouse.get_pos()
+                    mouse_pos = input_manager.get_mouse_pos()
                     
                     for i, upgrade in enumerate(self.upgrade_choices):
                         x = start_x + i * (card_w + gap)
@@ -990,6 +1080,8 @@ class GameManager:
                         self.state = GameState.MENU
 
     def update(self, dt):
+        # 实际帧时间 (刷怪导演据此调整压力)
+        frame_ms = dt
         # Apply Game Speed
         dt = dt * self.game_speed
         dt_sec = dt / 1000.0
@@ -1002,6 +1094,13 @@ class GameManager:
                 self.state = GameState.MENU
                 self.sound_manager.play_menu_bgm()
 
+        if self.state == GameState.LOAD_GAME:
+            # 悬停在存档槽位上时提前在后台读取完整存档
+            mouse_pos = input_manager.get_mouse_pos()
+            for btn in self.save_load_buttons:
+                if btn.slot_index is not None and btn.save_data and btn.rect.collidepoint(mouse_pos):
+                    self.save_store.prefetch(btn.slot_index)
+
         if self.state == GameState.GAME:
             if self.player:
                 self.player.update(dt)
@@ -1018,6 +1117,7 @@ class GameManager:
                 # Update Ambience based on biome
                 biome = self.map_manager.get_biome_at(self.player.pos)
                 self.sound_manager.set_ambience(biome)
+                self.sound_manager.set_listener(self.player.pos)
                 
                 # Pass map_manager to player update for accurate footsteps? 
                 # Or just update footsteps here?
@@ -1034,34 +1134,39 @@ class GameManager:
                 
                 self.mission_manager.update(dt)
 
-                self.enemy_manager.update(dt, self.player, self, game_time_min, self.map_manager, self.spawn_damage_text, on_destroy_callback=self.on_object_destroyed)
+                self.enemy_manager.update(dt, self.player, self, game_time_min, self.map_manager, self.spawn_damage_text, on_destroy_callback=self.on_object_destroyed, frame_ms=frame_ms)
                 
                 if self.player.current_hp <= 0:
                     self.state = GameState.GAME_OVER
                     self.game_over_timer = 0
                     self.sound_manager.play_sound("death")
                     print("Game Over")
-
-                pickup_range = self.player.pickup_range
-                for p in self.pickups[:]:
-                    if p.update(dt_sec, self.player.pos, pickup_range):
+                else:
+                    self.autosave_manager.update(dt_sec, self)
+
+                collected = self.pickup_manager.update(dt_sec, self.player.pos, self.player.pickup_range)
+                if collected:
+                    # 本帧拾取的经验一次结算
+                    removed = []
+                    xp_total = 0
+                    for p in collected:
                         if p.type == 'xp':
-                            self.sound_manager.play_sound("xp_pickup")
-                            if self.player.gain_xp(p.amount):
-                                self.trigger_level_up()
-                            self.pickups.remove(p)
+                            xp_total += p.amount
+                            removed.append(p)
                         elif p.type == 'item':
                             if self.player.inventory.add_item(p.item):
-                                self.floating_texts.append(FloatingText(self.player.pos.x, self.player.pos.y - 50, f"获得 {p.item.name}", (255, 255, 0)))
-                                self.pickups.remove(p)
+                                self.spawn_floating_text(self.player.pos - pygame.math.Vector2(0, 50), f"获得 {p.item.name}", (255, 255, 0))
+                                removed.append(p)
                             else:
-                                self.floating_texts.append(FloatingText(self.player.pos.x, self.player.pos.y - 50, "背包已满", (255, 0, 0)))
+                                self.spawn_floating_text(self.player.pos - pygame.math.Vector2(0, 50), "背包已满", (255, 0, 0))
                                 # Don't remove, let player handle it (maybe move away)
+                    if xp_total:
+                        self.sound_manager.play_sound("xp_pickup")
+                        if self.player.gain_xp(xp_total):
+                            self.trigger_level_up()
+                    self.pickup_manager.remove_many(removed)
 
-                for ft in self.floating_texts[:]:
-                    ft.update(dt_sec)
-                    if not ft.is_alive():
-                        self.floating_texts.remove(ft)
+                self.floating_text_manager.update(dt_sec)
 
         elif self.state == GameState.TUTORIAL:
             # Define dt_sec for tutorial state
@@ -1133,10 +1238,7 @@ class GameManager:
             
             # Update floating texts if any (e.g. from attack)
             dt_sec = dt / 1000.0
-            for ft in self.floating_texts[:]:
-                ft.update(dt_sec)
-                if not ft.is_alive():
-                    self.floating_texts.remove(ft)
+            self.floating_text_manager.update(dt_sec)
 
         elif self.state == GameState.LEVEL_UP_ANIM:
             self.level_up_timer += dt
@@ -1172,10 +1274,11 @@ class GameManager:
             for p in self.enemy_manager.enemy_projectiles:
                 self.renderer.draw_projectile(p)
             
-            for p in self.pickups:
-                self.renderer.draw_pickup(p)
+            bob_offset = self.pickup_manager.bob_offset()
+            for p in self.pickup_manager.get_visible(self.camera):
+                self.renderer.draw_pickup(p, bob_offset)
 
-            self.renderer.draw_floating_texts(self.floating_texts)
+            self.renderer.draw_floating_texts(self.floating_text_manager.texts)
 
             if self.state in [GameState.GAME, GameState.PAUSED, GameState.LEVEL_UP_ANIM, GameState.INVENTORY, GameState.TUTORIAL]:
                  if self.player:
@@ -1265,13 +1368,45 @@ class GameManager:
         elif self.state == GameState.DEV_PANEL:
             self.renderer.draw_dev_panel(self.dev_manager)
 
-    def run(self):
-        while self.running:
-            dt = self.clock.tick(60) 
-            self.handle_input()
-            self.update(dt)
-            self.draw()
-            pygame.display.flip()
-        
+    def run(self, frame_cap=60):
+        self.run_frames(frame_cap)
         pygame.quit()
         sys.exit()
+
+    def run_frames(self, frame_cap=60):
+        """ 主循环, 返回运行的帧数。回放模式下录像播放完毕即返回 """
+        frames = 0
+        try:
+            while self.running:
+                dt = input_manager.begin_frame(self.clock.tick(frame_cap))
+                if dt is None:
+                    break
+                self.handle_input()
+                self.update(dt)
+                # 本帧累积的音效事件统一播放, 并补充音乐 / 环境音流
+                self.sound_manager.flush_events()
+                self.sound_manager.update_streams()
+                self.draw()
+                pygame.display.flip()
+                frames += 1
+        finally:
+            # 崩溃时也要把录像写完整, 方便复现
+            input_manager.stop()
+            # 等待后台存档写完
+            save_writer.flush()
+        return frames
+
+
+def run_replay(path, frame_cap=0):
+    """
+    回放录像文件, 返回 (GameManager, 帧数, 耗时秒)。
+    frame_cap=0 表示不限帧率 (性能测试 / 无窗口回放), 60 为按原速播放。
+    """
+    input_manager.start_replay(path)
+    game = GameManager()
+    start = time.perf_counter()
+    frames = game.run_frames(frame_cap)
+    elapsed = time.perf_counter() - start
+    avg_ms = elapsed * 1000 / frames if frames else 0
+    print(f"[Replay] {path}: {frames} frames in {elapsed:.2f}s (avg {avg_ms:.2f} ms/frame)")
+    return game, frames, elapsed
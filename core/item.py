@@ -27,6 +27,26 @@ class Item:
         elif rarity == 'purple': self.color = (200, 50, 200)
         elif rarity == 'orange': self.color = (255, 165, 0)
 
+    def __getattr__(self, name):
+        # 享元: 实例上没有的字段从模板读取 (只有找不到属性时才会调用)
+        template = self.__dict__.get('template')
+        if template is None:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        return getattr(template, name)
+
+    def create_instance(self):
+        """
+        以当前物品为模板创建实例 (替代 deepcopy)。
+        名称 / 描述 / 技能参数等模板数据共享, 实例只保存可变状态:
+        count, devour_progress, awakened_level (觉醒时写入的 rarity 等也会落在实例上)。
+        """
+        inst = object.__new__(type(self))
+        inst.template = self.__dict__.get('template', self)
+        inst.count = 1
+        inst.devour_progress = 0
+        inst.awakened_level = 0
+        return inst
+
     def to_dict(self):
         return {
             'id': self.id,
@@ -58,6 +78,35 @@ class Equipment(Item):
         
         self.devour_count = 0 # Max 5
 
+    def to_dict(self):
+        # 装备属性是随机生成的, 需要完整保存
+        data = super().to_dict()
+        data.update({
+            'rarity': self.rarity,
+            'main_stat': self.main_stat,
+            'sub_stats': self.sub_stats,
+            'neg_stats': self.neg_stats,
+            'devour_count': self.devour_count
+        })
+        return data
+
+    @classmethod
+    def from_dict(cls, data, template):
+        main_stat = data.get('main_stat')
+        equip = cls(
+            id=template['id'],
+            name=template['name'],
+            slot_type=template['slot_type'],
+            main_stat=tuple(main_stat) if main_stat else None,
+            sub_stats=[tuple(s) for s in data.get('sub_stats', [])],
+            neg_stats=[tuple(s) for s in data.get('neg_stats', [])],
+            description=template.get('description', ''),
+            rarity=data.get('rarity', 'white'),
+            remark=template.get('remark', '')
+        )
+        equip.devour_count = data.get('devour_count', 0)
+        return equip
+
     @property
     def stats(self):
         """Aggregate all stats for gameplay calculation"""
@@ -17,6 +17,12 @@ from utils.resource_manager import resource_manager
 BIOME_PLAINS = 0
 BIOME_FOREST = 1
 BIOME_VILLAGE = 2
+# 生物群系缓存的最大区块数
+BIOME_CACHE_MAX = 4096
+
+# 区块障碍物差异中的特殊状态
+OBSTACLE_DESTROYED = None
+CHEST_OPENED = 'opened'
 
 class Chunk:
     def __init__(self, cx, cy, chunk_size, grid_size=64, map_manager=None):
@@ -25,6 +31,7 @@ class Chunk:
         self.chunk_size = chunk_size
         self.grid_size = grid_size
         self.obstacles = []
+        self.obstacle_count = 0 # 生成时的障碍物数量 (序号范围)
         self.grid = None # Logical grid for obstacles placement
         self.surface = None # Base generated surface (High Res)
         self.cached_surface = None # Scaled surface for current zoom
@@ -328,8 +335,30 @@ class MapManager:
         self.active_chunks = {} # (cx, cy) -> Chunk
         self.grid_size = 100 
         self.seed = random.randint(0, 999999)
+        # 区块内障碍物的变化 (相对种子生成的初始状态): (cx, cy) -> {障碍物序号: 剩余血量 / OBSTACLE_DESTROYED / CHEST_OPENED}
+        # 区块卸载时写入, 重新加载时还原, 存档只需要保存种子和这份差异
+        self.chunk_deltas = {}
+        # 区块坐标 -> 生物群系 (与种子绑定, 换种子时清空; 超过上限时整体清空)
+        self.biome_cache = {}
 
     def get_biome_at_chunk(self, cx, cy):
+        key = (cx, cy)
+        biome = self.biome_cache.get(key)
+        if biome is None:
+            if len(self.biome_cache) >= BIOME_CACHE_MAX:
+                self.biome_cache.clear()
+            biome = self._compute_biome(cx, cy)
+            self.biome_cache[key] = biome
+        return biome
+
+    def get_chunk_biome(self, cx, cy):
+        """ 已加载的区块直接读 chunk.biome, 否则查缓存 """
+        chunk = self.active_chunks.get((cx, cy))
+        if chunk is not None:
+            return chunk.biome
+        return self.get_biome_at_chunk(cx, cy)
+
+    def _compute_biome(self, cx, cy):
         # Macro Biome Logic using Perlin-like noise
         # We simulate noise by combining sine waves
         # Scale 1: Large continents
@@ -351,12 +380,69 @@ class MapManager:
         chunk = Chunk(cx, cy, self.chunk_size, grid_size=self.grid_size, map_manager=self)
         chunk.generate_ground()
         self.generate_obstacles(chunk)
+        self.apply_chunk_delta(chunk)
         return chunk
 
+    def get_chunk_delta(self, chunk):
+        delta = {}
+        present = set()
+        for obs in chunk.obstacles:
+            present.add(obs.chunk_index)
+            if getattr(obs, 'is_opened', False):
+                delta[obs.chunk_index] = CHEST_OPENED
+            elif obs.current_hp < obs.max_hp:
+                delta[obs.chunk_index] = obs.current_hp
+        if len(present) < chunk.obstacle_count:
+            for i in range(chunk.obstacle_count):
+                if i not in present:
+                    delta[i] = OBSTACLE_DESTROYED
+        return delta
+
+    def store_chunk_delta(self, chunk):
+        delta = self.get_chunk_delta(chunk)
+        if delta:
+            self.chunk_deltas[(chunk.cx, chunk.cy)] = delta
+        else:
+            self.chunk_deltas.pop((chunk.cx, chunk.cy), None)
+
+    def apply_chunk_delta(self, chunk):
+        delta = self.chunk_deltas.get((chunk.cx, chunk.cy))
+        if not delta:
+            return
+        remaining = []
+        for obs in chunk.obstacles:
+            state = delta.get(obs.chunk_index, obs.current_hp)
+            if state is OBSTACLE_DESTROYED:
+                continue
+            if state == CHEST_OPENED:
+                obs.is_opened = True
+            else:
+                obs.current_hp = state
+            remaining.append(obs)
+        chunk.obstacles = remaining
+
+    def get_save_data(self):
+        # 只保存种子 + 每个区块的障碍物差异, 与已破坏物体的数量无关的部分全部由种子重新生成
+        for chunk in self.active_chunks.values():
+            self.store_chunk_delta(chunk)
+        return {
+            'seed': self.seed,
+            'chunks': [[cx, cy, [[i, v] for i, v in delta.items()]] for (cx, cy), delta in self.chunk_deltas.items()]
+        }
+
+    def load_from_data(self, data):
+        self.seed = data['seed']
+        self.biome_cache = {}
+        self.chunk_deltas = {}
+        for cx, cy, entries in data.get('chunks', []):
+            self.chunk_deltas[(cx, cy)] = {i: v for i, v in entries}
+        # 区块在下一次 update 时按新种子重新生成
+        self.active_chunks = {}
+
     def get_biome_at(self, pos):
         cx = int(pos.x // self.chunk_size)
         cy = int(pos.y // self.chunk_size)
-        return self.get_biome_at_chunk(cx, cy)
+        return self.get_chunk_biome(cx, cy)
 
     def generate_obstacles(self, chunk):
         obstacles = []
@@ -460,7 +546,10 @@ class MapManager:
                  chest_y = start_y + rng.uniform(200, self.chunk_size - 200)
                  obstacles.append(Chest(chest_x, chest_y, 'white'))
 
+        for i, obs in enumerate(obstacles):
+            obs.chunk_index = i
         chunk.obstacles = obstacles
+        chunk.obstacle_count = len(obstacles)
 
     def update(self, player_pos):
         cx = int(player_pos.x // self.chunk_size)
@@ -479,6 +568,7 @@ class MapManager:
         # Unload old chunks
         for coords in list(self.active_chunks.keys()):
             if coords not in needed_chunks:
+                self.store_chunk_delta(self.active_chunks[coords])
                 del self.active_chunks[coords]
 
     def draw(self, surface, camera):
@@ -0,0 +1,182 @@
+import os
+import json
+import math
+import functools
+import config.game_config as settings
+
+ENEMY_STATS_PATH = os.path.join(settings.DATA_DIR, "enemy_stats.json")
+
+# 缓存条目上限, 超过后整体清空 (等级无上限, 避免无限增长)
+STAT_TABLE_MAX = 4096
+
+# 敌人属性数据 (enemy_stats.json 的 "enemies" 部分, 文件缺失时使用这里的默认值)
+DEFAULT_ENEMY_STATS = {
+    # Lv1 基础属性与成长: HP = hp * (1 + hp_growth * Wave), Def = def + floor(Wave / def_per_waves)
+    'base': {'hp': 30, 'atk': 6, 'def': 1, 'speed': 220, 'size': 40,
+             'hp_growth': 0.25, 'atk_growth': 0.20, 'def_per_waves': 3, 'xp': 5,
+             'color': [200, 50, 50]},
+    'elite': {'hp_mult': 5.0, 'atk_mult': 1.5, 'size_mult': 1.5, 'xp': 50},
+    # 任务完成次数带来的成长 + 根据玩家最高伤害 / 最高连击的动态调整
+    'mission_growth': {'def': 0.08, 'atk': 0.12, 'hp': 0.05, 'speed': 0.015,
+                       'extra_def_per_damage': 0.00001, 'hp_per_combo': 0.005},
+    'elite_types': {
+        'bone_crusher': {'skill_cooldown': 5.0, 'color': [100, 0, 0], 'name': "碎骨者"},
+        'hunter_eye': {'skill_cooldown': 8.0, 'color': [255, 215, 0], 'name': "猎杀之眼"},
+        'void_whisperer': {'skill_cooldown': 8.0, 'color': [75, 0, 130], 'name': "虚空低语者"},
+    },
+    'types': {
+        # 近战: 物攻每波 +10%
+        'square': {'color': [200, 50, 50], 'hp_mult': 1.2, 'speed_mult': 0.8, 'atk_growth_per_wave': 0.1},
+        # 远程: 攻击间隔每波 -5%, 最多 -60%
+        'triangle': {'color': [200, 200, 50], 'hp_mult': 0.8, 'speed_mult': 1.2, 'is_ranged': True,
+                     'attack_range': 400, 'attack_interval': 1.2,
+                     'interval_reduction_per_wave': 0.05, 'interval_reduction_max': 0.6},
+        # 法师: 只有魔法攻击
+        'circle': {'color': [255, 0, 255], 'hp_mult': 0.6, 'speed_mult': 1.0, 'is_ranged': True,
+                   'attack_range': 350, 'attack_interval': 2.0, 'magic_atk': 10},
+    },
+}
+
+@functools.lru_cache(maxsize=None)
+def load_enemy_stats(path=ENEMY_STATS_PATH):
+    """ 读取 enemy_stats.json (每个路径只读一次, 返回的 dict 不要修改), 文件不存在 / 为空 / 格式错误时返回 {} """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        return json.loads(text) if text.strip() else {}
+    except (OSError, ValueError) as e:
+        print(f"Failed to load enemy stats {path}: {e}")
+        return {}
+
+class EnemyStatTable:
+    """
+    敌人属性表:
+    按 (类型, 等级, 是否精英, 精英类型, 任务完成次数) 缓存计算好的属性块, 生成敌人时直接复制。
+    依赖玩家最高伤害 / 最高连击的两项动态加成变化频繁, 不进缓存, 由 apply_dynamic() 在生成时叠加。
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(EnemyStatTable, cls).__new__(cls)
+            cls._instance.initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self.initialized:
+            return
+        self.initialized = True
+        self.stats = None
+        self.cache = {}
+
+    def load(self, data=None):
+        """ 加载属性数据 (默认读取 enemy_stats.json), 同时清空缓存 """
+        if data is None:
+            data = load_enemy_stats().get('enemies', {})
+        stats = {}
+        for key, default in DEFAULT_ENEMY_STATS.items():
+            section = dict(default)
+            section.update(data.get(key, {}))
+            stats[key] = section
+        self.stats = stats
+        self.cache = {}
+
+    def get(self, enemy_type, wave, is_elite=False, elite_type=None, tier=0):
+        key = (enemy_type, wave, is_elite, elite_type, tier)
+        block = self.cache.get(key)
+        if block is None:
+            if self.stats is None:
+                self.load()
+            if len(self.cache) >= STAT_TABLE_MAX:
+                self.cache.clear()
+            block = self._build(enemy_type, wave, is_elite, elite_type, tier)
+            self.cache[key] = block
+        return block
+
+    def _build(self, enemy_type, wave, is_elite, elite_type, tier):
+        stats = self.stats
+        base = stats['base']
+        max_hp = base['hp'] * (1 + base['hp_growth'] * wave)
+        phys_atk = base['atk'] * (1 + base['atk_growth'] * wave)
+        magic_atk = 0
+        phys_def = base['def'] + math.floor(wave / base['def_per_waves'])
+        magic_def = phys_def
+        speed = base['speed']
+        size = base['size']
+        color = tuple(base['color'])
+
+        if is_elite:
+            elite = stats['elite']
+            max_hp *= elite['hp_mult']
+            phys_atk *= elite['atk_mult']
+            size *= elite['size_mult']
+            xp_value = elite['xp'] * wave
+        else:
+            xp_value = base['xp'] * wave
+
+        if tier:
+            growth = stats['mission_growth']
+            def_growth = 1.0 + tier * growth['def']
+            phys_def *= def_growth
+            magic_def *= def_growth
+            max_hp *= 1.0 + tier * growth['hp']
+            phys_atk *= 1.0 + tier * growth['atk']
+            speed *= 1.0 + tier * growth['speed']
+
+        block = {
+            'skill_cooldown': 0,
+            'name': "",
+            'is_ranged': False,
+            'attack_interval': 2.0,
+            'attack_range': 0,
+            'hp_mult': 1.0,
+            'speed_mult': 1.0,
+        }
+        elite_info = stats['elite_types'].get(elite_type)
+        if elite_info:
+            block['skill_cooldown'] = elite_info['skill_cooldown']
+            block['name'] = elite_info['name']
+            color = tuple(elite_info['color'])
+
+        # 类型颜色覆盖精英类型颜色 (精英在 EnemyManager.spawn_elite 中再整体提亮)
+        info = stats['types'].get(enemy_type)
+        if info:
+            color = tuple(info['color'])
+            block['hp_mult'] = info.get('hp_mult', 1.0)
+            block['speed_mult'] = info.get('speed_mult', 1.0)
+            block['is_ranged'] = info.get('is_ranged', False)
+            block['attack_range'] = info.get('attack_range', 0)
+            block['attack_interval'] = info.get('attack_interval', 2.0)
+            if 'atk_growth_per_wave' in info:
+                phys_atk *= 1.0 + info['atk_growth_per_wave'] * wave
+            if 'interval_reduction_per_wave' in info:
+                reduction = min(info['interval_reduction_max'], info['interval_reduction_per_wave'] * wave)
+                block['attack_interval'] *= 1.0 - reduction
+            if 'magic_atk' in info:
+                magic_atk = info['magic_atk'] * (1 + base['atk_growth'] * wave)
+                phys_atk = 0
+
+        block.update({
+            'max_hp': max_hp * block['hp_mult'],
+            'phys_atk': phys_atk,
+            'magic_atk': magic_atk,
+            'phys_def': phys_def,
+            'magic_def': magic_def,
+            'speed': speed * block['speed_mult'],
+            'size': size,
+            'color': color,
+            'xp_value': xp_value,
+        })
+        return block
+
+    def apply_dynamic(self, enemy, max_damage, max_combo):
+        """ 叠加依赖玩家最高伤害 / 最高连击的动态加成 (防御 + 最高伤害 * 0.001%, 生命 + 最高连击 * 0.5%) """
+        growth = self.stats['mission_growth']
+        extra_def = max_damage * growth['extra_def_per_damage']
+        if extra_def:
+            enemy.phys_def += extra_def
+            enemy.magic_def += extra_def
+        if max_combo:
+            enemy.max_hp *= 1.0 + max_combo * growth['hp_per_combo']
+
+enemy_stat_table = EnemyStatTable()
@@ -0,0 +1,18 @@
+from core.item import Item
+
+# --- Guide Data (只在打开图鉴时导入) ---
+ENEMY_INFO = {
+    'square': Item('square', '正方形战士', 'enemy', '定位: 近战坦克\n特点: 血量高，速度慢\n行为: 持续追踪玩家', 'white'),
+    'triangle': Item('triangle', '三角形射手', 'enemy', '定位: 远程输出\n特点: 射速快，身板脆\n行为: 保持距离射击', 'yellow'), # Yellow rarity as proxy for color
+    'circle': Item('circle', '圆形法师', 'enemy', '定位: 魔法控制\n特点: 带有减速效果\n行为: 发射魔法球', 'purple'),
+}
+
+REACTION_INFO = {
+    'vaporize': Item('reaction_vaporize', '蒸发', 'reaction', '清除状态并造成范围魔法伤害', 'orange', remark='AOE清场'),
+    'overload': Item('reaction_overload', '超载', 'reaction', '造成连锁爆炸伤害，范围大幅增加', 'orange', remark='超远连锁'),
+    'electro_charged': Item('reaction_electro_charged', '感电', 'reaction', '在潮湿敌人间弹射电流伤害', 'orange', remark='持续弹射'),
+}
+# Manually attach recipe for Guide display
+REACTION_INFO['vaporize'].recipe = "火 + 水"
+REACTION_INFO['overload'].recipe = "雷 + 火"
+REACTION_INFO['electro_charged'].recipe = "雷 + 水"
@@ -1,6 +1,9 @@
-import copy
 from core.item import SkillItem, Equipment, ItemType, Item
 from utils.item_generator import generate_equipment
+from utils.random_utils import AliasTable, weighted_choice, clear_alias_cache
+from config.drop_config import DEFAULT_RARITY_WEIGHTS, ENEMY_DROP_CATEGORY_WEIGHTS
+from data.rarity import BASE_RARITY_RATE
+from data.luck import LUCK_SHIFT, LUCK_MAX
 import random
 
 # Skill Definitions
@@ -220,98 +223,111 @@ CELL_ITEMS = {
     'cell_exhaust': Item('cell_exhaust', '尾气细胞', 'cell', '移动路径留下核心效果尾气\n持续触发核心伤害', 'purple'),
 }
 
-ENEMY_INFO = {
-    'square': Item('square', '正方形战士', 'enemy', '定位: 近战坦克\n特点: 血量高，速度慢\n行为: 持续追踪玩家', 'white'),
-    'triangle': Item('triangle', '三角形射手', 'enemy', '定位: 远程输出\n特点: 射速快，身板脆\n行为: 保持距离射击', 'yellow'), # Yellow rarity as proxy for color
-    'circle': Item('circle', '圆形法师', 'enemy', '定位: 魔法控制\n特点: 带有减速效果\n行为: 发射魔法球', 'purple'),
-}
-
-REACTION_INFO = {
-    'vaporize': Item('reaction_vaporize', '蒸发', 'reaction', '清除状态并造成范围魔法伤害', 'orange', remark='AOE清场'),
-    'overload': Item('reaction_overload', '超载', 'reaction', '造成连锁爆炸伤害，范围大幅增加', 'orange', remark='超远连锁'),
-    'electro_charged': Item('reaction_electro_charged', '感电', 'reaction', '在潮湿敌人间弹射电流伤害', 'orange', remark='持续弹射'),
-}
-# Manually attach recipe for Guide display
-REACTION_INFO['vaporize'].recipe = "火 + 水"
-REACTION_INFO['overload'].recipe = "雷 + 火"
-REACTION_INFO['electro_charged'].recipe = "雷 + 水"
-
 def get_item_by_id(item_id):
     item = None
     if item_id in SKILL_ITEMS:
         item = SKILL_ITEMS[item_id]
     elif item_id in EQUIPMENT_TEMPLATES:
-        # Generate a default version (White)
-        item = generate_equipment(EQUIPMENT_TEMPLATES[item_id], rarity='white')
+        # Generate a default version (White), already a fresh instance
+        return generate_equipment(EQUIPMENT_TEMPLATES[item_id], rarity='white')
     elif item_id in OTHER_ITEMS:
         item = OTHER_ITEMS[item_id]
     elif item_id in CELL_ITEMS:
         item = CELL_ITEMS[item_id]
     
     if item:
-        return copy.deepcopy(item)
+        return item.create_instance()
     
     if isinstance(item_id, str):
          return Item(item_id, item_id, 'generic')
          
     return None
 
-def get_random_equipment(rarity_weights=None):
+# --- Compiled Loot Tables ---
+# 候选列表和权重在加载时编译一次, 抽样时只做 O(1) 的别名表查询
+_LOOT_TABLES = {}
+_luck_rarity_cache = {}
+
+def rebuild_loot_tables():
+    """ 物品表或掉落配置变化后调用 (开发工具 / 热重载) """
+    cells_by_rarity = {}
+    cores_by_rarity = {}
+    skills_by_rarity = {}
+    for item_id, item in CELL_ITEMS.items():
+        pools = cores_by_rarity if item_id.startswith('core_') else cells_by_rarity
+        pools.setdefault(item.rarity, []).append(item)
+    for item in SKILL_ITEMS.values():
+        skills_by_rarity.setdefault(item.rarity, []).append(item)
+
+    _LOOT_TABLES['equipment_templates'] = list(EQUIPMENT_TEMPLATES.values())
+    _LOOT_TABLES['cell'] = (cells_by_rarity, [i for items in cells_by_rarity.values() for i in items])
+    _LOOT_TABLES['core'] = (cores_by_rarity, [i for items in cores_by_rarity.values() for i in items])
+    _LOOT_TABLES['skill'] = (skills_by_rarity, list(SKILL_ITEMS.values()))
+    _LOOT_TABLES['enemy_category'] = AliasTable(ENEMY_DROP_CATEGORY_WEIGHTS.keys(), ENEMY_DROP_CATEGORY_WEIGHTS.values())
+    _LOOT_TABLES['enemy_keys'] = {
+        'other': list(OTHER_ITEMS.keys()),
+        'equipment': list(EQUIPMENT_ITEMS.keys()),
+        'skill': list(SKILL_ITEMS.keys()),
+        'cell': list(CELL_ITEMS.keys()),
+    }
+    _luck_rarity_cache.clear()
+    clear_alias_cache()
+
+def get_loot_table(name):
+    return _LOOT_TABLES[name]
+
+def get_luck_rarity_weights(luck):
+    """ 幸运值修正后的稀有度权重, 按幸运值缓存 (返回值只读) """
+    luck = min(luck, LUCK_MAX)
+    weights = _luck_rarity_cache.get(luck)
+    if weights is None:
+        weights = BASE_RARITY_RATE.copy()
+
+        # Luck = 1 -> 1% shift from White, capped at available white rate
+        total_shift = min(luck * 1.0, weights['white'])
+        weights['white'] -= total_shift
+
+        for rarity, factor in LUCK_SHIFT.items():
+            weights[rarity] += luck * factor
+
+        if len(_luck_rarity_cache) >= 256:
+            _luck_rarity_cache.clear()
+        _luck_rarity_cache[luck] = weights
+    return weights
+
+def _resolve_rarity_weights(rarity_weights, luck):
+    if rarity_weights:
+        return rarity_weights
+    if luck is not None:
+        return get_luck_rarity_weights(luck)
+    return DEFAULT_RARITY_WEIGHTS
+
+def _pick_from_pool(pool_name, rarity):
+    by_rarity, fallback = _LOOT_TABLES[pool_name]
+    candidates = by_rarity.get(rarity) or fallback
+    if candidates:
+        return random.choice(candidates).create_instance()
+    return None
+
+def get_random_equipment(rarity_weights=None, luck=None):
     # rarity_weights: dict {'white': int, ...}
-    if not rarity_weights:
-        rarity_weights = {'white': 50, 'green': 30, 'blue': 15, 'purple': 4, 'orange': 1}
-        
-    # Filter items by rarity based on weighted choice
-    rarity = random.choices(list(rarity_weights.keys()), weights=list(rarity_weights.values()), k=1)[0]
+    rarity = weighted_choice(_resolve_rarity_weights(rarity_weights, luck))
     
     # Pick a random template
-    template = random.choice(list(EQUIPMENT_TEMPLATES.values()))
+    template = random.choice(_LOOT_TABLES['equipment_templates'])
     
     return generate_equipment(template, rarity)
 
-def get_random_cell(rarity_weights=None):
-    if not rarity_weights:
-        rarity_weights = {'white': 50, 'green': 30, 'blue': 15, 'purple': 4, 'orange': 1}
-    
-    rarity = random.choices(list(rarity_weights.keys()), weights=list(rarity_weights.values()), k=1)[0]
-    
-    # Filter for Cells (not starting with 'core_')
-    candidates = [item for id, item in CELL_ITEMS.items() if not id.startswith('core_') and item.rarity == rarity]
-    if not candidates:
-        # Fallback to any cell
-        candidates = [item for id, item in CELL_ITEMS.items() if not id.startswith('core_')]
-        
-    if candidates:
-        return copy.deepcopy(random.choice(candidates))
-    return None
+def get_random_cell(rarity_weights=None, luck=None):
+    # Cells: CELL_ITEMS not starting with 'core_', fallback to any cell
+    return _pick_from_pool('cell', weighted_choice(_resolve_rarity_weights(rarity_weights, luck)))
 
-def get_random_core(rarity_weights=None):
-    if not rarity_weights:
-        rarity_weights = {'white': 50, 'green': 30, 'blue': 15, 'purple': 4, 'orange': 1}
-        
-    rarity = random.choices(list(rarity_weights.keys()), weights=list(rarity_weights.values()), k=1)[0]
-    
-    # Filter for Cores (starting with 'core_')
-    candidates = [item for id, item in CELL_ITEMS.items() if id.startswith('core_') and item.rarity == rarity]
-    if not candidates:
-        # Fallback to any core
-        candidates = [item for id, item in CELL_ITEMS.items() if id.startswith('core_')]
-        
-    if candidates:
-        return copy.deepcopy(random.choice(candidates))
-    return None
+def get_random_core(rarity_weights=None, luck=None):
+    # Cores: CELL_ITEMS starting with 'core_', fallback to any core
+    return _pick_from_pool('core', weighted_choice(_resolve_rarity_weights(rarity_weights, luck)))
 
-def get_random_skill(rarity_weights=None):
-    if not rarity_weights:
-        rarity_weights = {'white': 50, 'green': 30, 'blue': 15, 'purple': 4, 'orange': 1}
-        
-    rarity = random.choices(list(rarity_weights.keys()), weights=list(rarity_weights.values()), k=1)[0]
-    
-    # Filter by rarity manually since SKILL_ITEMS has objects with fixed rarity
-    candidates = [item for item in SKILL_ITEMS.values() if item.rarity == rarity]
-    if not candidates:
-        candidates = list(SKILL_ITEMS.values())
-        
-    if candidates:
-        return copy.deepcopy(random.choice(candidates))
-    return None
+def get_random_skill(rarity_weights=None, luck=None):
+    # SKILL_ITEMS has objects with fixed rarity, fallback to any skill
+    return _pick_from_pool('skill', weighted_choice(_resolve_rarity_weights(rarity_weights, luck)))
+
+rebuild_loot_tables()
@@ -3,7 +3,12 @@ import config.game_config as settings
 from core import damage as combat
 
 class Entity:
+    # 下一个实体编号 (存档 / 自动存档差分用来对应同一个敌人 / 掉落物)
+    _next_uid = 1
+
     def __init__(self):
+        self.uid = Entity._next_uid
+        Entity._next_uid += 1
         self.max_hp = 100
         self.current_hp = 100
         # New Stats
@@ -30,6 +35,11 @@ class Entity:
         # Visual effects
         self.flash_timer = 0
 
+    def restore_uid(self, uid):
+        """ 读档时恢复存档中的编号, 之后新建的实体编号不会与它重复 """
+        self.uid = uid
+        Entity._next_uid = max(Entity._next_uid, uid + 1)
+
     def take_damage(self, amount, damage_type='physical', penetration=0, source=None):
         # 真正伤害结算系统
         final_dmg, _ = combat.calculate_damage(amount, damage_type, self, source)
@@ -1,10 +1,78 @@
 import pygame
 import random
 import math
+from enum import IntEnum
 import config.game_config as settings
 from .base_entity import Entity
-from .projectile import Projectile
+from .projectile import Projectile, _is_plain
 from core.map import BIOME_FOREST
+from core import damage as combat
+from data.enemy_stats import enemy_stat_table
+
+# 敌人状态效果: 每种效果一个固定槽位, effect_mask 的对应位表示是否存在
+class StatusType(IntEnum):
+    COMPRESS = 0
+    BURN = 1
+    WET = 2
+    FREEZE = 3
+    SLOW = 4
+    BLEED = 5
+
+STATUS_COUNT = len(StatusType)
+STATUS_BY_NAME = {status.name.lower(): status for status in StatusType}
+
+BIT_COMPRESS = 1 << StatusType.COMPRESS
+BIT_BURN = 1 << StatusType.BURN
+BIT_WET = 1 << StatusType.WET
+BIT_FREEZE = 1 << StatusType.FREEZE
+BIT_SLOW = 1 << StatusType.SLOW
+BIT_BLEED = 1 << StatusType.BLEED
+
+# 持续伤害: 槽位 -> (伤害类型, 每跳伤害 = 系数 * 强度), 每 0.5s 一跳
+DOT_INTERVAL = 0.5
+DOT_RULES = {
+    StatusType.COMPRESS: ('true', 5),
+    StatusType.BURN: ('magic', 10),
+    StatusType.BLEED: ('physical', 5),
+}
+DOT_MASK = BIT_COMPRESS | BIT_BURN | BIT_BLEED
+
+# 精英怪整体提亮 (每个通道 +ELITE_TINT, 最大 255)
+ELITE_TINT = 50
+
+# 存档时单独处理的字段 (Vector2)
+_UNSAVED_FIELDS = ('pos', 'knockback_velocity')
+# 读档后需要转回 tuple 的颜色字段 (JSON 会把 tuple 存成 list)
+_COLOR_FIELDS = ('color', 'base_color', 'status_color')
+
+# 状态颜色, 多个状态同时存在时按此顺序取最后一个
+STATUS_COLORS = [
+    (StatusType.BURN, (255, 100, 0)),
+    (StatusType.WET, (50, 100, 255)), # Blue
+    (StatusType.SLOW, (150, 150, 150)),
+    (StatusType.BLEED, (150, 0, 0)),
+    (StatusType.FREEZE, (100, 100, 255)),
+]
+
+def update_status_effects_batch(enemies, dt_sec, damage_callback=None):
+    """
+    推进所有敌人的状态计时, 并把本帧触发的 DoT 按伤害类型批量结算。
+    正在播放死亡动画的敌人跳过 (与 Enemy.update 中的处理一致)。
+    """
+    ticks = {}
+    for enemy in enemies:
+        if enemy.is_dying:
+            continue
+        if enemy.effect_mask:
+            enemy._advance_status_effects(dt_sec, ticks)
+        enemy._apply_status_modifiers()
+
+    for dmg_type, (targets, amounts) in ticks.items():
+        defenses, reductions = combat.snapshot_targets(targets, dmg_type)
+        damages, _ = combat.calculate_damage_batch(amounts, dmg_type, defenses, reductions)
+        for enemy, raw_dmg, final_dmg in zip(targets, amounts, damages.tolist()):
+            enemy.receive_damage(final_dmg)
+            if damage_callback: damage_callback(enemy.pos, raw_dmg)
 
 class Enemy(Entity):
     def __init__(self, x, y, enemy_type, wave, is_elite=False, mission_stats=None, elite_type=None):
@@ -19,144 +87,32 @@ class Enemy(Entity):
         self.height = self.size
         self.color = (200, 50, 50) # Red-ish
         
-        # New Stats System (0.0.5)
-        # Base Stats (Lv1)
-        base_hp = 30
-        base_atk = 6
-        base_def = 1
-        base_speed = 220
-        
-        # Growth Formulas
-        # HP = Base * (1 + 0.25 * Wave)
-        self.max_hp = base_hp * (1 + 0.25 * wave)
-        
-        # Atk = Base * (1 + 0.2 * Wave)
-        self.phys_atk = base_atk * (1 + 0.20 * wave)
-        self.magic_atk = 0 # Default 0
-        
-        # Def = Base + floor(Wave / 3)
-        self.phys_def = base_def + math.floor(wave / 3)
-        self.magic_def = self.phys_def # Assume similar scaling for now
-        
-        self.speed = base_speed
-        
-        # Elite Scaling
-        if is_elite:
-            self.max_hp *= 5.0 # Elites are much tougher
-            self.phys_atk *= 1.5
-            self.size *= 1.5
-            self.xp_value = 50 * wave
-        else:
-            self.xp_value = 5 * wave
-
+        # 属性 (成长公式见 data/enemy_stats.py, 同类型 / 等级 / 任务次数的敌人共用缓存的属性块)
+        tier = mission_stats.get('completions', 0) if mission_stats else 0
+        self.__dict__.update(enemy_stat_table.get(enemy_type, wave, is_elite, elite_type, tier))
+        if mission_stats:
+            enemy_stat_table.apply_dynamic(self, mission_stats.get('max_damage', 0), mission_stats.get('max_combo', 0))
         self.current_hp = self.max_hp
-        
+
         # Base attributes for modifiers
         self.phys_pen = 0
         self.magic_pen = 0
         self.true_dmg = 0
-        
-        # --- Dynamic Growth System (Mission Stats) ---
-        if mission_stats:
-            completions = mission_stats.get('completions', 0)
-            max_dmg = mission_stats.get('max_damage', 0)
-            max_combo = mission_stats.get('max_combo', 0)
-            
-            # 1. Base Stats Growth
-            # Def (+8% per mission)
-            def_growth = 1.0 + completions * 0.08
-            self.phys_def *= def_growth
-            self.magic_def *= def_growth
-            
-            # Atk (+12% per mission)
-            atk_growth = 1.0 + completions * 0.12
-            self.phys_atk *= atk_growth
-            self.magic_atk = self.magic_atk * atk_growth if self.magic_atk > 0 else 0
-            
-            # HP (+5% per mission)
-            hp_growth = 1.0 + completions * 0.05
-            self.max_hp *= hp_growth
-            
-            # 2. Dynamic Adjustment
-            # Extra Def = Max Dmg * 0.001%
-            extra_def = max_dmg * 0.00001
-            self.phys_def += extra_def
-            self.magic_def += extra_def
-            
-            # Extra HP = Max Combo * 0.5%
-            hp_combo_bonus = 1.0 + max_combo * 0.005
-            self.max_hp *= hp_combo_bonus
-            
-            # 3. Combat Stats (Soft Cap)
-            # Speed +1.5% per mission
-            self.speed *= (1.0 + completions * 0.015)
-            
-            self.current_hp = self.max_hp
 
-        # Elite Type Setup
-        self.skill_cooldown = 0
         self.skill_timer = 0
         self.is_using_skill = False
-        self.name = "" # Initialize name
-        
-        if elite_type == 'bone_crusher':
-            self.skill_cooldown = 5.0
-            self.color = (100, 0, 0) # Dark Red
-            self.name = "碎骨者"
-        elif elite_type == 'hunter_eye':
-            self.skill_cooldown = 8.0
-            self.color = (255, 215, 0) # Gold
-            self.name = "猎杀之眼"
-        elif elite_type == 'void_whisperer':
-            self.skill_cooldown = 8.0
-            self.color = (75, 0, 130) # Indigo
-            self.name = "虚空低语者"
-
-        self.status_effects = []
+
+        # Status Effects (fixed slots, see StatusType)
+        self.effect_mask = 0
+        self.effect_duration = [0.0] * STATUS_COUNT
+        self.effect_timer = [0.0] * STATUS_COUNT
+        self.effect_tick = [0.0] * STATUS_COUNT
+        self.effect_intensity = [0.0] * STATUS_COUNT
+        self.status_speed_mult = 1.0
+        self.status_size_mult = 1.0
+        self.status_color = None
         
-        self.is_ranged = False
         self.attack_timer = 0
-        self.attack_interval = 2.0
-        self.attack_range = 0
-        
-        if enemy_type == 'square':
-            self.color = (200, 50, 50)
-            self.hp_mult = 1.2
-            self.speed_mult = 0.8
-            
-            # Dynamic Buff: Phys Atk +10% per wave
-            self.phys_atk *= (1.0 + 0.1 * wave)
-            
-        elif enemy_type == 'triangle':
-            self.color = (200, 200, 50)
-            self.hp_mult = 0.8
-            self.speed_mult = 1.2
-            self.is_ranged = True
-            self.attack_range = 400 
-            self.attack_interval = 1.2 # Strengthened: Faster attacks (was 1.5)
-            
-            # Dynamic Buff: Attack Speed (Interval decrease)
-            # Decrease by 5% per wave, max 60% reduction (0.4 multiplier)
-            reduction = min(0.6, 0.05 * wave)
-            self.attack_interval *= (1.0 - reduction)
-            
-        elif enemy_type == 'circle':
-            self.color = (255, 0, 255) # Magenta
-            self.hp_mult = 0.6
-            self.speed_mult = 1.0
-            self.is_ranged = True
-            self.attack_range = 350
-            self.attack_interval = 2.0
-            
-            # Magic Stats
-            # Using Base * (1 + 0.2 * Wave) as a reference, but magic might scale differently
-            # Let's keep consistent with formula but use magic_atk base
-            self.magic_atk = 10 * (1 + 0.20 * wave)
-            self.phys_atk = 0
-            
-        self.max_hp *= self.hp_mult
-        self.current_hp = self.max_hp
-        self.speed *= self.speed_mult
         
         # Legacy aliases
         self.atk = self.phys_atk
@@ -175,6 +131,57 @@ class Enemy(Entity):
         self.animation_loop = True
         self.animation_finished = False
 
+        # LOD: 远处敌人降频更新 (由 EnemyManager 调度)
+        self.lod_slot = int(abs(x) + abs(y)) # 错开各个敌人的更新帧
+        self.lod_pending = 0.0 # 上次更新以来累计的时间
+
+    def apply_elite_tint(self):
+        self.color = tuple(min(255, c + ELITE_TINT) for c in self.color)
+
+    def get_save_data(self):
+        """ 保存所有基础类型字段 (属性 / 计时器 / 状态槽位 / 动画 / LOD), 读档后与存档时的敌人一致 """
+        data = {}
+        for key, value in self.__dict__.items():
+            if key in _UNSAVED_FIELDS or not _is_plain(value):
+                continue
+            data[key] = value
+        data['pos'] = (self.pos.x, self.pos.y)
+        data['knockback_velocity'] = (self.knockback_velocity.x, self.knockback_velocity.y)
+        return data
+
+    @classmethod
+    def from_save_data(cls, data):
+        """
+        按 类型 / 等级 / 精英 从属性表重建敌人 (精英同样提亮), 再覆盖存档中的字段。
+        旧存档只有 x / y / type / hp / max_hp, 缺失的字段保持重建后的默认值。
+        """
+        if 'pos' in data:
+            x, y = data['pos']
+        else:
+            x, y = data['x'], data['y']
+        enemy = cls(x, y, data['type'], data.get('wave', 1), is_elite=data.get('is_elite', False),
+                    elite_type=data.get('elite_type'))
+        if enemy.is_elite:
+            enemy.apply_elite_tint()
+        for key, value in data.items():
+            if key in _UNSAVED_FIELDS or key in ('x', 'y', 'hp', 'uid'):
+                continue
+            enemy.__dict__[key] = value
+        if 'hp' in data:
+            enemy.current_hp = data['hp']
+        if 'uid' in data:
+            enemy.restore_uid(data['uid'])
+        for key in _COLOR_FIELDS:
+            if enemy.__dict__.get(key) is not None:
+                enemy.__dict__[key] = tuple(enemy.__dict__[key])
+        enemy.effect_duration = list(enemy.effect_duration)
+        enemy.effect_timer = list(enemy.effect_timer)
+        enemy.effect_tick = list(enemy.effect_tick)
+        enemy.effect_intensity = list(enemy.effect_intensity)
+        if 'knockback_velocity' in data:
+            enemy.knockback_velocity = pygame.math.Vector2(data['knockback_velocity'])
+        return enemy
+
     @property
     def is_dying(self):
         return self.animation_state == 'die'
@@ -204,77 +211,162 @@ class Enemy(Entity):
             
         return dmg
 
+    def receive_damage(self, dmg, source=None):
+        """ 扣除已经结算好的伤害 (批量 DoT 使用), 效果与 take_damage 去掉结算步骤相同 """
+        self.current_hp -= dmg
+        if self.current_hp <= 0:
+            self.current_hp = 0
+            self.alive = False
+            self.on_death(source)
+        if not self.is_dying and dmg > 0:
+            self.set_animation('hurt', loop=False, speed=15.0)
+        return dmg
+
+    # --- Status Effects ---
+    def has_status(self, status):
+        return bool(self.effect_mask & (1 << status))
+
+    @property
+    def is_wet(self):
+        return bool(self.effect_mask & BIT_WET)
+
+    @property
+    def is_burning(self):
+        return bool(self.effect_mask & BIT_BURN)
+
+    @property
+    def status_effects(self):
+        """ 兼容旧接口的只读视图 (list of dict) """
+        effects = []
+        for status in StatusType:
+            if self.effect_mask & (1 << status):
+                effects.append({
+                    'type': status.name.lower(),
+                    'duration': self.effect_duration[status],
+                    'intensity': self.effect_intensity[status],
+                    'timer': self.effect_timer[status],
+                    'tick_timer': self.effect_tick[status]
+                })
+        return effects
+
     def apply_status_effect(self, effect_type, duration, intensity=1.0):
-        for effect in self.status_effects:
-            if effect['type'] == effect_type:
-                effect['duration'] = max(effect['duration'], duration)
-                effect['intensity'] = max(effect['intensity'], intensity)
-                return
+        status = STATUS_BY_NAME.get(effect_type)
+        if status is None:
+            # 敌人没有该状态的逻辑
+            return
         
-        self.status_effects.append({
-            'type': effect_type,
-            'duration': duration,
-            'intensity': intensity,
-            'timer': 0,
-            'tick_timer': 0
-        })
+        bit = 1 << status
+        if self.effect_mask & bit:
+            self.effect_duration[status] = max(self.effect_duration[status], duration)
+            self.effect_intensity[status] = max(self.effect_intensity[status], intensity)
+        else:
+            self.effect_mask |= bit
+            self.effect_duration[status] = duration
+            self.effect_intensity[status] = intensity
+            self.effect_timer[status] = 0
+            self.effect_tick[status] = 0
+        self._refresh_status_modifiers()
 
-    def update_status_effects(self, dt_sec, damage_callback=None):
+    def clear_status_effects(self, mask):
+        if self.effect_mask & mask:
+            self.effect_mask &= ~mask
+            self._refresh_status_modifiers()
+
+    def _refresh_status_modifiers(self):
+        # 速度 / 体型 / 颜色只在状态增删时重新计算
+        mask = self.effect_mask
         speed_modifier = 1.0
         size_modifier = 1.0
+        if mask & BIT_COMPRESS:
+            size_modifier *= 0.6
+            speed_modifier *= 0.5
+        if mask & BIT_WET:
+            speed_modifier *= 0.9 # Slight slow to indicate wetness
+        if mask & BIT_SLOW:
+            speed_modifier *= (1.0 - self.effect_intensity[StatusType.SLOW])
+        if mask & BIT_FREEZE:
+            speed_modifier = 0
+        
         color_override = None
+        for status, color in STATUS_COLORS:
+            if mask & (1 << status):
+                color_override = color
         
-        for effect in self.status_effects[:]:
-            effect['timer'] += dt_sec
-            effect['tick_timer'] += dt_sec
-            
-            if effect['timer'] >= effect['duration']:
-                self.status_effects.remove(effect)
+        self.status_speed_mult = speed_modifier
+        self.status_size_mult = size_modifier
+        self.status_color = color_override
+
+    def _advance_status_effects(self, dt_sec, ticks):
+        """ 推进计时并移除过期状态, 触发的 DoT 追加到 ticks[伤害类型] = ([敌人], [伤害]) """
+        expired = 0
+        for status in StatusType:
+            bit = 1 << status
+            if not self.effect_mask & bit:
+                continue
+            self.effect_timer[status] += dt_sec
+            self.effect_tick[status] += dt_sec
+            if self.effect_timer[status] >= self.effect_duration[status]:
+                expired |= bit
                 continue
-                
-            if effect['type'] == 'compress':
-                size_modifier *= 0.6
-                speed_modifier *= 0.5
-                if effect['tick_timer'] >= 0.5:
-                    effect['tick_timer'] = 0
-                    dmg = 5 * effect['intensity']
-                    self.take_damage(dmg, 'true')
-                    if damage_callback: damage_callback(self.pos, dmg)
-                        
-            elif effect['type'] == 'burn':
-                color_override = (255, 100, 0)
-                if effect['tick_timer'] >= 0.5:
-                    effect['tick_timer'] = 0
-                    dmg = 10 * effect['intensity']
-                    self.take_damage(dmg, 'magic')
-                    if damage_callback: damage_callback(self.pos, dmg)
             
-            elif effect['type'] == 'wet':
-                color_override = (50, 100, 255) # Blue
-                speed_modifier *= 0.9 # Slight slow to indicate wetness
-                        
-            elif effect['type'] == 'freeze':
-                color_override = (100, 100, 255)
-                speed_modifier = 0
-                
-            elif effect['type'] == 'slow':
-                color_override = (150, 150, 150)
-                speed_modifier *= (1.0 - effect['intensity'])
-                
-            elif effect['type'] == 'bleed':
-                color_override = (150, 0, 0)
-                if effect['tick_timer'] >= 0.5:
-                    effect['tick_timer'] = 0
-                    dmg = 5 * effect['intensity']
-                    self.take_damage(dmg, 'physical')
-                    if damage_callback: damage_callback(self.pos, dmg)
-
-        self.speed = self.base_speed * speed_modifier
-        self.size = self.base_size * size_modifier
+            if bit & DOT_MASK and self.effect_tick[status] >= DOT_INTERVAL:
+                self.effect_tick[status] = 0
+                dmg_type, factor = DOT_RULES[status]
+                targets, amounts = ticks.setdefault(dmg_type, ([], []))
+                targets.append(self)
+                amounts.append(factor * self.effect_intensity[status])
+        
+        if expired:
+            self.clear_status_effects(expired)
+
+    def _apply_status_modifiers(self):
+        self.speed = self.base_speed * self.status_speed_mult
+        self.size = self.base_size * self.status_size_mult
         self.width = self.size
         self.height = self.size
-        if color_override: self.color = color_override
-        else: self.color = self.base_color
+        self.color = self.status_color if self.status_color else self.base_color
+
+    def update_status_effects(self, dt_sec, damage_callback=None):
+        update_status_effects_batch([self], dt_sec, damage_callback)
+
+    def _advance_animation(self, dt_sec):
+        # Update Animation Frame
+        self.animation_frame += self.animation_speed * dt_sec
+        
+        # Check animation finish
+        # We need to know max frames to loop correctly. 
+        # But we don't have access to resource_manager here easily without importing or passing it.
+        # However, Renderer handles the modulo/clamping. 
+        # Here we just increment. But for 'loop=False' logic (hurt/die), we need to know when to stop.
+        # Simple workaround: Assume 5 frames for now since we generated them.
+        # Ideally, we should check with ResourceManager, but let's assume standard 5 frames for generated assets.
+        # If we exceed 5 frames:
+        if self.animation_loop:
+            pass # Renderer handles modulo
+        else:
+            if self.animation_frame >= 5.0: # 5 frames
+                self.animation_frame = 4.9 # Clamp to last
+                self.animation_finished = True
+                
+                # If hurt finished, go back to idle/run
+                if self.animation_state == 'hurt':
+                    self.set_animation('idle', loop=True)
+
+    def update_far(self, dt_sec, player_pos):
+        """
+        远处敌人 (LOD) 的简化更新: 推进动画和计时器, 直线走向玩家。
+        不放技能、不攻击、不做分离 / 地形判断, 进入视野附近后恢复完整的 update。
+        """
+        self._advance_animation(dt_sec)
+        if self.is_dying:
+            return
+        if self.is_ranged:
+            self.attack_timer += dt_sec
+        self.knockback_velocity = pygame.math.Vector2(0, 0)
+        
+        to_player = player_pos - self.pos
+        if to_player.length_squared() > 0:
+            self.pos += to_player.normalize() * self.speed * dt_sec
 
     def update(self, dt_sec, player_pos, other_enemies, projectiles=None, map_manager=None, damage_callback=None):
         # Elite Skill Logic
@@ -310,32 +402,12 @@ class Enemy(Entity):
                         used = True
                 if used: self.skill_timer = 0
 
-        # Update Animation Frame
-        self.animation_frame += self.animation_speed * dt_sec
-        
-        # Check animation finish
-        # We need to know max frames to loop correctly. 
-        # But we don't have access to resource_manager here easily without importing or passing it.
-        # However, Renderer handles the modulo/clamping. 
-        # Here we just increment. But for 'loop=False' logic (hurt/die), we need to know when to stop.
-        # Simple workaround: Assume 5 frames for now since we generated them.
-        # Ideally, we should check with ResourceManager, but let's assume standard 5 frames for generated assets.
-        # If we exceed 5 frames:
-        if self.animation_loop:
-            pass # Renderer handles modulo
-        else:
-            if self.animation_frame >= 5.0: # 5 frames
-                self.animation_frame = 4.9 # Clamp to last
-                self.animation_finished = True
-                
-                # If hurt finished, go back to idle/run
-                if self.animation_state == 'hurt':
-                    self.set_animation('idle', loop=True)
+        self._advance_animation(dt_sec)
 
         if self.is_dying:
             return # Skip movement/AI if dying
 
-        self.update_status_effects(dt_sec, damage_callback)
+        # 状态效果 / DoT 由 EnemyManager 通过 update_status_effects_batch 统一处理
         
         # Apply Knockback
         if self.knockback_velocity.length() > 10:
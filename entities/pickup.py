@@ -13,10 +13,9 @@ class Pickup(Entity):
         self.magnet_radius = 100
         self.speed = 400
         self.auto_magnet = False # If true, always flies to player
-        
-        # Bobbing animation
-        self.bob_timer = 0
-        self.base_y = y
+        self.magnetized = False # 正在被吸向玩家 (由 update 设置)
+        self.cell = None # PickupManager 空间索引中的网格
+        # 浮动动画在绘制时计算 (PickupManager.bob_offset), 不修改坐标
         
         # If item provided, use its color
         if self.item:
@@ -29,20 +28,15 @@ class Pickup(Entity):
                 elif r == 'orange': self.color = (255, 165, 0)
         
     def update(self, dt_sec, player_pos, pickup_range=100):
-        self.bob_timer += dt_sec
-        # Visual bobbing
-        self.pos.y = self.base_y + math.sin(self.bob_timer * 3) * 3
-        
         to_player = player_pos - self.pos
         dist = to_player.length()
         
         should_magnet = self.auto_magnet or (dist < pickup_range)
         
+        self.magnetized = should_magnet
         if should_magnet:
             if dist > 0:
                 self.pos += to_player.normalize() * self.speed * dt_sec
-                # Update base_y to follow movement
-                self.base_y = self.pos.y
             
             if dist < 15: # Pickup radius
                 return True 
@@ -54,6 +48,32 @@ class Pickup(Entity):
         pygame.draw.circle(surface, self.color, (int(screen_pos.x), int(screen_pos.y)), r)
         pygame.draw.circle(surface, (0,0,0), (int(screen_pos.x), int(screen_pos.y)), r, 1)
 
+    def get_save_data(self, serialize_item):
+        return {
+            'uid': self.uid,
+            'type': self.type,
+            'x': self.pos.x,
+            'y': self.pos.y,
+            'auto_magnet': self.auto_magnet,
+            'amount': getattr(self, 'amount', 0),
+            'merge_count': getattr(self, 'merge_count', 1),
+            'item': serialize_item(self.item),
+        }
+
+def pickup_from_save_data(data, deserialize_item):
+    if data['type'] == 'xp':
+        pickup = XPOrb(data['x'], data['y'], data['amount'])
+        pickup.set_merge_count(data.get('merge_count', 1))
+    else:
+        pickup = Pickup(data['x'], data['y'], data['type'], item=deserialize_item(data['item']))
+    if 'base_y' in data:
+        # 旧存档的 y 包含浮动偏移
+        pickup.pos.y = data['base_y']
+    pickup.auto_magnet = data['auto_magnet']
+    if 'uid' in data:
+        pickup.restore_uid(data['uid'])
+    return pickup
+
 class XPOrb(Pickup):
     def __init__(self, x, y, amount):
         super().__init__(x, y, 'xp')
@@ -61,6 +81,18 @@ class XPOrb(Pickup):
         self.radius = 5
         self.color = (100, 255, 255) # Cyan
         self.magnet_radius = 100
+        self.merge_count = 1
+
+    def absorb(self, other):
+        """ 合并另一个经验球: 经验值相加, 体积随合并数量略微增大 """
+        self.amount += other.amount
+        self.set_merge_count(self.merge_count + other.merge_count)
+
+    def set_merge_count(self, count):
+        self.merge_count = count
+        scale = min(2.0, 1.0 + 0.25 * math.log2(max(1, count)))
+        self.width = self.height = self.size * scale
+        self.radius = 5 * scale
 
 class ItemPickup(Pickup):
     def __init__(self, x, y, item):
@@ -9,6 +9,7 @@ from entities.projectile import Projectile, MeleeSwing
 from ui.trail import Trail
 from data.attributes import STATS
 from utils.sound_manager import SoundManager
+from utils.input_manager import input_manager
 
 class Player(Entity):
     def __init__(self, character_data):
@@ -16,6 +17,10 @@ class Player(Entity):
         
         # Initialize stats container for property setters called in super().__init__
         self.stats = {}
+        self._stat_cache = {}
+        self._stat_bonuses = None
+        self._status_atk_mult = 1.0
+        self._status_speed_mult = 1.0
             
         # Call parent init (Note: This will write legacy defaults to self.stats via properties)
         super().__init__()
@@ -44,6 +49,7 @@ class Player(Entity):
         
         # Backpack
         self.inventory = Inventory(self)
+        self.invalidate_stats()
         
         # Skill System
         self.skill_system = SkillSystem(self)
@@ -127,30 +133,57 @@ class Player(Entity):
             return 0
         return super().take_damage(amount, damage_type, penetration, source)
 
+    # Derived Stat Cache
+    # 属性 = 基础值 (self.stats) + 装备/细胞加成, 结果缓存在 _stat_cache 中。
+    # 只有装备、细胞、升级 (setter) 或状态效果变化时才需要 invalidate_stats()。
+    def invalidate_stats(self):
+        self._stat_cache = {}
+        self._stat_bonuses = None
+
+    def _get_stat(self, key, default=0):
+        cache = self._stat_cache
+        if key in cache:
+            return cache[key]
+        if self._stat_bonuses is None:
+            if hasattr(self, 'inventory') and hasattr(self.inventory, 'get_all_stat_bonuses'):
+                self._stat_bonuses = self.inventory.get_all_stat_bonuses()
+            else:
+                # Inventory 尚未创建 (构造期间), 不缓存
+                return self.stats.get(key, default)
+        val = self.stats.get(key, default) + self._stat_bonuses.get(key, 0)
+        cache[key] = val
+        return val
+
+    def _set_stat(self, key, value):
+        self.stats[key] = value
+        self.invalidate_stats()
+
+    def _refresh_status_modifiers(self):
+        # 状态效果带来的倍率, 仅在状态增删时重新计算
+        atk_mult = 1.0
+        speed_mult = 1.0
+        for effect in self.status_effects:
+            if effect['type'] == 'overload':
+                atk_mult *= 0.5 # Reduce Damage by 50%
+            elif effect['type'] == 'slow':
+                speed_mult *= (1.0 - effect['intensity'])
+        self._status_atk_mult = atk_mult
+        self._status_speed_mult = speed_mult
+
     # Properties for Stats
     @property
-    def max_hp(self): 
-        val = self.stats.get('max_hp', 100)
-        if hasattr(self, 'inventory') and hasattr(self.inventory, 'get_stat_bonus'):
-            val += self.inventory.get_stat_bonus('max_hp')
-        return val
+    def max_hp(self): return self._get_stat('max_hp', 100)
     @max_hp.setter
-    def max_hp(self, value): self.stats['max_hp'] = value
-        
+    def max_hp(self, value): self._set_stat('max_hp', value)
+
     @property
-    def max_mp(self): 
-        val = self.stats.get('max_mp', 100)
-        if hasattr(self, 'inventory') and hasattr(self.inventory, 'get_stat_bonus'):
-            val += self.inventory.get_stat_bonus('max_mp')
-        return val
+    def max_mp(self): return self._get_stat('max_mp', 100)
     @max_mp.setter
-    def max_mp(self, value): self.stats['max_mp'] = value
+    def max_mp(self, value): self._set_stat('max_mp', value)
 
     @property
     def phys_atk(self): 
-        val = self.stats.get('phys_atk', 0)
-        if hasattr(self, 'inventory') and hasattr(self.inventory, 'get_stat_bonus'):
-            val += self.inventory.get_stat_bonus('phys_atk')
+        val = self._get_stat('phys_atk', 0)
             
         # Overlord Rage
         if self.overlord_rage:
@@ -161,141 +194,83 @@ class Player(Entity):
                 val *= (1.0 + bonus_pct / 100.0)
                 
         # Status Effects: Overload
-        for effect in self.status_effects:
-            if effect['type'] == 'overload':
-                val *= 0.5 # Reduce Damage by 50%
-                
-        return val
+        return val * self._status_atk_mult
     @phys_atk.setter
-    def phys_atk(self, value): self.stats['phys_atk'] = value
-    
+    def phys_atk(self, value): self._set_stat('phys_atk', value)
+
     @property
-    def magic_atk(self): 
-        val = self.stats.get('magic_atk', 0)
-        if hasattr(self, 'inventory') and hasattr(self.inventory, 'get_stat_bonus'):
-            val += self.inventory.get_stat_bonus('magic_atk')
-        return val
+    def magic_atk(self): return self._get_stat('magic_atk', 0)
     @magic_atk.setter
-    def magic_atk(self, value): self.stats['magic_atk'] = value
+    def magic_atk(self, value): self._set_stat('magic_atk', value)
 
     @property
-    def phys_def(self): 
-        val = self.stats.get('phys_def', 0)
-        if hasattr(self, 'inventory') and hasattr(self.inventory, 'get_stat_bonus'):
-            val += self.inventory.get_stat_bonus('phys_def')
-        return val
+    def phys_def(self): return self._get_stat('phys_def', 0)
     @phys_def.setter
-    def phys_def(self, value): self.stats['phys_def'] = value
+    def phys_def(self, value): self._set_stat('phys_def', value)
 
     @property
-    def magic_def(self): 
-        val = self.stats.get('magic_def', 0)
-        if hasattr(self, 'inventory') and hasattr(self.inventory, 'get_stat_bonus'):
-            val += self.inventory.get_stat_bonus('magic_def')
-        return val
+    def magic_def(self): return self._get_stat('magic_def', 0)
     @magic_def.setter
-    def magic_def(self, value): self.stats['magic_def'] = value
-    
+    def magic_def(self, value): self._set_stat('magic_def', value)
+
     @property
-    def phys_pen(self): 
-        val = self.stats.get('phys_pen', 0)
-        if hasattr(self, 'inventory') and hasattr(self.inventory, 'get_stat_bonus'):
-            val += self.inventory.get_stat_bonus('phys_pen')
-        return val
+    def phys_pen(self): return self._get_stat('phys_pen', 0)
     @phys_pen.setter
-    def phys_pen(self, value): self.stats['phys_pen'] = value
+    def phys_pen(self, value): self._set_stat('phys_pen', value)
 
     @property
-    def magic_pen(self): 
-        val = self.stats.get('magic_pen', 0)
-        if hasattr(self, 'inventory') and hasattr(self.inventory, 'get_stat_bonus'):
-            val += self.inventory.get_stat_bonus('magic_pen')
-        return val
+    def magic_pen(self): return self._get_stat('magic_pen', 0)
     @magic_pen.setter
-    def magic_pen(self, value): self.stats['magic_pen'] = value
+    def magic_pen(self, value): self._set_stat('magic_pen', value)
 
     @property
-    def true_dmg(self): 
-        val = self.stats.get('true_dmg', 0)
-        if hasattr(self, 'inventory') and hasattr(self.inventory, 'get_stat_bonus'):
-            val += self.inventory.get_stat_bonus('true_dmg')
-        return val
+    def true_dmg(self): return self._get_stat('true_dmg', 0)
     @true_dmg.setter
-    def true_dmg(self, value): self.stats['true_dmg'] = value
+    def true_dmg(self, value): self._set_stat('true_dmg', value)
 
     @property
-    def attack_range(self): 
-        val = self.stats.get('attack_range', 0)
-        if hasattr(self, 'inventory') and hasattr(self.inventory, 'get_stat_bonus'):
-            val += self.inventory.get_stat_bonus('attack_range')
-        return val
+    def attack_range(self): return self._get_stat('attack_range', 0)
     @attack_range.setter
-    def attack_range(self, value): self.stats['attack_range'] = value
+    def attack_range(self, value): self._set_stat('attack_range', value)
 
     @property
-    def skill_range(self): 
-        val = self.stats.get('skill_range', 0)
-        if hasattr(self, 'inventory') and hasattr(self.inventory, 'get_stat_bonus'):
-            val += self.inventory.get_stat_bonus('skill_range')
-        return val
+    def skill_range(self): return self._get_stat('skill_range', 0)
     @skill_range.setter
-    def skill_range(self, value): self.stats['skill_range'] = value
+    def skill_range(self, value): self._set_stat('skill_range', value)
 
     @property
-    def pickup_range(self): 
-        val = self.stats.get('pickup_range', 100)
-        if hasattr(self, 'inventory') and hasattr(self.inventory, 'get_stat_bonus'):
-            val += self.inventory.get_stat_bonus('pickup_range')
-        return val
+    def pickup_range(self): return self._get_stat('pickup_range', 100)
     @pickup_range.setter
-    def pickup_range(self, value): self.stats['pickup_range'] = value
+    def pickup_range(self, value): self._set_stat('pickup_range', value)
 
     @property
-    def piercing_count(self): 
-        val = self.stats.get('piercing_count', 0)
-        if hasattr(self, 'inventory') and hasattr(self.inventory, 'get_stat_bonus'):
-            val += self.inventory.get_stat_bonus('piercing_count')
-        return val
+    def piercing_count(self): return self._get_stat('piercing_count', 0)
     @piercing_count.setter
-    def piercing_count(self, value): self.stats['piercing_count'] = value
+    def piercing_count(self, value): self._set_stat('piercing_count', value)
 
     @property
     def collision_damage_reduction(self):
-        base = self.stats.get('collision_damage_reduction', 0)
-        if hasattr(self, 'inventory') and hasattr(self.inventory, 'get_stat_bonus'):
-            base += self.inventory.get_stat_bonus('collision_damage_reduction')
+        base = self._get_stat('collision_damage_reduction', 0)
         if hasattr(self, 'is_dashing') and self.is_dashing:
             return base + 10
         return base
     @collision_damage_reduction.setter
-    def collision_damage_reduction(self, value): self.stats['collision_damage_reduction'] = value
+    def collision_damage_reduction(self, value): self._set_stat('collision_damage_reduction', value)
 
     @property
-    def collision_dmg_pct(self): 
-        val = self.stats.get('collision_dmg_pct', 0)
-        if hasattr(self, 'inventory') and hasattr(self.inventory, 'get_stat_bonus'):
-            val += self.inventory.get_stat_bonus('collision_dmg_pct')
-        return val
+    def collision_dmg_pct(self): return self._get_stat('collision_dmg_pct', 0)
     @collision_dmg_pct.setter
-    def collision_dmg_pct(self, value): self.stats['collision_dmg_pct'] = value
+    def collision_dmg_pct(self, value): self._set_stat('collision_dmg_pct', value)
 
     @property
-    def skill_haste(self): 
-        val = self.stats.get('skill_haste', 0)
-        if hasattr(self, 'inventory') and hasattr(self.inventory, 'get_stat_bonus'):
-            val += self.inventory.get_stat_bonus('skill_haste')
-        return val
+    def skill_haste(self): return self._get_stat('skill_haste', 0)
     @skill_haste.setter
-    def skill_haste(self, value): self.stats['skill_haste'] = value
+    def skill_haste(self, value): self._set_stat('skill_haste', value)
 
     @property
-    def skill_haste_cap(self): 
-        val = self.stats.get('skill_haste_cap', 80)
-        if hasattr(self, 'inventory') and hasattr(self.inventory, 'get_stat_bonus'):
-            val += self.inventory.get_stat_bonus('skill_haste_cap')
-        return val
+    def skill_haste_cap(self): return self._get_stat('skill_haste_cap', 80)
     @skill_haste_cap.setter
-    def skill_haste_cap(self, value): self.stats['skill_haste_cap'] = value
+    def skill_haste_cap(self, value): self._set_stat('skill_haste_cap', value)
 
     @property
     def cooldown_reduction(self):
@@ -307,74 +282,42 @@ class Player(Entity):
 
     # New Props
     @property
-    def crit_chance(self): 
-        val = self.stats.get('crit_chance', 0)
-        if hasattr(self, 'inventory') and hasattr(self.inventory, 'get_stat_bonus'):
-            val += self.inventory.get_stat_bonus('crit_chance')
-        return val
+    def crit_chance(self): return self._get_stat('crit_chance', 0)
     @crit_chance.setter
-    def crit_chance(self, value): self.stats['crit_chance'] = value
+    def crit_chance(self, value): self._set_stat('crit_chance', value)
 
     @property
-    def damage_bonus(self): 
-        val = self.stats.get('damage_bonus', 0)
-        if hasattr(self, 'inventory') and hasattr(self.inventory, 'get_stat_bonus'):
-            val += self.inventory.get_stat_bonus('damage_bonus')
-        return val
+    def damage_bonus(self): return self._get_stat('damage_bonus', 0)
     @damage_bonus.setter
-    def damage_bonus(self, value): self.stats['damage_bonus'] = value
+    def damage_bonus(self, value): self._set_stat('damage_bonus', value)
 
     @property
-    def crit_dmg(self): 
-        val = self.stats.get('crit_dmg', 200)
-        if hasattr(self, 'inventory') and hasattr(self.inventory, 'get_stat_bonus'):
-            val += self.inventory.get_stat_bonus('crit_dmg')
-        return val
+    def crit_dmg(self): return self._get_stat('crit_dmg', 200)
     @crit_dmg.setter
-    def crit_dmg(self, value): self.stats['crit_dmg'] = value
+    def crit_dmg(self, value): self._set_stat('crit_dmg', value)
 
     @property
-    def hp_regen(self): 
-        val = self.stats.get('hp_regen', 0)
-        if hasattr(self, 'inventory') and hasattr(self.inventory, 'get_stat_bonus'):
-            val += self.inventory.get_stat_bonus('hp_regen')
-        return val
+    def hp_regen(self): return self._get_stat('hp_regen', 0)
     @hp_regen.setter
-    def hp_regen(self, value): self.stats['hp_regen'] = value
+    def hp_regen(self, value): self._set_stat('hp_regen', value)
 
     @property
-    def luck(self): 
-        val = self.stats.get('luck', 0)
-        if hasattr(self, 'inventory') and hasattr(self.inventory, 'get_stat_bonus'):
-            val += self.inventory.get_stat_bonus('luck')
-        return val
+    def luck(self): return self._get_stat('luck', 0)
     @luck.setter
-    def luck(self, value): self.stats['luck'] = value
+    def luck(self, value): self._set_stat('luck', value)
 
     @property
     def attack_speed(self):
-        val = self.stats.get('attack_speed', 1.0)
-        if hasattr(self, 'inventory') and hasattr(self.inventory, 'get_stat_bonus'):
-            val += self.inventory.get_stat_bonus('attack_speed')
-        return max(0.1, val)
+        return max(0.1, self._get_stat('attack_speed', 1.0))
     @attack_speed.setter
-    def attack_speed(self, value): self.stats['attack_speed'] = value
+    def attack_speed(self, value): self._set_stat('attack_speed', value)
 
     @property
     def move_speed(self):
-        val = self.stats.get('move_speed', 300)
-        if hasattr(self, 'inventory') and hasattr(self.inventory, 'get_stat_bonus'):
-            val += self.inventory.get_stat_bonus('move_speed')
-            
         # Apply Status Effects
-        modifier = 1.0
-        for effect in self.status_effects:
-            if effect['type'] == 'slow':
-                modifier *= (1.0 - effect['intensity'])
-        
-        return max(0, val * modifier)
+        return max(0, self._get_stat('move_speed', 300) * self._status_speed_mult)
     @move_speed.setter
-    def move_speed(self, value): self.stats['move_speed'] = value
+    def move_speed(self, value): self._set_stat('move_speed', value)
 
     # Legacy Aliases
     @property
@@ -394,6 +337,7 @@ class Player(Entity):
                 # Refresh duration and max intensity
                 effect['duration'] = max(effect['duration'], duration)
                 effect['intensity'] = max(effect['intensity'], intensity)
+                self._refresh_status_modifiers()
                 return
         
         self.status_effects.append({
@@ -402,6 +346,7 @@ class Player(Entity):
             'intensity': intensity,
             'timer': 0
         })
+        self._refresh_status_modifiers()
 
     def update_status_effects(self, dt_sec):
         # speed_modifier = 1.0 # Moved to property
@@ -410,6 +355,7 @@ class Player(Entity):
             effect['timer'] += dt_sec
             if effect['timer'] >= effect['duration']:
                 self.status_effects.remove(effect)
+                self._refresh_status_modifiers()
                 continue
             
             # if effect['type'] == 'slow':
@@ -425,13 +371,13 @@ class Player(Entity):
         if code == 0: return False
         
         if code < 0: # Mouse
-            mouse_pressed = pygame.mouse.get_pressed()
+            mouse_pressed = input_manager.get_mouse_pressed()
             if code == settings.MOUSE_LEFT: return mouse_pressed[0]
             if code == settings.MOUSE_MIDDLE: return mouse_pressed[1]
             if code == settings.MOUSE_RIGHT: return mouse_pressed[2]
             return False
         else: # Keyboard
-            keys = pygame.key.get_pressed()
+            keys = input_manager.get_pressed()
             if code < len(keys): return keys[code]
             return False
 
@@ -538,15 +484,14 @@ class Player(Entity):
                         
             elif self.slippery:
                 # Slippery logic (Roller skates)
-                mouse_pos = pygame.mouse.get_pos()
+                mouse_pos = input_manager.get_mouse_pos()
                 screen_center = pygame.math.Vector2(settings.SCREEN_WIDTH / 2, settings.SCREEN_HEIGHT / 2)
                 aim_vec = pygame.math.Vector2(mouse_pos) - screen_center
                 if aim_vec.length() > 0:
                     self.pos += aim_vec.normalize() * 30 * dt_sec
             
             # Exhaust Logic
-            mechanisms = self.inventory.get_active_mechanisms()
-            exhaust_mech = next((m for m in mechanisms if m['type'] == 'exhaust'), None)
+            exhaust_mech = self.inventory.get_mechanism('exhaust')
             
             if exhaust_mech:
                 self.exhaust_timer -= dt_sec
@@ -663,7 +608,7 @@ class Player(Entity):
     def attack(self, camera=None):
         if self.attack_cooldown_timer > 0: return
 
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = input_manager.get_mouse_pos()
         if camera:
             target_pos = camera.unapply(pygame.math.Vector2(mouse_pos))
             aim_vec = target_pos - self.pos
@@ -694,9 +639,8 @@ class Player(Entity):
         cores = self.get_active_cores()
         
         # Get Active Mechanisms (New System)
-        mechanisms = self.inventory.get_active_mechanisms()
-        tracking_mech = next((m for m in mechanisms if m['type'] == 'tracking'), None)
-        chain_mech = next((m for m in mechanisms if m['type'] == 'chain'), None)
+        tracking_mech = self.inventory.get_mechanism('tracking')
+        chain_mech = self.inventory.get_mechanism('chain')
         
         # Prepare Projectile Effects
         proj_effects = []
@@ -763,8 +707,8 @@ class Player(Entity):
         elif self.data['id'] == 'triangle':
             speed = 800
             if is_tracking: speed = speed * 0.9
-            split_mech = next((m for m in mechanisms if m.get('type') == 'split'), None)
-            giant_mech = next((m for m in mechanisms if m.get('type') == 'giant'), None)
+            split_mech = self.inventory.get_mechanism('split')
+            giant_mech = self.inventory.get_mechanism('giant')
             
             base_damage = self.phys_atk
             duration = 2.0
@@ -803,7 +747,7 @@ class Player(Entity):
         elif self.data['id'] == 'circle':
             speed = 500
             if is_tracking: speed = speed * 0.9
-            giant_mech = next((m for m in mechanisms if m.get('type') == 'giant'), None)
+            giant_mech = self.inventory.get_mechanism('giant')
             dmg = self.magic_atk * (1.5 if giant_mech else 1.0)
             duration = 1.5
             proj = Projectile(self.pos.x, self.pos.y, angle, speed, dmg, duration, color, "magic", "magic",
@@ -853,7 +797,7 @@ class Player(Entity):
         if self.is_action_pressed('right'): move_vec.x += 1
         
         if move_vec.length() == 0:
-            mouse_pos = pygame.mouse.get_pos()
+            mouse_pos = input_manager.get_mouse_pos()
             screen_center = pygame.math.Vector2(settings.SCREEN_WIDTH / 2, settings.SCREEN_HEIGHT / 2)
             move_vec = pygame.math.Vector2(mouse_pos) - screen_center
         if move_vec.length() == 0:
@@ -873,6 +817,9 @@ class Player(Entity):
         self.current_mp = min(self.stats.get('max_mp', 100), self.current_mp + amount)
 
     def check_equipment_effects(self):
+        # 装备 / 细胞变化, 属性缓存失效
+        self.invalidate_stats()
+        
         # Reset flags
         self.overlord_rage = False
         self.slippery = False
@@ -2,6 +2,18 @@ import pygame
 import math
 import config.game_config as settings
 
+# 引用其他实体, 存档时跳过
+_UNSAVED_FIELDS = ('pos', 'vel', 'owner', 'tracking_target', 'hit_timers')
+
+def _is_plain(value):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return True
+    if isinstance(value, (list, tuple)):
+        return all(_is_plain(v) for v in value)
+    if isinstance(value, dict):
+        return all(isinstance(k, str) and _is_plain(v) for k, v in value.items())
+    return False
+
 class Projectile:
     def __init__(self, x, y, angle, speed, damage, duration, color, p_type="bullet", damage_type="physical", effects=None, knockback_force=0, **kwargs):
         self.pos = pygame.math.Vector2(x, y)
@@ -84,6 +96,32 @@ class Projectile:
                 if self.hit_timers[entity] <= 0:
                     del self.hit_timers[entity]
 
+    def get_save_data(self):
+        """ 保存所有基础类型字段; 引用实体的字段 (owner / tracking_target / hit_timers) 读档后重新绑定 """
+        data = {}
+        for key, value in self.__dict__.items():
+            if key in _UNSAVED_FIELDS or not _is_plain(value):
+                continue
+            data[key] = value
+        data['pos'] = (self.pos.x, self.pos.y)
+        data['vel'] = (self.vel.x, self.vel.y)
+        data['class'] = type(self).__name__
+        data['has_owner'] = self.owner is not None
+        return data
+
+    @classmethod
+    def from_save_data(cls, data, owner=None):
+        proj = object.__new__(cls)
+        proj.__dict__.update(data)
+        del proj.__dict__['class'], proj.__dict__['has_owner']
+        proj.pos = pygame.math.Vector2(data['pos'])
+        proj.vel = pygame.math.Vector2(data['vel'])
+        proj.color = tuple(data['color'])
+        proj.owner = owner if data.get('has_owner') else None
+        proj.tracking_target = None
+        proj.hit_timers = {}
+        return proj
+
     def _find_tracking_target(self, enemies):
         # Filter enemies within cone
         # Current velocity is forward direction
@@ -193,6 +231,18 @@ class MeleeSwing:
         self.range = range_val
         self.color = color
         self.sweep_angle = math.pi / 2 # 90度扇形
+
+    def get_save_data(self):
+        """ owner 读档后重新绑定到玩家 """
+        return {key: value for key, value in self.__dict__.items() if key != 'owner'}
+
+    @classmethod
+    def from_save_data(cls, data, owner):
+        swing = object.__new__(cls)
+        swing.__dict__.update(data)
+        swing.owner = owner
+        swing.color = tuple(data['color'])
+        return swing
         
     def update(self, dt_sec):
         self.duration -= dt_sec
@@ -1,11 +1,43 @@
 import sys
 import os
+import argparse
 
 # Ensure the current directory is in sys.path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from core.game import GameManager
+def parse_args():
+    parser = argparse.ArgumentParser(description="方块的升级")
+    parser.add_argument("--record", metavar="FILE", help="录制本局输入到录像文件")
+    parser.add_argument("--replay", metavar="FILE", help="回放录像文件")
+    parser.add_argument("--headless", action="store_true", help="无窗口、不限帧率回放 (性能测试 / 崩溃复现)")
+    parser.add_argument("--seed", type=int, default=None, help="录制时使用的随机种子")
+    parser.add_argument("--profile-startup", action="store_true", help="打印启动阶段的模块导入耗时树和各初始化步骤耗时")
+    # 打包后的 exe 可能被传入额外参数, 忽略未知参数
+    args, _ = parser.parse_known_args()
+    return args
 
 if __name__ == "__main__":
-    game = GameManager()
-    game.run()
+    args = parse_args()
+    if args.headless:
+        # 必须在 pygame 初始化显示之前设置
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+    from utils.startup_profiler import startup_profiler
+    if args.profile_startup:
+        # 必须在导入游戏模块之前启用
+        startup_profiler.enable()
+
+    with startup_profiler.section("import core.game"):
+        from core.game import GameManager, run_replay
+        from utils.input_manager import input_manager
+
+    if args.replay:
+        run_replay(args.replay, frame_cap=0 if args.headless else 60)
+    else:
+        if args.record:
+            input_manager.start_recording(args.record, args.seed)
+        with startup_profiler.section("GameManager()"):
+            game = GameManager()
+        startup_profiler.report()
+        game.run()
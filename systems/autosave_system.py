@@ -0,0 +1,238 @@
+import os
+import time
+import functools
+import config.game_config as settings
+from config.game_config import game_config
+from systems.save_system import save_writer, encode_save, read_save, read_save_header, migrate_save, HEADER_KEYS
+
+AUTOSAVE_FULL_FILE = "autosave.sav"
+AUTOSAVE_DELTA_FILE = "autosave.delta"
+
+# 自动存档的头部额外记录快照编号, 菜单据此判断差分是否属于当前完整快照
+FULL_HEADER_KEYS = HEADER_KEYS + ('autosave_id',)
+DELTA_HEADER_KEYS = HEADER_KEYS + ('base_id', 'delta_format')
+
+# 差分格式版本 (记录在差分文件中, 版本不一致的差分文件读取时忽略)
+DELTA_FORMAT = 2
+# 列表中超过这个比例的元素变化时整体替换, 不再逐个下标记录
+LIST_REPLACE_RATIO = 0.5
+
+# 差分格式 (递归):
+#   {'=': 新值}                                    整体替换
+#   {'map': {键: 差分}, 'del': [键]}                字典: 逐键差分
+#   {'list': [[下标, 差分]], 'len': 新长度}          列表: 逐下标差分 (元组按列表处理)
+#   {'ids': [uid 顺序], 'items': [[uid, 差分]]}     元素都带 uid 的列表 (敌人 / 掉落物): 按 uid 对应, 新增的元素整体写入
+def _uid_index(items):
+    """ 元素都是带 uid 的字典且 uid 不重复时返回 {uid: 元素}, 否则返回 None """
+    index = {}
+    for item in items:
+        if not isinstance(item, dict) or 'uid' not in item or item['uid'] in index:
+            return None
+        index[item['uid']] = item
+    return index
+
+def diff_value(old, new):
+    """ new 相对 old 的差分, 相同时返回 None """
+    if old == new:
+        return None
+    if isinstance(old, dict) and isinstance(new, dict):
+        changed = {}
+        for key, value in new.items():
+            if key not in old:
+                changed[key] = {'=': value}
+            else:
+                sub = diff_value(old[key], value)
+                if sub is not None:
+                    changed[key] = sub
+        patch = {'map': changed}
+        gone = [key for key in old if key not in new]
+        if gone:
+            patch['del'] = gone
+        return patch
+    if isinstance(old, (list, tuple)) and isinstance(new, (list, tuple)):
+        old_index = _uid_index(old) if old and new else None
+        new_index = _uid_index(new) if old_index is not None else None
+        if new_index is not None:
+            items = []
+            for uid, item in new_index.items():
+                if uid in old_index:
+                    sub = diff_value(old_index[uid], item)
+                    if sub is not None:
+                        items.append([uid, sub])
+                else:
+                    items.append([uid, {'=': item}])
+            return {'ids': list(new_index), 'items': items}
+        changed = []
+        for i, value in enumerate(new[:len(old)]):
+            sub = diff_value(old[i], value)
+            if sub is not None:
+                changed.append([i, sub])
+        changed.extend([i, {'=': new[i]}] for i in range(len(old), len(new)))
+        if len(changed) > len(new) * LIST_REPLACE_RATIO:
+            return {'=': new}
+        return {'list': changed, 'len': len(new)}
+    return {'=': new}
+
+def apply_diff(old, patch):
+    if '=' in patch:
+        return patch['=']
+    if 'map' in patch:
+        data = dict(old)
+        for key, sub in patch['map'].items():
+            data[key] = apply_diff(data.get(key), sub)
+        for key in patch.get('del', ()):
+            data.pop(key, None)
+        return data
+    if 'ids' in patch:
+        index = {item['uid']: item for item in old}
+        for uid, sub in patch['items']:
+            index[uid] = apply_diff(index.get(uid), sub)
+        return [index[uid] for uid in patch['ids']]
+    data = list(old[:patch['len']])
+    data.extend([None] * (patch['len'] - len(data)))
+    for i, sub in patch['list']:
+        data[i] = apply_diff(data[i], sub)
+    return data
+
+def diff_snapshot(base, current):
+    """ current 相对 base 的差分 (嵌套字典 / 列表逐层比较, 见 diff_value) """
+    return diff_value(base, current) or {'map': {}}
+
+def apply_snapshot_diff(base, delta):
+    return apply_diff(base, delta)
+
+class AutosaveManager:
+    """
+    自动存档: 游戏进行中每隔 autosave_interval 秒存一次。
+    - 每次只写相对上一份完整快照的差分 (autosave.delta), 每 autosave_compact_every 次写一份完整快照 (autosave.sav)
+    - 主线程的开销有上限: 敌人 / 掉落物 / 子弹列表分帧采集 (GameManager.get_deferred_save_sources),
+      每帧最多 autosave_enemies_per_frame 个敌人或 autosave_objects_per_frame 个其他对象; 差分计算和写盘在存档线程
+      各列表在采集开始时确定, 之后几帧才读完: 期间新出现的对象不在存档里, 已死亡 / 已拾取 / 已消失的跳过,
+      对象状态也可能比玩家快照晚几帧 (两者不完全同步)
+    - 差分逐层比较: 字典逐键, 列表逐下标, 敌人 / 掉落物按 uid 对应
+    - 录像回放期间不自动存档
+    """
+    def __init__(self, save_dir):
+        self.save_dir = save_dir
+        self.full_path = os.path.join(save_dir, AUTOSAVE_FULL_FILE)
+        self.delta_path = os.path.join(save_dir, AUTOSAVE_DELTA_FILE)
+        self.reset()
+
+    def reset(self):
+        self.timer = 0.0
+        self.player = None
+        self.base = None          # 最近一次提交的完整快照 (提交后不再修改, 存档线程只读)
+        self.base_id = 0
+        self.deltas_since_full = 0
+        self.pending = None       # 正在分帧采集的快照
+        self.pending_sources = [] # 还没采集完的对象列表: [(快照中的目标列表, 对象列表, 取当前列表的函数, 序列化函数, 判断, 每帧数量)]
+        self.pending_index = 0
+
+    def update(self, dt_sec, game_manager):
+        if not game_config.get('autosave_enabled', True) or settings.CONFIG_READONLY:
+            return
+        if game_manager.player is not self.player:
+            # 新的一局 (新游戏 / 读档): 下一次自动存档写完整快照
+            self.reset()
+            self.player = game_manager.player
+            if self.player is None:
+                return
+
+        if self.pending is not None:
+            self._capture_step(game_manager)
+            return
+
+        self.timer += dt_sec
+        if self.timer >= game_config.get('autosave_interval', 60.0):
+            self.timer = 0.0
+            self.pending = game_manager.build_save_snapshot(include_objects=False)
+            self.pending_sources = []
+            for path, get_objects, serialize, keep in game_manager.get_deferred_save_sources():
+                target = self.pending
+                for key in path:
+                    target = target[key]
+                setting = 'autosave_enemies_per_frame' if path == ('enemies',) else 'autosave_objects_per_frame'
+                per_frame = max(1, int(game_config.get(setting, 200)))
+                self.pending_sources.append((target, list(get_objects()), get_objects, serialize, keep, per_frame))
+            self.pending_index = 0
+            self._capture_step(game_manager)
+
+    def _capture_step(self, game_manager):
+        # 每帧只采集一个列表中的一段
+        while self.pending_sources:
+            target, objects, get_objects, serialize, keep, per_frame = self.pending_sources[0]
+            end = min(self.pending_index + per_frame, len(objects))
+            if end > self.pending_index:
+                # 采集期间已经死亡 / 被拾取 / 消失的对象不保存 (否则读档后会再死一次、重复拾取)
+                live = {id(o) for o in get_objects()}
+                target.extend(serialize(o) for o in objects[self.pending_index:end]
+                              if id(o) in live and (keep is None or keep(o)))
+            self.pending_index = end
+            if end < len(objects):
+                return
+            self.pending_sources.pop(0)
+            self.pending_index = 0
+            if end > 0:
+                break
+        if not self.pending_sources:
+            snapshot = self.pending
+            self.pending = None
+            self._submit(snapshot)
+
+    def _submit(self, snapshot):
+        compact_every = max(1, int(game_config.get('autosave_compact_every', 10)))
+        if self.base is None or self.deltas_since_full >= compact_every:
+            # 完整快照 (压缩): 之前的差分文件 base_id 不匹配, 读取时自动忽略
+            # 编号用时间戳, 避免和上一局残留的差分文件撞号
+            self.base_id = max(self.base_id + 1, time.time_ns())
+            snapshot['autosave_id'] = self.base_id
+            self.base = snapshot
+            self.deltas_since_full = 0
+            save_writer.submit(self.full_path, snapshot, encode=functools.partial(encode_save, header_keys=FULL_HEADER_KEYS))
+        else:
+            self.deltas_since_full += 1
+            encode = functools.partial(self._encode_delta, self.base, self.base_id)
+            save_writer.submit(self.delta_path, snapshot, encode=encode)
+
+    @staticmethod
+    def _encode_delta(base, base_id, snapshot):
+        # 在存档线程中计算差分
+        record = {k: snapshot.get(k) for k in HEADER_KEYS}
+        record['save_version'] = snapshot.get('save_version')
+        record['base_id'] = base_id
+        record['delta_format'] = DELTA_FORMAT
+        record['delta'] = diff_snapshot(base, snapshot)
+        return encode_save(record, header_keys=DELTA_HEADER_KEYS)
+
+    def has_autosave(self):
+        return os.path.exists(self.full_path)
+
+    def get_header(self):
+        """ 菜单显示用: 只读取两个文件的头部 """
+        if not self.has_autosave():
+            return None
+        try:
+            header = read_save_header(self.full_path)
+            if os.path.exists(self.delta_path):
+                delta_header = read_save_header(self.delta_path)
+                if delta_header.get('base_id') == header.get('autosave_id') and delta_header.get('delta_format') == DELTA_FORMAT:
+                    header = delta_header
+            return {k: header.get(k) for k in HEADER_KEYS}
+        except Exception as e:
+            print(f"Error loading autosave: {e}")
+            return None
+
+    def load(self):
+        """ 完整快照 + 匹配的差分 -> 最新的自动存档 """
+        if not self.has_autosave():
+            return None
+        try:
+            data = read_save(self.full_path)
+            if os.path.exists(self.delta_path):
+                record = read_save(self.delta_path)
+                if record.get('base_id') == data.get('autosave_id') and record.get('delta_format') == DELTA_FORMAT:
+                    data = migrate_save(apply_snapshot_diff(data, record['delta']))
+            return data
+        except Exception as e:
+            print(f"Error loading autosave: {e}")
+            return None
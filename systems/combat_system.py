@@ -3,73 +3,38 @@ import random
 import math
 import config.game_config as settings
 import core.damage as combat
-from entities.enemy import Enemy
+from entities.enemy import Enemy, update_status_effects_batch, BIT_BURN, BIT_WET
 from entities.pickup import XPOrb
 from utils.sound_manager import SoundManager
 from systems.drop_system import LootManager
+from systems.spawn_director import SpawnDirector
 
-class SpawnRule:
-    def __init__(self, start_min, end_min, spawn_interval, max_enemies, types, weights, elite_chance=0.0):
-        self.start_min = start_min
-        self.end_min = end_min
-        self.spawn_interval = spawn_interval
-        self.max_enemies = max_enemies
-        self.types = types
-        self.weights = weights
-        self.elite_chance = elite_chance
+# 敌人 LOD: 离开屏幕范围 (再加 ENEMY_LOD_MARGIN) 的普通敌人每 ENEMY_LOD_FAR_TICK 帧更新一次,
+# 只直线走向玩家, 不做分离 / 地形碰撞; 精英怪始终完整更新
+ENEMY_LOD_MARGIN = 200
+ENEMY_LOD_FAR_TICK = 4
 
 class EnemyManager:
     def __init__(self):
         self.enemies = []
         self.enemy_projectiles = []
         
-        # Time-Driven Spawning State
-        self.spawn_timer = 0
-        self.current_rule = None
-        
-        # Spawn Rules Configuration
-        self.rules = [
-            # 0-1 min: Low pressure, mostly Squares
-            SpawnRule(0, 1, 1.5, 15, ['square'], [100], 0.0),
-            
-            # 1-3 min: Medium pressure, Squares + Triangles
-            SpawnRule(1, 3, 1.0, 30, ['square', 'triangle'], [60, 40], 0.05),
-            
-            # 3-5 min: High pressure, All types + Elites
-            SpawnRule(3, 5, 0.5, 60, ['square', 'triangle', 'circle'], [40, 30, 30], 0.1),
-            
-            # 5+ min: Endless
-            SpawnRule(5, 999, 0.2, 100, ['square', 'triangle', 'circle'], [33, 33, 34], 0.2)
-        ]
+        # 刷怪导演 (波次数据见 data/enemy_stats.json)
+        self.spawn_director = SpawnDirector()
+        self.lod_frame = 0
 
     def spawn_elite(self, x, y, e_type, wave, mission_stats=None, elite_type=None):
         elite = Enemy(x, y, e_type, wave, is_elite=True, mission_stats=mission_stats, elite_type=elite_type)
-        elite.color = (min(255, elite.color[0]+50), min(255, elite.color[1]+50), min(255, elite.color[2]+50))
+        elite.apply_elite_tint()
         self.enemies.append(elite)
 
-    def spawn_enemy_around_player(self, player, game_time_min, mission_stats=None):
-        # 1. Determine Rule
-        rule = self.current_rule
-        if not rule: return
-        
-        # 2. Pick Type
-        e_type = random.choices(rule.types, weights=rule.weights, k=1)[0]
-        
-        # 3. Determine Position (Outside Screen)
-        # Random angle
-        angle = random.uniform(0, math.pi * 2)
-        
-        # Distance: Half Screen Width + Buffer
-        spawn_radius = (settings.SCREEN_WIDTH / 2) + random.uniform(100, 300)
-        spawn_pos = player.pos + pygame.math.Vector2(math.cos(angle), math.sin(angle)) * spawn_radius
-        
-        # 4. Elite Check
-        is_elite = random.random() < rule.elite_chance
-        
-        if is_elite:
-            self.spawn_elite(spawn_pos.x, spawn_pos.y, e_type, player.level, mission_stats)
-        else:
-            self.enemies.append(Enemy(spawn_pos.x, spawn_pos.y, e_type, player.level, mission_stats=mission_stats))
+    def spawn_batch(self, batch, player, mission_stats=None):
+        """ 生成刷怪导演给出的一批敌人: [(x, y, 类型, 是否精英)] """
+        for x, y, e_type, is_elite in batch:
+            if is_elite:
+                self.spawn_elite(x, y, e_type, player.level, mission_stats)
+            else:
+                self.enemies.append(Enemy(x, y, e_type, player.level, mission_stats=mission_stats))
 
     def spawn_enemy(self, player, game_time_min, force_type=None, count=1):
         """Force spawn enemy near player. Used by tutorials and debug."""
@@ -83,7 +48,7 @@ class EnemyManager:
             
             self.enemies.append(Enemy(spawn_pos.x, spawn_pos.y, e_type, player.level))
 
-    def update(self, dt, player, game_manager, game_time_min, map_manager, damage_callback=None, on_destroy_callback=None, spawn_enabled=True):
+    def update(self, dt, player, game_manager, game_time_min, map_manager, damage_callback=None, on_destroy_callback=None, spawn_enabled=True, frame_ms=None):
         dt_sec = dt / 1000.0
         
         mission_stats = {
@@ -94,46 +59,52 @@ class EnemyManager:
         
         # --- Time-Driven Spawning Logic ---
         if spawn_enabled:
-            # Find active rule
-            active_rule = None
-            for r in self.rules:
-                if r.start_min <= game_time_min < r.end_min:
-                    active_rule = r
-                    break
-            
-            if active_rule:
-                self.current_rule = active_rule
-                
-                # Check max enemies cap
-                if len(self.enemies) < active_rule.max_enemies:
-                    self.spawn_timer += dt_sec
-                    if self.spawn_timer >= active_rule.spawn_interval:
-                        self.spawn_timer = 0
-                        self.spawn_enemy_around_player(player, game_time_min, mission_stats)
+            batch = self.spawn_director.update(dt_sec, dt if frame_ms is None else frame_ms, player.pos, game_time_min, len(self.enemies))
+            if batch:
+                self.spawn_batch(batch, player, mission_stats)
 
         # --- Update Enemies ---
         player_pos = player.pos
+        # 本帧死亡敌人的掉落, 在帧末统一结算
+        loot_drops = []
         
+        # 状态效果计时 + DoT 批量结算
+        update_status_effects_batch(self.enemies, dt_sec, damage_callback)
+        
+        self.lod_frame += 1
+        lod_half_w = settings.SCREEN_WIDTH / 2 + ENEMY_LOD_MARGIN
+        lod_half_h = settings.SCREEN_HEIGHT / 2 + ENEMY_LOD_MARGIN
         for enemy in self.enemies[:]:
-            enemy.update(dt_sec, player_pos, self.enemies, self.enemy_projectiles, map_manager, damage_callback)
+            near = enemy.is_elite or (abs(enemy.pos.x - player_pos.x) < lod_half_w and abs(enemy.pos.y - player_pos.y) < lod_half_h)
+            if near:
+                if enemy.lod_pending > 0:
+                    # 刚回到视野附近: 先补上降频期间累计的时间
+                    enemy.update_far(enemy.lod_pending, player_pos)
+                    enemy.lod_pending = 0.0
+                enemy.update(dt_sec, player_pos, self.enemies, self.enemy_projectiles, map_manager, damage_callback)
 
-            # 1. Map Collision
-            if map_manager:
-                map_manager.check_collision(enemy)
+                # 1. Map Collision
+                if map_manager:
+                    map_manager.check_collision(enemy)
 
-            # 2. Hard Collision Resolution (Enemy-Enemy)
-            for other in self.enemies:
-                if other != enemy:
-                    dist_vec = enemy.pos - other.pos
-                    dist = dist_vec.length()
-                    min_dist = (enemy.size + other.size) / 2 
+                # 2. Hard Collision Resolution (Enemy-Enemy)
+                for other in self.enemies:
+                    if other != enemy:
+                        dist_vec = enemy.pos - other.pos
+                        dist = dist_vec.length()
+                        min_dist = (enemy.size + other.size) / 2 
                     
-                    if dist < min_dist:
-                        if dist > 0:
-                            push_vec = dist_vec.normalize() * (min_dist - dist)
-                            enemy.pos += push_vec * 0.5
-                        else:
-                            enemy.pos += pygame.math.Vector2(random.uniform(-1, 1), random.uniform(-1, 1)).normalize() * 1.0
+                        if dist < min_dist:
+                            if dist > 0:
+                                push_vec = dist_vec.normalize() * (min_dist - dist)
+                                enemy.pos += push_vec * 0.5
+                            else:
+                                enemy.pos += pygame.math.Vector2(random.uniform(-1, 1), random.uniform(-1, 1)).normalize() * 1.0
+            else:
+                enemy.lod_pending += dt_sec
+                if (self.lod_frame + enemy.lod_slot) % ENEMY_LOD_FAR_TICK == 0:
+                    enemy.update_far(enemy.lod_pending, player_pos)
+                    enemy.lod_pending = 0.0
             
             # Check for death
             if not enemy.alive:
@@ -146,13 +117,13 @@ class EnemyManager:
                         game_manager.mission_manager.add_kill()
                     
                     # Play sound
-                    SoundManager().play_sound(f"death_{enemy.type}")
+                    SoundManager().play_sound(f"death_{enemy.type}", enemy.pos)
                     
                     # Drop Loot & XP (Only once)
-                    game_manager.pickups.append(XPOrb(enemy.pos.x, enemy.pos.y, enemy.xp_value))
+                    game_manager.pickup_manager.add(XPOrb(enemy.pos.x, enemy.pos.y, enemy.xp_value))
                     
-                    # Ensure LootManager is called
-                    LootManager.drop_enemy_loot(game_manager, enemy.pos, enemy.type, enemy.is_elite, player)
+                    # Ensure LootManager is called (结算在帧末批量进行)
+                    loot_drops.append((enemy.pos.copy(), enemy.type, enemy.is_elite))
                 
                 # 2. Remove only when animation is finished
                 if enemy.is_dying and enemy.animation_finished:
@@ -166,7 +137,7 @@ class EnemyManager:
             min_dist = player.size/2 + enemy.size/2 * 0.8 
             
             if dist < min_dist:
-                SoundManager().play_sound("collision")
+                SoundManager().play_sound("collision", enemy.pos)
                 
                 push_dir = dist_vec.normalize() if dist > 0 else pygame.math.Vector2(1, 0)
                 overlap = min_dist - dist
@@ -197,20 +168,20 @@ class EnemyManager:
 
                 final_dmg = combat.apply_damage(enemy, calculated_dmg, source=player)
                 
-                if damage_callback: damage_callback(enemy.pos, final_dmg, 'collision')
+                if damage_callback: damage_callback(enemy.pos, final_dmg, 'collision', is_crit=is_crit)
                 if hasattr(game_manager, 'mission_manager'):
                     game_manager.mission_manager.add_damage_dealt(final_dmg)
                 if final_dmg > 0:
-                     SoundManager().play_sound(f"hit_{enemy.type}")
+                     SoundManager().play_sound(f"hit_{enemy.type}", enemy.pos)
 
                 if not enemy.alive:
                     if not enemy.is_dying:
                         enemy.die()
                         if hasattr(game_manager, 'mission_manager'):
                             game_manager.mission_manager.add_kill()
-                        SoundManager().play_sound(f"death_{enemy.type}")
-                        game_manager.pickups.append(XPOrb(enemy.pos.x, enemy.pos.y, enemy.xp_value))
-                        LootManager.drop_enemy_loot(game_manager, enemy.pos, enemy.type, enemy.is_elite, player)
+                        SoundManager().play_sound(f"death_{enemy.type}", enemy.pos)
+                        game_manager.pickup_manager.add(XPOrb(enemy.pos.x, enemy.pos.y, enemy.xp_value))
+                        loot_drops.append((enemy.pos.copy(), enemy.type, enemy.is_elite))
                     
                     if enemy.is_dying and enemy.animation_finished:
                         if enemy in self.enemies:
@@ -232,9 +203,9 @@ class EnemyManager:
                     if hasattr(game_manager, 'mission_manager'):
                         game_manager.mission_manager.add_damage_dealt(final_dmg)
                     
-                    if damage_callback: damage_callback(enemy.pos, final_dmg, p.damage_type)
+                    if damage_callback: damage_callback(enemy.pos, final_dmg, p.damage_type, is_crit=is_crit)
                     if final_dmg > 0:
-                         SoundManager().play_sound(f"hit_{enemy.type}")
+                         SoundManager().play_sound(f"hit_{enemy.type}", enemy.pos)
                     
                     if hasattr(p, 'effects') and p.effects:
                         for eff in p.effects:
@@ -253,18 +224,19 @@ class EnemyManager:
                         has_water = hasattr(p, 'wet_stats') and p.wet_stats is not None
                         has_lightning = hasattr(p, 'on_hit_effect') and p.on_hit_effect == 'lightning'
                         
-                        is_target_wet = any(eff['type'] == 'wet' for eff in enemy.status_effects)
-                        is_target_burning = any(eff['type'] == 'burn' for eff in enemy.status_effects)
+                        is_target_wet = enemy.is_wet
+                        is_target_burning = enemy.is_burning
                         
                         if (has_fire and is_target_wet) or (has_water and is_target_burning):
-                            enemy.status_effects = [e for e in enemy.status_effects if e['type'] not in ('burn', 'wet')]
+                            enemy.clear_status_effects(BIT_BURN | BIT_WET)
                             vaporize_dmg = 50 + (player.level * 10)
                             neighbors = [e for e in self.enemies if e.alive and e.pos.distance_to(enemy.pos) <= 60]
-                            for n in neighbors:
-                                calc_dmg, _ = combat.calculate_damage(vaporize_dmg, 'magic', n)
+                            defs, reds = combat.snapshot_targets(neighbors, 'magic')
+                            dmgs, _ = combat.calculate_damage_batch(vaporize_dmg, 'magic', defs, reds)
+                            for n, calc_dmg in zip(neighbors, dmgs.tolist()):
                                 fd = combat.apply_damage(n, calc_dmg, source=player)
                                 if damage_callback: damage_callback(n.pos, fd, 'magic')
-                            SoundManager().play_sound("explosion") 
+                            SoundManager().play_sound("explosion", enemy.pos)
 
                         elif has_lightning and is_target_burning:
                             skip_standard_lightning = True
@@ -278,15 +250,17 @@ class EnemyManager:
                                     calc_dmg, _ = combat.calculate_damage(dmg, 'magic', target)
                                     fd = combat.apply_damage(target, calc_dmg, source=player)
                                     if damage_callback: damage_callback(target.pos, fd, 'magic')
-                                    SoundManager().play_sound("lightning_hit")
+                                    SoundManager().play_sound("lightning_hit", target.pos)
 
                         elif has_lightning and is_target_wet:
                             skip_standard_lightning = True
-                            wet_enemies = [e for e in self.enemies if e != enemy and e.alive and any(eff['type'] == 'wet' for eff in e.status_effects)]
+                            wet_enemies = [e for e in self.enemies if e != enemy and e.alive and e.is_wet]
                             curr = enemy
                             jumps = 5
                             dmg = p.damage * 0.2
                             visited = {enemy}
+                            # 先确定跳跃路径 (不依赖伤害结果), 再批量结算
+                            jump_targets = []
                             for _ in range(jumps):
                                 best_next = None
                                 min_d = 200
@@ -297,14 +271,17 @@ class EnemyManager:
                                         min_d = d
                                         best_next = we
                                 if best_next:
-                                    calc_dmg, _ = combat.calculate_damage(dmg, 'magic', best_next)
-                                    fd = combat.apply_damage(best_next, calc_dmg, source=player)
-                                    if damage_callback: damage_callback(best_next.pos, fd, 'magic')
+                                    jump_targets.append(best_next)
                                     visited.add(best_next)
                                     curr = best_next
                                 else:
                                     break
-                            SoundManager().play_sound("lightning_hit")
+                            defs, reds = combat.snapshot_targets(jump_targets, 'magic')
+                            dmgs, _ = combat.calculate_damage_batch(dmg, 'magic', defs, reds)
+                            for target, calc_dmg in zip(jump_targets, dmgs.tolist()):
+                                fd = combat.apply_damage(target, calc_dmg, source=player)
+                                if damage_callback: damage_callback(target.pos, fd, 'magic')
+                            SoundManager().play_sound("lightning_hit", enemy.pos)
                                 
                     if hasattr(p, 'knockback_force') and p.knockback_force > 0:
                          push_dir = (enemy.pos - p.pos).normalize() if (enemy.pos - p.pos).length() > 0 else pygame.math.Vector2(1, 0)
@@ -321,16 +298,21 @@ class EnemyManager:
                                 calc_dmg, _ = combat.calculate_damage(dmg, 'magic', target)
                                 final_chain_dmg = combat.apply_damage(target, calc_dmg, source=player)
                                 if damage_callback: damage_callback(target.pos, final_chain_dmg, 'magic')
-                                SoundManager().play_sound("lightning_hit")
+                                SoundManager().play_sound("lightning_hit", target.pos)
                                 
                     if hasattr(p, 'chain_info') and p.chain_info:
                         chain_range = p.chain_info.get('range', 100)
                         damage_pct = p.chain_info.get('pct', 0.3)
                         element = p.chain_info.get('element', None)
                         chain_targets = [e for e in self.enemies if e != enemy and e.alive and e.pos.distance_to(enemy.pos) <= chain_range]
-                        for target in chain_targets:
-                            chain_dmg = p.damage * damage_pct
-                            calc_dmg, _ = combat.calculate_damage(chain_dmg, 'physical', target)
+                        chain_dmg = p.damage * damage_pct
+                        defs, reds = combat.snapshot_targets(chain_targets, 'physical')
+                        phys_dmgs, _ = combat.calculate_damage_batch(chain_dmg, 'physical', defs, reds)
+                        if element == 'lightning':
+                            defs, reds = combat.snapshot_targets(chain_targets, 'magic')
+                            magic_dmgs, _ = combat.calculate_damage_batch(chain_dmg * 0.5, 'magic', defs, reds)
+                            magic_dmgs = magic_dmgs.tolist()
+                        for i, (target, calc_dmg) in enumerate(zip(chain_targets, phys_dmgs.tolist())):
                             final_chain_dmg = combat.apply_damage(target, calc_dmg, source=player)
                             if damage_callback: damage_callback(target.pos, final_chain_dmg, 'physical')
                             if element == 'fire':
@@ -339,11 +321,10 @@ class EnemyManager:
                                 push_dir = (target.pos - enemy.pos).normalize() if (target.pos - enemy.pos).length() > 0 else pygame.math.Vector2(1, 0)
                                 target.pos += push_dir * 50
                             elif element == 'lightning':
-                                calc_dmg, _ = combat.calculate_damage(chain_dmg * 0.5, 'magic', target)
-                                extra_dmg = combat.apply_damage(target, calc_dmg, source=player)
+                                extra_dmg = combat.apply_damage(target, magic_dmgs[i], source=player)
                                 if damage_callback: damage_callback(target.pos, extra_dmg, 'magic')
                         if chain_targets:
-                             SoundManager().play_sound("lightning_hit")
+                             SoundManager().play_sound("lightning_hit", enemy.pos)
 
                     if getattr(p, 'type', None) == 'shrink_ball':
                         enemy.apply_status_effect('compress', 3.0, 1.0)
@@ -360,9 +341,9 @@ class EnemyManager:
                             enemy.die()
                             if hasattr(game_manager, 'mission_manager'):
                                 game_manager.mission_manager.add_kill()
-                            SoundManager().play_sound(f"death_{enemy.type}")
-                            game_manager.pickups.append(XPOrb(enemy.pos.x, enemy.pos.y, enemy.xp_value))
-                            LootManager.drop_enemy_loot(game_manager, enemy.pos, enemy.type, enemy.is_elite, player)
+                            SoundManager().play_sound(f"death_{enemy.type}", enemy.pos)
+                            game_manager.pickup_manager.add(XPOrb(enemy.pos.x, enemy.pos.y, enemy.xp_value))
+                            loot_drops.append((enemy.pos.copy(), enemy.type, enemy.is_elite))
                         if enemy.is_dying and enemy.animation_finished:
                             if enemy in self.enemies:
                                 self.enemies.remove(enemy)
@@ -386,16 +367,16 @@ class EnemyManager:
                             if final_dmg > 1 and damage_callback: damage_callback(enemy.pos, final_dmg, 'physical')
                             
                             if final_dmg > 0 and random.random() < 0.3:
-                                SoundManager().play_sound(f"hit_{enemy.type}")
+                                SoundManager().play_sound(f"hit_{enemy.type}", enemy.pos)
                             
                             if not enemy.alive:
                                 if not enemy.is_dying:
                                     enemy.die()
                                     if hasattr(game_manager, 'mission_manager'):
                                         game_manager.mission_manager.add_kill()
-                                    SoundManager().play_sound(f"death_{enemy.type}")
-                                    game_manager.pickups.append(XPOrb(enemy.pos.x, enemy.pos.y, enemy.xp_value))
-                                    LootManager.drop_enemy_loot(game_manager, enemy.pos, enemy.type, enemy.is_elite, player)
+                                    SoundManager().play_sound(f"death_{enemy.type}", enemy.pos)
+                                    game_manager.pickup_manager.add(XPOrb(enemy.pos.x, enemy.pos.y, enemy.xp_value))
+                                    loot_drops.append((enemy.pos.copy(), enemy.type, enemy.is_elite))
                                 
                                 if enemy.is_dying and enemy.animation_finished:
                                     if enemy in self.enemies:
@@ -445,6 +426,9 @@ class EnemyManager:
                  if m.duration > 0:
                      map_manager.check_melee_collision(player, m, dt_sec, damage_callback, on_destroy_callback)
 
+        if loot_drops:
+            LootManager.drop_enemy_loot_batch(game_manager, loot_drops, player)
+
     def draw(self, surface, camera):
         for enemy in self.enemies:
             enemy.draw(surface, camera)
@@ -452,24 +436,11 @@ class EnemyManager:
         for p in self.enemy_projectiles:
             p.draw(surface, camera)
 
+    def get_enemy_save_data(self, enemy):
+        return enemy.get_save_data()
+
     def get_save_data(self):
-        enemies_data = []
-        for enemy in self.enemies:
-            data = {
-                'x': enemy.pos.x,
-                'y': enemy.pos.y,
-                'type': enemy.type,
-                'hp': enemy.current_hp,
-                'max_hp': enemy.max_hp
-            }
-            enemies_data.append(data)
-        return enemies_data
+        return [self.get_enemy_save_data(enemy) for enemy in self.enemies]
 
     def load_from_data(self, data):
-        self.enemies = []
-        for enemy_data in data:
-            enemy = Enemy(enemy_data['x'], enemy_data['y'], enemy_data['type'], 1)
-            enemy.pos = pygame.math.Vector2(enemy_data['x'], enemy_data['y'])
-            enemy.max_hp = enemy_data['max_hp']
-            enemy.current_hp = enemy_data['hp']
-            self.enemies.append(enemy)
+        self.enemies = [Enemy.from_save_data(enemy_data) for enemy_data in data]
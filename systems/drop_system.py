@@ -1,6 +1,7 @@
 import random
 from entities.pickup import Pickup, XPOrb
-from data.item_data import OTHER_ITEMS, EQUIPMENT_ITEMS, SKILL_ITEMS, CELL_ITEMS, get_item_by_id, EQUIPMENT_TEMPLATES
+from data.item_data import get_item_by_id, get_loot_table
+from config.drop_config import ENEMY_DROP_CHANCE, ELITE_DROP_CHANCE, CHEST_RARITY_MAP
 from utils.item_generator import generate_equipment
 
 class LootManager:
@@ -9,41 +10,42 @@ class LootManager:
         
     @staticmethod
     def drop_enemy_loot(game_manager, pos, enemy_type, is_elite, player):
-        # Item Drops
-        # Base chance
-        drop_chance = 0.05
-        if is_elite:
-            drop_chance = 1.0 # Elites always drop something
-            
-        if random.random() < drop_chance:
-            # Randomly select item type
-            roll = random.random()
-            item = None
-            
-            if roll < 0.4: # 40% chance for food/potion
-                keys = list(OTHER_ITEMS.keys())
-                if keys:
-                    key = random.choice(keys)
-                    item = get_item_by_id(key)
-            elif roll < 0.7: # 30% chance for equipment
-                keys = list(EQUIPMENT_ITEMS.keys())
-                if keys:
-                    key = random.choice(keys)
-                    item = get_item_by_id(key)
-            elif roll < 0.9: # 20% chance for skill
-                keys = list(SKILL_ITEMS.keys())
-                if keys:
-                    key = random.choice(keys)
-                    item = get_item_by_id(key)
-            else: # 10% chance for core
-                keys = list(CELL_ITEMS.keys())
-                if keys:
-                    key = random.choice(keys)
-                    item = get_item_by_id(key)
-                    
-            if item:
-                pickup = Pickup(pos.x, pos.y, 'item', item=item)
-                game_manager.pickups.append(pickup)
+        LootManager.drop_enemy_loot_batch(game_manager, [(pos, enemy_type, is_elite)], player)
+
+    @staticmethod
+    def roll_enemy_loot_batch(drops):
+        """
+        一次性为 N 个死亡的敌人结算掉落。
+        drops: [(pos, enemy_type, is_elite), ...]
+        返回 [(pos, item), ...]
+        """
+        # Item Drops: 精英必掉, 普通怪按基础概率
+        rand = random.random
+        dropping = []
+        for pos, enemy_type, is_elite in drops:
+            drop_chance = ELITE_DROP_CHANCE if is_elite else ENEMY_DROP_CHANCE
+            if rand() < drop_chance:
+                dropping.append(pos)
+        if not dropping:
+            return []
+
+        # Randomly select item type (40% food/potion, 30% equipment, 20% skill, 10% core)
+        categories = get_loot_table('enemy_category').sample_n(len(dropping))
+        keys_by_category = get_loot_table('enemy_keys')
+
+        results = []
+        for pos, category in zip(dropping, categories):
+            keys = keys_by_category[category]
+            if keys:
+                item = get_item_by_id(random.choice(keys))
+                if item:
+                    results.append((pos, item))
+        return results
+
+    @staticmethod
+    def drop_enemy_loot_batch(game_manager, drops, player):
+        for pos, item in LootManager.roll_enemy_loot_batch(drops):
+            game_manager.pickup_manager.add(Pickup(pos.x, pos.y, 'item', item=item))
 
     def check_drops(self, enemy, game_manager):
         # Legacy/Instance method wrapper if needed, or remove if unused
@@ -51,22 +53,14 @@ class LootManager:
 
     @staticmethod
     def drop_chest_loot(game_manager, pos, chest_rarity, player_luck):
-        rarity_map = {
-            'white': 'white',
-            'green': 'green',
-            'blue': 'blue',
-            'purple': 'purple',
-            'gold': 'orange',
-            'orange': 'orange'
-        }
-        rarity = rarity_map.get(chest_rarity, 'white')
+        rarity = CHEST_RARITY_MAP.get(chest_rarity, 'white')
         
         # Pick a random equipment template and generate item using new generator
-        if not EQUIPMENT_TEMPLATES:
+        templates = get_loot_table('equipment_templates')
+        if not templates:
             return
-        key = random.choice(list(EQUIPMENT_TEMPLATES.keys()))
-        template = EQUIPMENT_TEMPLATES[key]
+        template = random.choice(templates)
         item = generate_equipment(template, rarity=rarity)
         
         pickup = Pickup(pos.x, pos.y, 'item', item=item)
-        game_manager.pickups.append(pickup)
+        game_manager.pickup_manager.add(pickup)
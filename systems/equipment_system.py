@@ -25,6 +25,11 @@ class Inventory:
         }
         
         # Cell Slots
+        # cells_version: 细胞栏每次变化 +1, 机制解析结果按版本缓存
+        self.cells_version = 0
+        self._mechanism_cache_version = -1
+        self._mechanisms = []
+        self._mechanism_index = {}
         self.cells = [None] * 9 # Expanded to 9 slots
         self.cell_slots_layout = []
         
@@ -68,6 +73,16 @@ class Inventory:
         self.merge_dialog = None # None or {'source': item, 'target': item, 'rect': Rect, ...}
         self.suppress_merge_confirm = False
 
+    @property
+    def cells(self):
+        return self._cells
+
+    @cells.setter
+    def cells(self, value):
+        # 整体替换 (读档) 也要让机制缓存失效
+        self._cells = value
+        self.cells_version += 1
+
     def get_stat_bonus(self, stat_name):
         bonus = 0
         # Equipment Bonus
@@ -91,10 +106,51 @@ class Inventory:
                     
         return bonus
 
+    def get_all_stat_bonuses(self):
+        """ 一次遍历汇总所有属性加成, 供 Player 属性缓存使用 """
+        bonuses = {}
+        slots = list(self.equipment.values())
+        if hasattr(self, 'cells'):
+            slots += self.cells
+        for item in slots:
+            if item and hasattr(item, 'stats'):
+                # Level 0 = 100%, Level 1 = 200%, Level 2 = 300%
+                mult = 1.0 + getattr(item, 'awakened_level', 0) * 1.0
+                for stat_name, val in item.stats.items():
+                    bonuses[stat_name] = bonuses.get(stat_name, 0) + val * mult
+        return bonuses
+
+    def notify_loadout_changed(self):
+        """ 装备 / 细胞 / 觉醒等级变化后调用, 让玩家刷新装备效果和属性缓存 """
+        self.cells_version += 1
+        if self.player and hasattr(self.player, 'check_equipment_effects'):
+            self.player.check_equipment_effects()
+
     def get_active_mechanisms(self):
         """
         Returns a list of active mechanisms derived from connected Cores and Cells.
         Structure: [{'type': 'tracking', 'element': 'fire', 'core_item': item_obj}, ...]
+        The result is cached until cells_version changes; treat it as read-only.
+        """
+        if self._mechanism_cache_version != self.cells_version:
+            self._mechanisms = self._resolve_mechanisms()
+            self._mechanism_index = {}
+            for mech in self._mechanisms:
+                # 同类型只取第一个, 与原先 next(...) 的语义一致
+                self._mechanism_index.setdefault(mech.get('type'), mech)
+            self._mechanism_cache_version = self.cells_version
+        return self._mechanisms
+
+    def get_mechanism(self, mech_type):
+        """Returns the first active mechanism of the given type, or None."""
+        self.get_active_mechanisms()
+        return self._mechanism_index.get(mech_type)
+
+    def has_mechanism(self, mech_type):
+        return self.get_mechanism(mech_type) is not None
+
+    def _resolve_mechanisms(self):
+        """
         Logic: 
         1. Check connections between Center (0) and Satellites (1-6).
         2. Pair 'Mechanism Cells' with 'Elemental Cores'.
@@ -500,6 +556,7 @@ class Inventory:
                 if pygame.Rect(x + 20, y + 110, 80, 30).collidepoint(mx, my):
                     self._execute_merge(self.merge_dialog['target'], self.merge_dialog['source'])
                     self.merge_dialog = None
+                    self.notify_loadout_changed()
                     return
                 
                 # Cancel
@@ -878,3 +935,5 @@ class Inventory:
                 
                 self.dragging_item = None
                 self.dragging_from = None
+                # 拖放可能改变了装备 / 细胞 / 吞噬进度
+                self.notify_loadout_changed()
@@ -83,6 +83,22 @@ class MissionManager:
         self.current_progress['damage_taken'] += int(amount)
         self.check_completion()
 
+    def get_save_data(self):
+        return {
+            'current_progress': dict(self.current_progress),
+            'total_kills': self.total_kills,
+            'heart_awarded': self.heart_awarded,
+            'completions': self.completions,
+            'difficulty_scale': self.difficulty_scale,
+        }
+
+    def load_from_data(self, data):
+        self.current_progress.update(data.get('current_progress', {}))
+        self.total_kills = data.get('total_kills', 0)
+        self.heart_awarded = data.get('heart_awarded', False)
+        self.completions = data.get('completions', 0)
+        self.difficulty_scale = data.get('difficulty_scale', 1.0)
+
     def check_completion(self):
         completed = False
         for key in self.base_targets:
@@ -0,0 +1,155 @@
+import math
+import numpy as np
+import config.game_config as settings
+
+# 空间索引的网格大小
+PICKUP_CELL_SIZE = 128
+# 拾取范围之外再多醒着的距离, 更远的掉落物休眠 (不参与更新)
+PICKUP_WAKE_MARGIN = 150
+# 距离小于这个值时拾取
+PICKUP_COLLECT_RADIUS = 15
+
+# 经验球合并: 掉落物数量达到 XP_MERGE_MIN_PICKUPS 后, 新的经验球并入附近静止的经验球 (经验值相加)
+XP_MERGE_MIN_PICKUPS = 32
+XP_MERGE_DISTANCE = 48
+
+# 浮动动画 (绘制时按共享时钟计算, 所有掉落物同步)
+PICKUP_BOB_SPEED = 5.0
+PICKUP_BOB_HEIGHT = 5.0
+
+class PickupManager:
+    """
+    掉落物管理:
+    - 按网格建立空间索引, 每帧只更新玩家附近 (拾取范围 + PICKUP_WAKE_MARGIN) 的掉落物, 其余休眠
+    - 醒着的掉落物的磁吸 / 拾取判定用 numpy 一次算完
+    - 浮动动画不再修改坐标, 绘制时由 bob_offset() 给出
+    - update() 返回本帧拾取到的掉落物, 处理完后用 remove_many() 一次移除
+    """
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.pickups = []
+        self.cells = {}     # (cx, cy) -> [pickup]
+        self.always_awake = [] # auto_magnet 的掉落物 (加入时判断)
+        self.clock = 0.0
+
+    def __len__(self):
+        return len(self.pickups)
+
+    def __iter__(self):
+        return iter(self.pickups)
+
+    @staticmethod
+    def _cell_of(pos):
+        return (int(pos.x // PICKUP_CELL_SIZE), int(pos.y // PICKUP_CELL_SIZE))
+
+    def add(self, pickup, merge=True):
+        """ 加入掉落物, 返回实际保留的对象 (经验球可能被合并到已有的经验球上) """
+        if merge and pickup.type == 'xp' and len(self.pickups) >= XP_MERGE_MIN_PICKUPS:
+            keeper = self._find_merge_target(pickup)
+            if keeper is not None:
+                keeper.absorb(pickup)
+                return keeper
+        pickup.cell = self._cell_of(pickup.pos)
+        self.cells.setdefault(pickup.cell, []).append(pickup)
+        if pickup.auto_magnet:
+            self.always_awake.append(pickup)
+        self.pickups.append(pickup)
+        return pickup
+
+    def _find_merge_target(self, pickup):
+        max_dist_sq = XP_MERGE_DISTANCE * XP_MERGE_DISTANCE
+        for other in self.cells.get(self._cell_of(pickup.pos), ()):
+            if other.type == 'xp' and not other.magnetized and not other.auto_magnet:
+                if (other.pos - pickup.pos).length_squared() < max_dist_sq:
+                    return other
+        return None
+
+    def remove_many(self, removed):
+        if not removed:
+            return
+        removed_ids = {id(p) for p in removed}
+        for p in removed:
+            bucket = self.cells.get(p.cell)
+            if bucket is not None:
+                bucket[:] = [q for q in bucket if id(q) not in removed_ids]
+                if not bucket:
+                    del self.cells[p.cell]
+        self.pickups = [p for p in self.pickups if id(p) not in removed_ids]
+        self.always_awake = [p for p in self.always_awake if id(p) not in removed_ids]
+
+    def query(self, center, half_w, half_h=None):
+        """ 返回以 center 为中心、半宽 half_w / 半高 half_h 的矩形所覆盖网格内的掉落物 (粗筛) """
+        if half_h is None:
+            half_h = half_w
+        min_cx = int((center.x - half_w) // PICKUP_CELL_SIZE)
+        max_cx = int((center.x + half_w) // PICKUP_CELL_SIZE)
+        min_cy = int((center.y - half_h) // PICKUP_CELL_SIZE)
+        max_cy = int((center.y + half_h) // PICKUP_CELL_SIZE)
+        result = []
+        cells = self.cells
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    result.extend(bucket)
+        return result
+
+    def get_visible(self, camera, margin=50):
+        half_w = settings.SCREEN_WIDTH / 2 / camera.zoom + margin
+        half_h = settings.SCREEN_HEIGHT / 2 / camera.zoom + margin
+        return self.query(camera.pos, half_w, half_h)
+
+    def bob_offset(self):
+        return math.sin(self.clock * PICKUP_BOB_SPEED) * PICKUP_BOB_HEIGHT
+
+    def update(self, dt_sec, player_pos, pickup_range):
+        """ 更新醒着的掉落物 (磁吸移动), 返回本帧可以拾取的掉落物列表 """
+        self.clock += dt_sec
+
+        awake = self.query(player_pos, pickup_range + PICKUP_WAKE_MARGIN)
+        if self.always_awake:
+            seen = {id(p) for p in awake}
+            awake.extend(p for p in self.always_awake if id(p) not in seen)
+        if not awake:
+            return []
+
+        x = np.array([p.pos.x for p in awake])
+        y = np.array([p.pos.y for p in awake])
+        speed = np.array([p.speed for p in awake])
+        auto = np.array([p.auto_magnet for p in awake], dtype=bool)
+
+        dx = player_pos.x - x
+        dy = player_pos.y - y
+        dist = np.hypot(dx, dy)
+        magnet = auto | (dist < pickup_range)
+        collected = magnet & (dist < PICKUP_COLLECT_RADIUS)
+
+        moving = magnet & (dist > 0)
+        for i, m in enumerate(magnet.tolist()):
+            awake[i].magnetized = m
+        if moving.any():
+            idx = np.flatnonzero(moving)
+            step = speed[idx] * dt_sec / dist[idx]
+            new_x = (x[idx] + dx[idx] * step).tolist()
+            new_y = (y[idx] + dy[idx] * step).tolist()
+            for i, px, py in zip(idx.tolist(), new_x, new_y):
+                p = awake[i]
+                p.pos.x = px
+                p.pos.y = py
+                self._reindex(p)
+
+        return [awake[i] for i in np.flatnonzero(collected)]
+
+    def _reindex(self, pickup):
+        cell = self._cell_of(pickup.pos)
+        if cell == pickup.cell:
+            return
+        bucket = self.cells.get(pickup.cell)
+        if bucket is not None:
+            bucket.remove(pickup)
+            if not bucket:
+                del self.cells[pickup.cell]
+        pickup.cell = cell
+        self.cells.setdefault(cell, []).append(pickup)
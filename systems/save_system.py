@@ -0,0 +1,422 @@
+import os
+import json
+import queue
+import threading
+import struct
+import zlib
+
+# 存档文件格式 (小端):
+#   SAVE_MAGIC | u16 格式版本 | u8 标志位 | u32 头部长度 | 头部 | u32 正文长度 | 正文
+#   头部: 打包后的小字典 (时间戳 / 角色 / 等级 / 游戏时长), 菜单只读这一段
+#   正文: 打包后的完整存档, 标志位 SAVE_FLAG_ZLIB 时为 zlib 压缩流
+# 打包格式类似 msgpack: 1 字节类型标记 + 定长数据
+SAVE_MAGIC = b"CUSV"
+SAVE_FORMAT_VERSION = 1
+SAVE_FLAG_ZLIB = 1
+
+# 存档内容的版本号, 结构变化时 +1 并在 SAVE_MIGRATIONS 中添加迁移函数
+# 1: 旧版 JSON 存档 (没有 save_version 字段)
+SAVE_VERSION = 2
+
+HEADER_KEYS = ('timestamp', 'char_id', 'char_name', 'level', 'game_time')
+
+_PREFIX_STRUCT = struct.Struct("<HBI")
+_LEN_STRUCT = struct.Struct("<I")
+_I8 = struct.Struct("<b")
+_I32 = struct.Struct("<i")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+
+_T_NONE, _T_TRUE, _T_FALSE = b"N", b"T", b"F"
+_T_I8, _T_I32, _T_I64, _T_F64 = b"b", b"i", b"q", b"d"
+_T_STR, _T_LIST, _T_MAP = b"s", b"l", b"m"
+
+def _pack_into(value, out):
+    if value is None:
+        out.append(_T_NONE)
+    elif value is True:
+        out.append(_T_TRUE)
+    elif value is False:
+        out.append(_T_FALSE)
+    elif isinstance(value, int):
+        if -128 <= value <= 127:
+            out.append(_T_I8 + _I8.pack(value))
+        elif -2147483648 <= value <= 2147483647:
+            out.append(_T_I32 + _I32.pack(value))
+        else:
+            out.append(_T_I64 + _I64.pack(value))
+    elif isinstance(value, float):
+        out.append(_T_F64 + _F64.pack(value))
+    elif isinstance(value, str):
+        data = value.encode('utf-8')
+        out.append(_T_STR + _LEN_STRUCT.pack(len(data)) + data)
+    elif isinstance(value, (list, tuple)):
+        out.append(_T_LIST + _LEN_STRUCT.pack(len(value)))
+        for v in value:
+            _pack_into(v, out)
+    elif isinstance(value, dict):
+        out.append(_T_MAP + _LEN_STRUCT.pack(len(value)))
+        for k, v in value.items():
+            _pack_into(k, out)
+            _pack_into(v, out)
+    else:
+        raise TypeError(f"Cannot pack value of type {type(value).__name__}")
+
+def pack_value(value):
+    out = []
+    _pack_into(value, out)
+    return b"".join(out)
+
+def _unpack_from(data, offset):
+    tag = data[offset:offset + 1]
+    offset += 1
+    if tag == _T_I8:
+        return _I8.unpack_from(data, offset)[0], offset + 1
+    if tag == _T_STR:
+        (n,) = _LEN_STRUCT.unpack_from(data, offset)
+        offset += 4
+        return data[offset:offset + n].decode('utf-8'), offset + n
+    if tag == _T_F64:
+        return _F64.unpack_from(data, offset)[0], offset + 8
+    if tag == _T_MAP:
+        (n,) = _LEN_STRUCT.unpack_from(data, offset)
+        offset += 4
+        result = {}
+        for _ in range(n):
+            k, offset = _unpack_from(data, offset)
+            v, offset = _unpack_from(data, offset)
+            result[k] = v
+        return result, offset
+    if tag == _T_LIST:
+        (n,) = _LEN_STRUCT.unpack_from(data, offset)
+        offset += 4
+        result = []
+        for _ in range(n):
+            v, offset = _unpack_from(data, offset)
+            result.append(v)
+        return result, offset
+    if tag == _T_I32:
+        return _I32.unpack_from(data, offset)[0], offset + 4
+    if tag == _T_I64:
+        return _I64.unpack_from(data, offset)[0], offset + 8
+    if tag == _T_NONE:
+        return None, offset
+    if tag == _T_TRUE:
+        return True, offset
+    if tag == _T_FALSE:
+        return False, offset
+    raise ValueError(f"Corrupted save data: unknown tag {tag!r} at {offset - 1}")
+
+def unpack_value(data):
+    value, _ = _unpack_from(data, 0)
+    return value
+
+# --- 存档迁移 ---
+def _migrate_1_to_2(data):
+    # 旧版 JSON 存档: 补齐后来新增的字段
+    data.setdefault('level', 1)
+    data.setdefault('current_xp', 0)
+    data.setdefault('xp_to_next_level', 100)
+    data.setdefault('destruction_count', 0)
+    data.setdefault('game_time', 0)
+    data.setdefault('enemies', [])
+    return data
+
+# version -> 把该版本升级到 version + 1 的函数
+SAVE_MIGRATIONS = {
+    1: _migrate_1_to_2,
+}
+
+def migrate_save(data):
+    version = data.get('save_version', 1)
+    while version < SAVE_VERSION:
+        migrate = SAVE_MIGRATIONS.get(version)
+        if migrate is None:
+            raise ValueError(f"No migration from save version {version}")
+        data = migrate(data)
+        version += 1
+        data['save_version'] = version
+    return data
+
+# --- 编码 / 解码 ---
+def encode_save(data, compress=True, header_keys=HEADER_KEYS):
+    """ 存档 dict -> 二进制 (在写入线程中调用) """
+    header = pack_value({k: data.get(k) for k in header_keys})
+    body = pack_value(data)
+    flags = 0
+    if compress:
+        body = zlib.compress(body, 6)
+        flags |= SAVE_FLAG_ZLIB
+    return b"".join((
+        SAVE_MAGIC,
+        _PREFIX_STRUCT.pack(SAVE_FORMAT_VERSION, flags, len(header)),
+        header,
+        _LEN_STRUCT.pack(len(body)),
+        body,
+    ))
+
+def encode_json_save(data, compact=False):
+    if compact:
+        text = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    else:
+        text = json.dumps(data, ensure_ascii=False, indent=2)
+    return text.encode('utf-8')
+
+def _read_prefix(f, path):
+    magic = f.read(len(SAVE_MAGIC))
+    if magic != SAVE_MAGIC:
+        return None
+    fmt_version, flags, header_len = _PREFIX_STRUCT.unpack(f.read(_PREFIX_STRUCT.size))
+    if fmt_version > SAVE_FORMAT_VERSION:
+        raise ValueError(f"Save {path} uses newer format {fmt_version}")
+    header = unpack_value(f.read(header_len))
+    return flags, header
+
+def read_save_header(path):
+    """ 只读取存档头部 (菜单显示用), 不解码正文。旧版 JSON 存档只能整体解析 """
+    with open(path, 'rb') as f:
+        prefix = _read_prefix(f, path)
+    if prefix is not None:
+        return prefix[1]
+    data = read_save(path)
+    return {k: data.get(k) for k in HEADER_KEYS}
+
+def read_save(path):
+    """ 读取完整存档 (二进制或旧版 JSON), 并迁移到当前版本 """
+    with open(path, 'rb') as f:
+        prefix = _read_prefix(f, path)
+        if prefix is None:
+            f.seek(0)
+            data = json.loads(f.read().decode('utf-8'))
+        else:
+            flags, _ = prefix
+            (body_len,) = _LEN_STRUCT.unpack(f.read(_LEN_STRUCT.size))
+            body = f.read(body_len)
+            if len(body) != body_len:
+                raise ValueError(f"Save {path} is truncated")
+            if flags & SAVE_FLAG_ZLIB:
+                body = zlib.decompress(body)
+            data = unpack_value(body)
+    return migrate_save(data)
+
+def write_atomic(path, payload):
+    """ 先写临时文件再 rename, 写到一半崩溃也不会损坏原存档 """
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+class SaveWriter:
+    """
+    后台存档写入线程。
+    主线程只负责生成快照 (纯 dict / list, 不引用游戏对象), 序列化和写盘都在工作线程完成。
+    同一路径连续提交时只写最新的一份。
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(SaveWriter, cls).__new__(cls)
+            cls._instance.jobs = queue.Queue()
+            cls._instance.latest = {}   # path -> 最新待写入的快照
+            cls._instance.lock = threading.Lock()
+            cls._instance.thread = None
+            cls._instance.last_error = None
+        return cls._instance
+
+    def _ensure_thread(self):
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self._run, name="SaveWriter", daemon=True)
+            self.thread.start()
+
+    def submit(self, path, data, encode=encode_save, on_done=None):
+        """ 提交一个快照。encode(data) -> bytes 和 on_done(path, error) 都在工作线程中调用 """
+        with self.lock:
+            coalesced = path in self.latest
+            self.latest[path] = (data, encode, on_done)
+        if not coalesced:
+            self.jobs.put(path)
+        self._ensure_thread()
+
+    def _run(self):
+        while True:
+            path = self.jobs.get()
+            try:
+                with self.lock:
+                    data, encode, on_done = self.latest.pop(path)
+                error = None
+                try:
+                    write_atomic(path, encode(data))
+                except Exception as e:
+                    error = e
+                    self.last_error = e
+                    print(f"Error saving game: {e}")
+                if on_done:
+                    on_done(path, error)
+            finally:
+                self.jobs.task_done()
+
+    def is_busy(self):
+        return self.jobs.unfinished_tasks > 0
+
+    def flush(self):
+        """ 等待所有存档写完 (退出游戏前调用) """
+        if self.thread is not None:
+            self.jobs.join()
+
+
+SAVE_INDEX_FILE = "index.json"
+
+class SaveSlotStore:
+    """
+    存档槽位。菜单只读取索引文件 (saves/index.json) 里的头部信息,
+    完整存档在读档时才解析, 鼠标悬停在槽位上时提前在后台线程中读取。
+    索引记录存档文件的 mtime / size, 不一致 (例如手动替换了存档) 时只重建该槽位。
+    """
+    def __init__(self, save_dir, slot_count=3):
+        self.save_dir = save_dir
+        self.slot_count = slot_count
+        self.index_path = os.path.join(save_dir, SAVE_INDEX_FILE)
+        self.lock = threading.Lock()
+        self.entries = [None] * slot_count   # 索引条目: {'file', 'mtime', 'size', 'header'}
+        self.cache = {}                      # slot -> 已解析的完整存档
+        self.prefetching = {}                # slot -> Thread
+        self.pending_writes = set()          # 已提交但还没落盘的槽位
+        self.load_index()
+
+    def slot_path(self, slot_index, ext):
+        return os.path.join(self.save_dir, f"save_{slot_index}{ext}")
+
+    def find_slot_file(self, slot_index):
+        # 二进制 (.sav) 和旧版 JSON (.json) 存档都存在时取较新的一个
+        candidates = [self.slot_path(slot_index, ext) for ext in (".sav", ".json")]
+        candidates = [p for p in candidates if os.path.exists(p)]
+        if not candidates:
+            return None
+        return max(candidates, key=os.path.getmtime)
+
+    def _make_entry(self, path, header):
+        st = os.stat(path)
+        return {'file': os.path.basename(path), 'mtime': st.st_mtime, 'size': st.st_size, 'header': header}
+
+    def _entry_valid(self, entry, path):
+        if not entry or entry.get('file') != os.path.basename(path):
+            return False
+        st = os.stat(path)
+        return entry.get('mtime') == st.st_mtime and entry.get('size') == st.st_size
+
+    def load_index(self):
+        index = {}
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    index = json.load(f)
+            except Exception as e:
+                print(f"Error loading save index: {e}")
+
+        dirty = False
+        for i in range(self.slot_count):
+            entry = index.get(str(i))
+            path = self.find_slot_file(i)
+            if path is None:
+                dirty = dirty or entry is not None
+                self.entries[i] = None
+            elif self._entry_valid(entry, path):
+                self.entries[i] = entry
+            else:
+                try:
+                    self.entries[i] = self._make_entry(path, read_save_header(path))
+                except Exception as e:
+                    print(f"Error loading save {i}: {e}")
+                    self.entries[i] = None
+                dirty = True
+        if dirty:
+            self.write_index()
+
+    def write_index(self):
+        with self.lock:
+            index = {str(i): e for i, e in enumerate(self.entries) if e}
+        try:
+            write_atomic(self.index_path, json.dumps(index, ensure_ascii=False, indent=2).encode('utf-8'))
+        except Exception as e:
+            print(f"Error saving save index: {e}")
+
+    def get_header(self, slot_index):
+        entry = self.entries[slot_index]
+        return entry['header'] if entry else None
+
+    def get_headers(self):
+        return [self.get_header(i) for i in range(self.slot_count)]
+
+    def record_save(self, slot_index, data):
+        """
+        主线程: 提交存档时调用, 菜单立即显示新存档信息。
+        不缓存 data 本身 (写入线程还在编码它, 而且读档应当经过真实的存档格式),
+        落盘之前读这个槽位会先等待写入完成再从文件读取。
+        """
+        header = {k: data.get(k) for k in HEADER_KEYS}
+        with self.lock:
+            self.entries[slot_index] = {'file': None, 'mtime': None, 'size': None, 'header': header}
+            self.cache.pop(slot_index, None)
+            self.pending_writes.add(slot_index)
+
+    def on_save_written(self, slot_index, path):
+        """ 写入线程: 存档落盘后同步索引 """
+        with self.lock:
+            entry = self.entries[slot_index]
+            header = entry['header'] if entry else read_save_header(path)
+            self.entries[slot_index] = self._make_entry(path, header)
+            self.pending_writes.discard(slot_index)
+        self.write_index()
+
+    def prefetch(self, slot_index):
+        """ 后台预读完整存档 (悬停时调用, 重复调用无开销) """
+        with self.lock:
+            if slot_index in self.cache or slot_index in self.prefetching or not self.entries[slot_index]:
+                return
+            if slot_index in self.pending_writes:
+                # 文件还是旧的
+                return
+            thread = threading.Thread(target=self._prefetch_worker, args=(slot_index,), daemon=True)
+            self.prefetching[slot_index] = thread
+        thread.start()
+
+    def _prefetch_worker(self, slot_index):
+        try:
+            path = self.find_slot_file(slot_index)
+            data = read_save(path) if path else None
+        except Exception as e:
+            print(f"Error loading save {slot_index}: {e}")
+            data = None
+        with self.lock:
+            # 预读期间又提交了新存档: 读到的是旧文件, 丢弃
+            if data is not None and slot_index not in self.pending_writes:
+                self.cache.setdefault(slot_index, data)
+            self.prefetching.pop(slot_index, None)
+
+    def load(self, slot_index):
+        """ 读档: 优先使用预读结果, 否则同步解析 """
+        thread = self.prefetching.get(slot_index)
+        if thread:
+            thread.join()
+        with self.lock:
+            data = self.cache.pop(slot_index, None)
+            writing = slot_index in self.pending_writes
+        if data is not None:
+            return data
+        if writing:
+            save_writer.flush()
+
+        path = self.find_slot_file(slot_index)
+        if not path:
+            return None
+        try:
+            return read_save(path)
+        except Exception as e:
+            print(f"Error loading save {slot_index}: {e}")
+            return None
+
+# 全局实例
+save_writer = SaveWriter()
@@ -2,6 +2,7 @@ import pygame
 import math
 import config.game_config as settings
 from utils.sound_manager import SoundManager
+from utils.input_manager import input_manager
 
 class SkillSystem:
     def __init__(self, player):
@@ -21,7 +22,7 @@ class SkillSystem:
         # Calculate direction from player to mouse
         # Since player is always center screen in this game:
         screen_center = pygame.math.Vector2(settings.SCREEN_WIDTH / 2, settings.SCREEN_HEIGHT / 2)
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = input_manager.get_mouse_pos()
         aim_vec = pygame.math.Vector2(mouse_pos) - screen_center
         if aim_vec.length() == 0:
             return pygame.math.Vector2(1, 0)
@@ -188,7 +189,7 @@ class SkillSystem:
 
     def black_hole_effect(self, skill):
         # 1s Channel -> Spawn at Mouse -> Pull
-        mx, my = pygame.mouse.get_pos()
+        mx, my = input_manager.get_mouse_pos()
         # Need to convert screen pos to world pos? 
         # SkillSystem doesn't have camera reference.
         # But player.pos is world pos.
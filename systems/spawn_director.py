@@ -0,0 +1,192 @@
+import math
+import bisect
+import random
+import config.game_config as settings
+from data.enemy_stats import load_enemy_stats
+
+# 帧时间自适应: 平滑后的帧时间高于目标帧时间 * SPAWN_FRAME_SLOW_RATIO 时降低刷怪压力,
+# 低于 * SPAWN_FRAME_FAST_RATIO 时缓慢回升。帧时间取录像里的 dt, 回放结果一致
+SPAWN_TARGET_FPS = 60
+SPAWN_FRAME_SLOW_RATIO = 1.15
+SPAWN_FRAME_FAST_RATIO = 1.05
+SPAWN_FRAME_SMOOTHING = 0.1
+SPAWN_PRESSURE_MIN = 0.5
+SPAWN_PRESSURE_MAX = 1.25
+SPAWN_PRESSURE_DROP = 0.5   # 每秒下降量
+SPAWN_PRESSURE_RISE = 0.02  # 每秒回升量
+
+# 刷怪位置: 屏幕外 (半屏宽 + 随机距离)
+SPAWN_RADIUS_MIN = 100
+SPAWN_RADIUS_MAX = 300
+# 阵型参数
+FORMATION_CLUSTER_RADIUS = 60
+FORMATION_LINE_SPACING = 50
+
+# 数据文件缺失 / 为空时使用的默认波次 (与数据文件中的一致)
+# threat_per_sec = 原刷怪规则的每秒刷怪数 * 每只敌人的平均威胁值 (按类型权重和精英概率 * 精英倍率), 压力系数为 1 时刷怪速度与原来一致
+DEFAULT_THREAT = {'square': 1.0, 'triangle': 1.5, 'circle': 2.0}
+DEFAULT_WAVES = [
+    {'name': 'opening', 'start_min': 0, 'end_min': 1, 'threat_per_sec': 0.67, 'max_enemies': 15,
+     'types': {'square': 100}, 'elite_chance': 0.0, 'batch': [1, 2], 'formations': {'scatter': 100}},
+    {'name': 'skirmish', 'start_min': 1, 'end_min': 3, 'threat_per_sec': 1.44, 'max_enemies': 30,
+     'types': {'square': 60, 'triangle': 40}, 'elite_chance': 0.05, 'batch': [2, 4],
+     'formations': {'scatter': 60, 'cluster': 40}},
+    {'name': 'pressure', 'start_min': 3, 'end_min': 5, 'threat_per_sec': 4.06, 'max_enemies': 60,
+     'types': {'square': 40, 'triangle': 30, 'circle': 30}, 'elite_chance': 0.1, 'batch': [3, 6],
+     'formations': {'scatter': 40, 'cluster': 35, 'line': 25}},
+    {'name': 'endless', 'start_min': 5, 'end_min': 999, 'threat_per_sec': 13.55, 'max_enemies': 100,
+     'types': {'square': 33, 'triangle': 33, 'circle': 34}, 'elite_chance': 0.2, 'batch': [4, 8],
+     'formations': {'scatter': 30, 'cluster': 30, 'line': 20, 'ring': 20}},
+]
+
+class SpawnWave:
+    def __init__(self, data):
+        self.name = data.get('name', '')
+        self.start_min = data['start_min']
+        self.end_min = data['end_min']
+        self.threat_per_sec = data['threat_per_sec']
+        self.max_enemies = data['max_enemies']
+        self.types = list(data['types'].keys())
+        self.weights = list(data['types'].values())
+        self.elite_chance = data.get('elite_chance', 0.0)
+        self.batch_min, self.batch_max = data.get('batch', [1, 1])
+        formations = data.get('formations', {'scatter': 1})
+        self.formations = list(formations.keys())
+        self.formation_weights = list(formations.values())
+
+class SpawnDirector:
+    """
+    刷怪导演:
+    - 波次定义从 data/enemy_stats.json 读取, 按开始时间排序, 当前波次缓存, 只在越过边界时重新查找
+    - 每秒按波次的 threat_per_sec 积累威胁预算, 预算够支付下一批 (每种敌人有威胁值, 精英乘倍率) 时整批刷出
+    - 一批敌人按阵型 (scatter / cluster / line / ring) 摆放
+    - 根据帧时间调整压力系数 (同时缩放预算速度和敌人上限), 掉帧时减少刷怪
+    update() 返回本帧要生成的 [(x, y, 类型, 是否精英)], 由 EnemyManager 创建敌人。
+    """
+    def __init__(self, data=None):
+        if data is None:
+            data = load_enemy_stats()
+        self.threat = dict(DEFAULT_THREAT)
+        self.threat.update(data.get('threat', {}))
+        self.elite_threat_multiplier = data.get('elite_threat_multiplier', 5.0)
+        self.waves = sorted((SpawnWave(w) for w in data.get('waves') or DEFAULT_WAVES), key=lambda w: w.start_min)
+        self.wave_starts = [w.start_min for w in self.waves]
+        self.reset()
+
+    def reset(self):
+        self.wave = None
+        self.budget = 0.0
+        self.pending = [] # 下一批: [(类型, 是否精英)]
+        self.pressure = 1.0
+        self.frame_ms = 1000.0 / SPAWN_TARGET_FPS
+
+    def get_save_data(self):
+        return {
+            'budget': self.budget,
+            'pending': [list(p) for p in self.pending],
+            'pressure': self.pressure,
+            'frame_ms': self.frame_ms
+        }
+
+    def load_from_data(self, data):
+        self.reset()
+        self.budget = data.get('budget', 0.0)
+        self.pending = [(t, bool(e)) for t, e in data.get('pending', [])]
+        self.pressure = data.get('pressure', 1.0)
+        self.frame_ms = data.get('frame_ms', self.frame_ms)
+
+    def _find_wave(self, game_time_min):
+        wave = self.wave
+        if wave is not None and wave.start_min <= game_time_min < wave.end_min:
+            return wave
+        i = bisect.bisect_right(self.wave_starts, game_time_min) - 1
+        if i >= 0 and game_time_min < self.waves[i].end_min:
+            return self.waves[i]
+        return None
+
+    def _update_pressure(self, dt_sec, frame_ms):
+        target_ms = 1000.0 / SPAWN_TARGET_FPS
+        # 读档 / 切窗口造成的单帧长卡顿不应该一下子把压力压到底
+        sample = min(frame_ms, target_ms * 4)
+        self.frame_ms += (sample - self.frame_ms) * SPAWN_FRAME_SMOOTHING
+        step_sec = min(dt_sec, 0.1)
+        if self.frame_ms > target_ms * SPAWN_FRAME_SLOW_RATIO:
+            self.pressure = max(SPAWN_PRESSURE_MIN, self.pressure - SPAWN_PRESSURE_DROP * step_sec)
+        elif self.frame_ms < target_ms * SPAWN_FRAME_FAST_RATIO:
+            self.pressure = min(SPAWN_PRESSURE_MAX, self.pressure + SPAWN_PRESSURE_RISE * step_sec)
+
+    def _plan_batch(self, wave):
+        size = random.randint(wave.batch_min, wave.batch_max)
+        types = random.choices(wave.types, weights=wave.weights, k=size)
+        return [(t, random.random() < wave.elite_chance) for t in types]
+
+    def _batch_cost(self, batch):
+        cost = 0.0
+        for e_type, is_elite in batch:
+            c = self.threat.get(e_type, 1.0)
+            cost += c * self.elite_threat_multiplier if is_elite else c
+        return cost
+
+    def update(self, dt_sec, frame_ms, player_pos, game_time_min, alive_count):
+        self._update_pressure(dt_sec, frame_ms)
+
+        wave = self._find_wave(game_time_min)
+        if wave is not self.wave:
+            if self.wave is not None:
+                self.pending = []
+            self.wave = wave
+        if wave is None:
+            return []
+
+        room = int(wave.max_enemies * self.pressure) - alive_count
+        if room <= 0:
+            # 达到上限时不积累预算, 避免清怪后瞬间刷出一大片
+            return []
+        self.budget += wave.threat_per_sec * self.pressure * dt_sec
+
+        if not self.pending:
+            self.pending = self._plan_batch(wave)
+        batch = self.pending[:room]
+        cost = self._batch_cost(batch)
+        if self.budget < cost:
+            return []
+        self.budget -= cost
+        self.pending = []
+        formation = random.choices(wave.formations, weights=wave.formation_weights, k=1)[0]
+        positions = self._place(formation, len(batch), player_pos)
+        return [(x, y, e_type, is_elite) for (x, y), (e_type, is_elite) in zip(positions, batch)]
+
+    def _place(self, formation, count, center):
+        base_radius = settings.SCREEN_WIDTH / 2
+        if formation == 'ring':
+            # 围住玩家, 均匀分布
+            offset = random.uniform(0, math.pi * 2)
+            radius = base_radius + random.uniform(SPAWN_RADIUS_MIN, SPAWN_RADIUS_MAX)
+            return [(center.x + math.cos(offset + i * math.pi * 2 / count) * radius,
+                     center.y + math.sin(offset + i * math.pi * 2 / count) * radius) for i in range(count)]
+
+        if formation in ('cluster', 'line'):
+            angle = random.uniform(0, math.pi * 2)
+            radius = base_radius + random.uniform(SPAWN_RADIUS_MIN, SPAWN_RADIUS_MAX)
+            ax = center.x + math.cos(angle) * radius
+            ay = center.y + math.sin(angle) * radius
+            if formation == 'cluster':
+                positions = []
+                for _ in range(count):
+                    a = random.uniform(0, math.pi * 2)
+                    r = random.uniform(0, FORMATION_CLUSTER_RADIUS)
+                    positions.append((ax + math.cos(a) * r, ay + math.sin(a) * r))
+                return positions
+            # 横排: 垂直于朝向玩家的方向排开
+            px, py = -math.sin(angle), math.cos(angle)
+            half = (count - 1) / 2
+            return [(ax + px * (i - half) * FORMATION_LINE_SPACING,
+                     ay + py * (i - half) * FORMATION_LINE_SPACING) for i in range(count)]
+
+        # scatter: 每个敌人单独随机方向
+        positions = []
+        for _ in range(count):
+            angle = random.uniform(0, math.pi * 2)
+            radius = base_radius + random.uniform(SPAWN_RADIUS_MIN, SPAWN_RADIUS_MAX)
+            positions.append((center.x + math.cos(angle) * radius, center.y + math.sin(angle) * radius))
+        return positions
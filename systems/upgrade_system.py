@@ -1,7 +1,8 @@
 import random
 from data.attributes import STATS
 from data.rarity import RARITY_ORDER, BASE_RARITY_RATE, RARITY_COLORS, RARITY_MULTIPLIERS
-from data.luck import LUCK_SHIFT, LUCK_MAX
+from data.item_data import get_luck_rarity_weights
+from utils.random_utils import weighted_choice
 from utils.logger import logger
 
 class UpgradeSystem:
@@ -9,31 +10,12 @@ class UpgradeSystem:
         pass
 
     def calculate_rarity_weights(self, luck):
-        luck = min(luck, LUCK_MAX)
-        rates = BASE_RARITY_RATE.copy()
-        
-        # Calculate shift amount from White
-        # Luck = 1 -> 1% shift
-        total_shift = luck * 1.0 # 1% per luck point
-        
-        # Cap shift at available white rate
-        if total_shift > rates['white']:
-            total_shift = rates['white']
-            
-        rates['white'] -= total_shift
-        
-        # Distribute shift
-        for rarity, factor in LUCK_SHIFT.items():
-            amount = luck * factor # e.g. 5 * 0.6 = 3.0
-            rates[rarity] += amount
-            
-        return rates
+        # 按幸运值缓存, 返回值只读
+        return get_luck_rarity_weights(luck)
 
     def roll_rarity(self, weights):
-        # Weighted random choice
-        items = list(weights.keys())
-        probs = list(weights.values())
-        return random.choices(items, weights=probs, k=1)[0]
+        # Weighted random choice (cached alias table)
+        return weighted_choice(weights)
 
     def get_layer_weights(self, rarity):
         if rarity == 'white': return {1: 100, 2: 0, 3: 0}
@@ -55,7 +37,7 @@ class UpgradeSystem:
             layer_weights = self.get_layer_weights(rarity)
             
             # Roll layer
-            layer = random.choices(list(layer_weights.keys()), weights=list(layer_weights.values()), k=1)[0]
+            layer = weighted_choice(layer_weights)
             
             # Filter stats
             valid_stats = []
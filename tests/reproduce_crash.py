@@ -1,52 +1,118 @@
 import sys
 import os
+import math
+import tempfile
 import pygame
-import random
 
 # Add project root to path
 sys.path.append(os.getcwd())
 
+# 无窗口运行 (必须在 pygame 初始化显示之前设置)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
 try:
-    from core.game import GameManager
+    from core.game import GameManager, run_replay
     from config.game_config import CHARACTERS, GameState
     import config.game_config as settings
+    from utils.input_manager import InputRecorder, InputFrame, KeyState, build_replay_header
 except ImportError as e:
     print(f"Import Error: {e}")
     sys.exit(1)
 
+FRAME_MS = 16
+
+def write_scripted_session(path, probe, char_index, seed):
+    """
+    用脚本生成一段录像: 等待开场动画 -> 开始游戏 -> 选择角色 -> 移动 / 攻击 / 放技能。
+    按钮位置从 probe (一个已初始化的 GameManager) 读取。
+    """
+    header = build_replay_header(seed)
+    header['tutorial_completed'] = True
+    kb = header['key_bindings']
+    recorder = InputRecorder(path, header)
+
+    center = (settings.SCREEN_WIDTH // 2, settings.SCREEN_HEIGHT // 2)
+
+    def frame(events=(), pressed=(), mouse=center, buttons=(False, False, False)):
+        recorder.write_frame(InputFrame(FRAME_MS, list(events), KeyState(pressed), mouse, buttons))
+
+    def click(pos):
+        frame([pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=pos)], mouse=pos)
+        frame([pygame.event.Event(pygame.MOUSEBUTTONUP, button=1, pos=pos)], mouse=pos)
+
+    def key_tap(code):
+        return [pygame.event.Event(pygame.KEYDOWN, key=code, unicode='', mod=0)]
+
+    # 1. 开场动画
+    splash_frames = int(math.ceil(probe.renderer.splash_ui.total_duration * 1000 / FRAME_MS)) + 10
+    for _ in range(splash_frames):
+        frame()
+
+    # 2. 主菜单 -> 选择角色 -> 开始冒险
+    click(probe.menu_buttons[0].rect.center)
+    frame()
+    click(probe.char_cards[char_index].rect.center)
+    frame()
+    click(probe.start_game_button.rect.center)
+
+    # 3. 向右移动并持续普通攻击, 每秒释放一次技能
+    aim_right = (center[0] + 200, center[1])
+    for i in range(240):
+        events = key_tap(kb['use_skill']) if i % 60 == 30 else []
+        frame(events, pressed=[kb['right']], mouse=aim_right, buttons=(True, False, False))
+
+    # 4. 切换技能后向上移动, 朝左上方瞄准
+    frame(key_tap(kb['skill_2']))
+    aim_up_left = (center[0] - 150, center[1] - 150)
+    for i in range(120):
+        events = key_tap(kb['use_skill']) if i == 60 else []
+        frame(events, pressed=[kb['up'], kb['left']], mouse=aim_up_left, buttons=(True, False, False))
+
+    recorder.close()
+    return recorder.frame_count
+
+def snapshot(gm):
+    return (
+        round(gm.player.pos.x, 3), round(gm.player.pos.y, 3),
+        gm.player.current_hp, gm.player.current_xp,
+        len(gm.enemy_manager.enemies), round(gm.game_time, 3)
+    )
+
 def test_game_flow():
     pygame.init()
-    # Create window
     pygame.display.set_mode((settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT))
-    
+
     print("Initializing GameManager...")
-    gm = GameManager()
-    
+    probe = GameManager()
+    replay_dir = tempfile.mkdtemp(prefix="cube_replay_")
+
     # Test all characters
-    for char_data in CHARACTERS:
+    for char_index, char_data in enumerate(CHARACTERS):
         char_id = char_data['id']
         print(f"\n=== Testing Character: {char_id} ===")
-        
-        try:
-            gm.start_new_game(char_data)
-            
-            # Force spawn an enemy immediately
-            print("Spawning Enemy...")
-            gm.enemy_manager.spawn_enemy(gm.player, 0, force_type='square')
-            
-            print(f"Testing Game Loop for {char_id} (60 frames)...")
-            for i in range(60):
-                gm.update(16)
-                gm.draw()
-                
-        except Exception as e:
-            print(f"CRASH during loop for {char_id}: {e}")
-            import traceback
-            traceback.print_exc()
-            return
+
+        path = os.path.join(replay_dir, f"{char_id}.rec")
+        written = write_scripted_session(path, probe, char_index, seed=1000 + char_index)
+
+        gm, frames, _ = run_replay(path)
+        assert frames == written, f"replayed {frames}/{written} frames"
+        assert gm.state == GameState.GAME, f"unexpected state {gm.state}"
+        assert gm.player.data['id'] == char_id
+
+        # 同一录像回放两次, 结果必须一致
+        if char_index == 0:
+            first = snapshot(gm)
+            gm_again, _, _ = run_replay(path)
+            assert snapshot(gm_again) == first, f"replay not deterministic: {first} != {snapshot(gm_again)}"
 
     print("\nTest Completed Successfully for ALL characters!")
     pygame.quit()
 
 if __name__ == "__main__":
-    test_game_flow()
+    # python tests/reproduce_crash.py [录像文件 ...]  直接回放指定的崩溃录像
+    if len(sys.argv) > 1:
+        for replay_path in sys.argv[1:]:
+            run_replay(replay_path)
+    else:
+        test_game_flow()
@@ -0,0 +1,423 @@
+"""
+批量模拟 (平衡性调参用):
+    python -m tools.batch_sim --runs 200 --policies kite,orbit --out sim_results.jsonl
+
+- 每个 (种子, 角色, 策略) 组合是一局, 由 multiprocessing 进程池里的无窗口工作进程执行,
+  只跑游戏逻辑 (handle_input + update), 不绘制
+- 输入由脚本策略生成 (移动 / 瞄准最近的敌人 / 定时放技能 / 升级时选卡)
+- 每局的结果 (存活时间, DPS, 击杀, 等级曲线) 追加写入 JSON Lines 结果文件,
+  中断后用相同参数重新运行会跳过已完成的局 (续跑)
+- 全部结束后按 (角色, 策略) 汇总, 写入 <结果文件>.summary.json
+- --set 路径=值 覆盖调参对象, 例如 --set game.mission_manager.growth_factor=1.5
+  或 --set systems.drop_system.ENEMY_DROP_CHANCE=0.1 (值按 JSON 解析)
+"""
+import os
+import sys
+import json
+import math
+import time
+import random
+import argparse
+import contextlib
+import importlib
+import statistics
+import traceback
+import multiprocessing
+
+# 无窗口运行 (必须在 pygame 初始化显示之前设置)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+# SDL 默认把 SIGTERM / SIGINT 转成退出事件, 工作进程会无法被 Pool.terminate() / Ctrl+C 结束
+os.environ.setdefault("SDL_NO_SIGNAL_HANDLERS", "1")
+
+import pygame
+
+# 保证直接运行本文件时也可以导入项目模块
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config.game_config as settings
+
+# 模拟帧长 (毫秒), 固定值保证同一种子的结果可复现
+SIM_FRAME_MS = 16
+# 每隔多少帧释放一次技能
+SIM_SKILL_INTERVAL = 60
+# kite 策略: 最近的敌人进入这个距离就后退
+SIM_KITE_DISTANCE = 300
+# 进度输出间隔 (秒)
+SIM_PROGRESS_INTERVAL = 5.0
+
+# 工作进程内复用的 GameManager 和调参覆盖项
+_worker_game = None
+_worker_overrides = {}
+_worker_quiet = True
+_devnull = None
+
+class SimPolicy:
+    """ 脚本策略: 原地不动, 瞄准最近的敌人持续普攻, 升级时随机选卡 """
+    name = 'idle'
+
+    def __init__(self, rng):
+        self.rng = rng
+
+    def move_vector(self, player, target):
+        return None
+
+    def choose_upgrade(self, choices):
+        return self.rng.randrange(len(choices))
+
+    def build_frame(self, game, frame_index):
+        from utils.input_manager import InputFrame, KeyState
+        kb = settings.game_config['key_bindings']
+        player = game.player
+        target = nearest_enemy(game.enemy_manager.enemies, player.pos)
+
+        pressed = []
+        move = self.move_vector(player, target)
+        if move is not None and move.length_squared() > 0:
+            move = move.normalize()
+            # 8 方向: 分量超过 sin(22.5°) 才按下对应方向键
+            if move.x > 0.38: pressed.append(kb['right'])
+            elif move.x < -0.38: pressed.append(kb['left'])
+            if move.y > 0.38: pressed.append(kb['down'])
+            elif move.y < -0.38: pressed.append(kb['up'])
+
+        events = []
+        if target is not None:
+            mouse = game.camera.apply(target.pos)
+            if frame_index % SIM_SKILL_INTERVAL == 0:
+                events.append(pygame.event.Event(pygame.KEYDOWN, key=kb['use_skill'], unicode='', mod=0))
+        else:
+            mouse = game.camera.apply(player.pos + pygame.math.Vector2(100, 0))
+        mouse = (int(mouse.x), int(mouse.y))
+        return InputFrame(SIM_FRAME_MS, events, KeyState(pressed), mouse, (target is not None, False, False))
+
+class KitePolicy(SimPolicy):
+    """ 最近的敌人靠近时后退, 边退边打 """
+    name = 'kite'
+
+    def move_vector(self, player, target):
+        if target is None:
+            return None
+        away = player.pos - target.pos
+        if away.length_squared() > SIM_KITE_DISTANCE * SIM_KITE_DISTANCE:
+            return None
+        return away
+
+class OrbitPolicy(SimPolicy):
+    """ 绕着最近的敌人横向移动 (走位风筝) """
+    name = 'orbit'
+
+    def move_vector(self, player, target):
+        if target is None:
+            return None
+        to_target = target.pos - player.pos
+        return pygame.math.Vector2(-to_target.y, to_target.x)
+
+POLICIES = {cls.name: cls for cls in (SimPolicy, KitePolicy, OrbitPolicy)}
+
+def nearest_enemy(enemies, pos):
+    best = None
+    best_dist = math.inf
+    for enemy in enemies:
+        if enemy.is_dying:
+            continue
+        d = (enemy.pos - pos).length_squared()
+        if d < best_dist:
+            best = enemy
+            best_dist = d
+    return best
+
+def parse_override(text):
+    """ "路径=值" -> (路径, 值), 值按 JSON 解析, 解析失败时当作字符串 """
+    path, _, raw = text.partition('=')
+    if not path or not _:
+        raise argparse.ArgumentTypeError(f"override must be PATH=VALUE: {text}")
+    try:
+        value = json.loads(raw)
+    except ValueError:
+        value = raw
+    return path.strip(), value
+
+def apply_overrides(overrides, game=None):
+    """ game.* 的覆盖项作用在当前 GameManager 上 (每局开始后调用), 其余按模块路径解析 (工作进程启动时调用一次) """
+    for path, value in overrides.items():
+        parts = path.split('.')
+        if parts[0] == 'game':
+            if game is None:
+                continue
+            obj = game
+            parts = parts[1:]
+        else:
+            if game is not None:
+                continue
+            # 找到最长的可导入模块前缀
+            obj = None
+            for i in range(len(parts) - 1, 0, -1):
+                try:
+                    obj = importlib.import_module('.'.join(parts[:i]))
+                except ImportError:
+                    continue
+                parts = parts[i:]
+                break
+            if obj is None:
+                raise ValueError(f"Cannot resolve override {path}")
+        for name in parts[:-1]:
+            obj = getattr(obj, name)
+        setattr(obj, parts[-1], value)
+
+def _quiet_output():
+    """ 游戏逻辑里的调试输出很多, 批量模拟时默认丢弃 """
+    global _devnull
+    if _worker_quiet:
+        if _devnull is None:
+            _devnull = open(os.devnull, 'w')
+        return contextlib.redirect_stdout(_devnull)
+    return contextlib.nullcontext()
+
+def _init_worker(overrides, quiet=True):
+    global _worker_game, _worker_overrides, _worker_quiet
+    # 模拟期间不写回 config.json, 也不触发自动存档
+    settings.CONFIG_READONLY = True
+    settings.game_config['tutorial_completed'] = True
+    _worker_quiet = quiet
+    with _quiet_output():
+        from core.game import GameManager
+        apply_overrides(overrides)
+        _worker_overrides = overrides
+        _worker_game = GameManager()
+
+def run_simulation(game, char_data, policy, seed, max_minutes, overrides=None):
+    """ 用 game 跑一局, 返回结果 dict """
+    from config.game_config import GameState
+    from utils.input_manager import input_manager
+
+    random.seed(seed)
+    game.start_new_game(char_data)
+    game.floating_text_manager.clear()
+    game.destruction_count = 0
+    if overrides:
+        apply_overrides(overrides, game)
+
+    stats = {'damage_dealt': 0.0, 'damage_taken': 0.0}
+    spawn_damage_text = type(game).spawn_damage_text.__get__(game)
+    def record_damage(pos, amount, damage_type='physical', is_player_damage=False, is_crit=False):
+        stats['damage_taken' if is_player_damage else 'damage_dealt'] += amount
+        spawn_damage_text(pos, amount, damage_type, is_player_damage, is_crit)
+    game.spawn_damage_text = record_damage
+
+    level_curve = [[0.0, game.player.level]]
+    max_enemies = 0
+    max_frames = int(max_minutes * 60000 / SIM_FRAME_MS)
+    start = time.perf_counter()
+    frames = 0
+    try:
+        for frames in range(1, max_frames + 1):
+            if game.state == GameState.GAME_OVER:
+                break
+            if game.state == GameState.LEVEL_UP and game.upgrade_choices:
+                game.apply_upgrade(game.upgrade_choices[policy.choose_upgrade(game.upgrade_choices)])
+
+            input_manager.feed_frame(policy.build_frame(game, frames))
+            game.handle_input()
+            game.update(SIM_FRAME_MS)
+            game.sound_manager.flush_events()
+
+            if game.player.level != level_curve[-1][1]:
+                level_curve.append([round(game.game_time, 2), game.player.level])
+            max_enemies = max(max_enemies, len(game.enemy_manager.enemies))
+    finally:
+        del game.spawn_damage_text
+        input_manager.stop()
+
+    survived = game.game_time
+    return {
+        'seed': seed,
+        'character': char_data['id'],
+        'policy': policy.name,
+        'died': game.state == GameState.GAME_OVER,
+        'survived_sec': round(survived, 2),
+        'kills': game.mission_manager.total_kills,
+        'damage_dealt': round(stats['damage_dealt'], 1),
+        'damage_taken': round(stats['damage_taken'], 1),
+        'dps': round(stats['damage_dealt'] / survived, 2) if survived > 0 else 0.0,
+        'level': game.player.level,
+        'level_curve': level_curve,
+        'mission_completions': game.mission_manager.completions,
+        'max_enemies': max_enemies,
+        'frames': frames,
+        'wall_sec': round(time.perf_counter() - start, 2),
+    }
+
+def _run_task(task):
+    from config.game_config import CHARACTERS
+    run_id, char_id, policy_name, seed, max_minutes = task
+    char_data = next(c for c in CHARACTERS if c['id'] == char_id)
+    policy = POLICIES[policy_name](random.Random(seed))
+    try:
+        with _quiet_output():
+            result = run_simulation(_worker_game, char_data, policy, seed, max_minutes, _worker_overrides)
+    except Exception:
+        result = {'seed': seed, 'character': char_id, 'policy': policy_name, 'error': traceback.format_exc()}
+    result['run_id'] = run_id
+    result['overrides'] = _worker_overrides
+    result['max_minutes'] = max_minutes
+    return result
+
+def load_results(path):
+    """ 读取已有的结果文件, 同一局出现多次时以最后一次为准 """
+    results = {}
+    if not os.path.exists(path):
+        return results
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # 中断时可能写了半行
+                continue
+            results[record['run_id']] = record
+    return results
+
+def _level_at(curve, t):
+    level = curve[0][1]
+    for time_sec, lv in curve:
+        if time_sec > t:
+            break
+        level = lv
+    return level
+
+def _same_settings(record, overrides, max_minutes):
+    """ 结果是否用相同的调参覆盖项和局长跑出来的 (续跑 / 汇总只认相同设置的结果) """
+    return record.get('overrides', {}) == overrides and record.get('max_minutes') == max_minutes
+
+def summarize(results, max_minutes):
+    """ 按 (角色, 策略) 汇总 """
+    groups = {}
+    for r in results:
+        if 'error' in r:
+            continue
+        groups.setdefault((r['character'], r['policy']), []).append(r)
+
+    summary = []
+    for (char_id, policy_name), runs in sorted(groups.items()):
+        survived = [r['survived_sec'] for r in runs]
+        level_by_minute = {}
+        for minute in range(1, int(max_minutes) + 1):
+            levels = [_level_at(r['level_curve'], minute * 60) for r in runs if r['survived_sec'] >= minute * 60]
+            if levels:
+                level_by_minute[minute] = round(statistics.mean(levels), 2)
+        summary.append({
+            'character': char_id,
+            'policy': policy_name,
+            'runs': len(runs),
+            'deaths': sum(1 for r in runs if r['died']),
+            'survived_mean': round(statistics.mean(survived), 2),
+            'survived_median': round(statistics.median(survived), 2),
+            'survived_min': min(survived),
+            'dps_mean': round(statistics.mean(r['dps'] for r in runs), 2),
+            'kills_mean': round(statistics.mean(r['kills'] for r in runs), 2),
+            'level_mean': round(statistics.mean(r['level'] for r in runs), 2),
+            'level_by_minute': level_by_minute,
+        })
+    return summary
+
+def print_summary(summary):
+    print(f"{'character':<10} {'policy':<8} {'runs':>5} {'deaths':>6} {'surv(s)':>8} {'dps':>8} {'kills':>7} {'level':>6}")
+    for s in summary:
+        print(f"{s['character']:<10} {s['policy']:<8} {s['runs']:>5} {s['deaths']:>6} {s['survived_mean']:>8.1f} "
+              f"{s['dps_mean']:>8.1f} {s['kills_mean']:>7.1f} {s['level_mean']:>6.1f}")
+
+def run_batch(characters, policies, seeds, max_minutes, out_path, workers=None, overrides=None, quiet=True):
+    """ 执行一批模拟 (跳过结果文件里已完成的局), 返回汇总 """
+    overrides = overrides or {}
+    existing = load_results(out_path)
+    tasks = []
+    for seed in seeds:
+        for char_id in characters:
+            for policy_name in policies:
+                run_id = f"{char_id}-{policy_name}-{seed}"
+                done = existing.get(run_id)
+                # 出错的局, 或者是用其他调参覆盖项 / 局长跑的, 重新跑
+                if done is None or 'error' in done or not _same_settings(done, overrides, max_minutes):
+                    tasks.append((run_id, char_id, policy_name, seed, max_minutes))
+
+    total = len(seeds) * len(characters) * len(policies)
+    print(f"[Sim] {total} runs, {total - len(tasks)} already done, {len(tasks)} to run")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(tasks)))
+
+    if tasks:
+        start = time.perf_counter()
+        last_report = start
+        with open(out_path, 'a', encoding='utf-8') as out:
+            if workers == 1:
+                _init_worker(overrides, quiet)
+                results = map(_run_task, tasks)
+                pool = None
+            else:
+                # spawn: 每个工作进程有独立干净的 pygame 状态
+                ctx = multiprocessing.get_context('spawn')
+                pool = ctx.Pool(workers, initializer=_init_worker, initargs=(overrides, quiet))
+                results = pool.imap_unordered(_run_task, tasks)
+            try:
+                for done, result in enumerate(results, 1):
+                    existing[result['run_id']] = result
+                    out.write(json.dumps(result, ensure_ascii=False) + "\n")
+                    out.flush()
+                    if 'error' in result:
+                        print(f"[Sim] {result['run_id']} failed:\n{result['error']}")
+                    now = time.perf_counter()
+                    if now - last_report >= SIM_PROGRESS_INTERVAL or done == len(tasks):
+                        last_report = now
+                        eta = (now - start) / done * (len(tasks) - done)
+                        print(f"[Sim] {done}/{len(tasks)} done, elapsed {now - start:.0f}s, eta {eta:.0f}s")
+                if pool is not None:
+                    pool.close()
+                    pool.join()
+            finally:
+                if pool is not None:
+                    pool.terminate()
+
+    wanted = {f"{c}-{p}-{s}" for s in seeds for c in characters for p in policies}
+    summary = summarize([r for run_id, r in existing.items() if run_id in wanted and _same_settings(r, overrides, max_minutes)], max_minutes)
+    summary_path = os.path.splitext(out_path)[0] + ".summary.json"
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump({'max_minutes': max_minutes, 'overrides': overrides, 'groups': summary}, f, ensure_ascii=False, indent=2)
+    print_summary(summary)
+    print(f"[Sim] Summary written to {summary_path}")
+    return summary
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="批量模拟 (平衡性调参)")
+    parser.add_argument("--runs", type=int, default=10, help="每个 (角色, 策略) 组合跑多少个种子")
+    parser.add_argument("--seed-base", type=int, default=0, help="第一个种子")
+    parser.add_argument("--characters", default=None, help="逗号分隔的角色 id, 默认全部")
+    parser.add_argument("--policies", default="idle,kite,orbit", help=f"逗号分隔的策略: {', '.join(POLICIES)}")
+    parser.add_argument("--max-minutes", type=float, default=10.0, help="每局最长游戏时间 (分钟)")
+    parser.add_argument("--workers", type=int, default=None, help="工作进程数, 默认 CPU 核数")
+    parser.add_argument("--out", default="sim_results.jsonl", help="结果文件 (JSON Lines), 已存在时续跑")
+    parser.add_argument("--set", dest="overrides", action="append", type=parse_override, default=[],
+                        metavar="PATH=VALUE", help="覆盖调参对象, 可重复")
+    parser.add_argument("--verbose", action="store_true", help="保留游戏逻辑的调试输出")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    from config.game_config import CHARACTERS
+
+    args = parse_args(argv)
+    characters = args.characters.split(',') if args.characters else [c['id'] for c in CHARACTERS]
+    unknown = [c for c in characters if c not in {ch['id'] for ch in CHARACTERS}]
+    policies = args.policies.split(',')
+    unknown += [p for p in policies if p not in POLICIES]
+    if unknown:
+        print(f"[Sim] Unknown character / policy: {', '.join(unknown)}")
+        return 1
+    seeds = list(range(args.seed_base, args.seed_base + args.runs))
+    run_batch(characters, policies, seeds, args.max_minutes, args.out, args.workers, dict(args.overrides), quiet=not args.verbose)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
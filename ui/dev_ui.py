@@ -1,5 +1,6 @@
 import pygame
 import config.game_config as settings
+from utils.input_manager import input_manager
 
 class DevUIRenderer:
     def __init__(self, screen):
@@ -189,7 +190,7 @@ class DevUIRenderer:
         self.screen.blit(title_surf, (x + 10, y + 10))
         
     def draw_button(self, rect, text, dev_manager, action):
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = input_manager.get_mouse_pos()
         hover = rect.collidepoint(mouse_pos)
         
         color = self.btn_hover if hover else self.btn_color
@@ -208,7 +209,7 @@ class DevUIRenderer:
         })
 
     def draw_stat_button(self, rect, text, dev_manager, stat_key, change):
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = input_manager.get_mouse_pos()
         hover = rect.collidepoint(mouse_pos)
         
         color = self.btn_hover if hover else self.btn_color
@@ -0,0 +1,88 @@
+import heapq
+import random
+import pygame
+from config.game_config import game_config
+
+# 暴击伤害数字的优先级加成 (超出上限时优先保留暴击和大数字)
+CRIT_PRIORITY_BONUS = 4.0
+# 提示文字 (获得物品 / 背包已满等) 总是保留
+MESSAGE_PRIORITY = float('inf')
+
+class FloatingText:
+    def __init__(self, x, y, text, color, priority=MESSAGE_PRIORITY):
+        self.pos = pygame.math.Vector2(x, y)
+        self.text = text
+        self.color = color
+        self.timer = 0
+        self.duration = 1.0
+        self.vel = pygame.math.Vector2(random.uniform(-50, 50), -100)
+        self.priority = priority
+        self.surface = None # 渲染缓存 (文字 + 描边), 文字变化时清空
+
+    def set_text(self, text):
+        if text != self.text:
+            self.text = text
+            self.surface = None
+
+    def update(self, dt):
+        self.timer += dt
+        self.pos += self.vel * dt
+
+    def is_alive(self):
+        return self.timer < self.duration
+
+class FloatingTextManager:
+    """
+    飘字管理:
+    - 同一目标在 damage_text_merge_window 秒内的多次伤害合并成一个不断累加的数字
+    - 同屏数量超过 floating_text_cap 时按优先级 (暴击 / 伤害大小) 保留
+    - 过期的飘字每帧一次性清理
+    目标用伤害回调传入的位置向量 (即目标的 pos 对象) 识别。
+    """
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.texts = []
+        self.merging = {} # id(目标 pos) -> (FloatingText, 累计伤害, 是否暴击)
+
+    def spawn_text(self, pos, text, color):
+        self.texts.append(FloatingText(pos.x, pos.y, text, color))
+
+    def spawn_damage(self, pos, amount, color, is_crit=False):
+        key = id(pos)
+        window = game_config.get('damage_text_merge_window', 0.3)
+        entry = self.merging.get(key)
+        if entry is not None:
+            ft, total, crit = entry
+            if ft.timer < window and ft.color == color and ft.is_alive():
+                total += amount
+                crit = crit or is_crit
+                ft.set_text(str(int(total)))
+                ft.priority = total * (CRIT_PRIORITY_BONUS if crit else 1.0)
+                self.merging[key] = (ft, total, crit)
+                return
+
+        amount_int = int(amount)
+        if amount_int <= 0:
+            return
+        ft = FloatingText(pos.x, pos.y, str(amount_int), color,
+                          priority=amount * (CRIT_PRIORITY_BONUS if is_crit else 1.0))
+        self.texts.append(ft)
+        self.merging[key] = (ft, amount, is_crit)
+
+    def update(self, dt_sec):
+        for ft in self.texts:
+            ft.update(dt_sec)
+        texts = [ft for ft in self.texts if ft.is_alive()]
+
+        cap = game_config.get('floating_text_cap', 80)
+        if len(texts) > cap:
+            keep = {id(ft) for ft in heapq.nlargest(cap, texts, key=lambda ft: ft.priority)}
+            texts = [ft for ft in texts if id(ft) in keep]
+        self.texts = texts
+
+        if self.merging:
+            alive = {id(ft) for ft in texts}
+            window = game_config.get('damage_text_merge_window', 0.3)
+            self.merging = {k: v for k, v in self.merging.items() if id(v[0]) in alive and v[0].timer < window}
@@ -283,19 +283,23 @@ class HUDRenderer:
             self.screen.blit(tip, tip_rect)
 
     def draw_floating_texts(self, camera, texts):
+        blits = []
         for ft in texts:
-            screen_pos = camera.apply(ft.pos)
-            text_surf = settings.font.render(ft.text, True, ft.color)
-            # 描边
-            stroke_surf = settings.font.render(ft.text, True, settings.BLACK)
-            
-            x, y = int(screen_pos.x), int(screen_pos.y)
-            
-            # 绘制描边
-            for offset in [(-1, -1), (1, -1), (-1, 1), (1, 1)]:
-                self.screen.blit(stroke_surf, (x + offset[0], y + offset[1]))
+            if ft.surface is None:
+                # 文字和描边合成一张图缓存在飘字上, 文字不变时不再重新渲染
+                text_surf = settings.font.render(ft.text, True, ft.color)
+                stroke_surf = settings.font.render(ft.text, True, settings.BLACK)
+                surf = pygame.Surface((text_surf.get_width() + 2, text_surf.get_height() + 2), pygame.SRCALPHA)
+                # 绘制描边
+                for offset in [(0, 0), (2, 0), (0, 2), (2, 2)]:
+                    surf.blit(stroke_surf, offset)
+                surf.blit(text_surf, (1, 1))
+                ft.surface = surf
             
-            self.screen.blit(text_surf, (x, y))
+            screen_pos = camera.apply(ft.pos)
+            blits.append((ft.surface, (int(screen_pos.x) - 1, int(screen_pos.y) - 1)))
+        
+        self.screen.blits(blits, doreturn=False)
 
     def draw_fps(self, clock):
         if settings.game_config.get('show_fps', True):
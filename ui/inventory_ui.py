@@ -2,6 +2,7 @@ import pygame
 import config.game_config as settings
 from utils.resource_manager import resource_manager
 from utils.sound_manager import SoundManager
+from utils.input_manager import input_manager
 
 get_theme_color = settings.get_theme_color
 
@@ -302,7 +303,7 @@ class InventoryRenderer:
             pygame.draw.rect(self.screen, get_theme_color('panel_border'), inventory.rect, 3) # 边框
         
         # 绘制切换按钮
-        btn_color = (100, 100, 150) if inventory.toggle_btn_rect.collidepoint(pygame.mouse.get_pos()) else (80, 80, 80)
+        btn_color = (100, 100, 150) if inventory.toggle_btn_rect.collidepoint(input_manager.get_mouse_pos()) else (80, 80, 80)
         pygame.draw.rect(self.screen, btn_color, inventory.toggle_btn_rect)
         pygame.draw.rect(self.screen, get_theme_color('panel_border'), inventory.toggle_btn_rect, 2)
         
@@ -312,7 +313,7 @@ class InventoryRenderer:
         self.screen.blit(btn_text, text_rect)
         
         # 绘制整理按钮
-        sort_color = (100, 150, 100) if inventory.sort_btn_rect.collidepoint(pygame.mouse.get_pos()) else (80, 100, 80)
+        sort_color = (100, 150, 100) if inventory.sort_btn_rect.collidepoint(input_manager.get_mouse_pos()) else (80, 100, 80)
         pygame.draw.rect(self.screen, sort_color, inventory.sort_btn_rect)
         pygame.draw.rect(self.screen, get_theme_color('panel_border'), inventory.sort_btn_rect, 2)
         
@@ -357,7 +358,7 @@ class InventoryRenderer:
             
             item = inventory.items[i]
             if item and item is not inventory.dragging_item:
-                if rect.collidepoint(pygame.mouse.get_pos()):
+                if rect.collidepoint(input_manager.get_mouse_pos()):
                     self.hovered_item = item
 
                 icon_key = f"items_{item.id}"
@@ -393,7 +394,7 @@ class InventoryRenderer:
             
             item = inventory.skill_slots[i]
             if item and item is not inventory.dragging_item:
-                if rect.collidepoint(pygame.mouse.get_pos()):
+                if rect.collidepoint(input_manager.get_mouse_pos()):
                     self.hovered_item = item
 
                 color = (200, 200, 200)
@@ -407,7 +408,7 @@ class InventoryRenderer:
                 
         # --- 拖拽物品 ---
         if inventory.dragging_item:
-            mouse_pos = pygame.mouse.get_pos()
+            mouse_pos = input_manager.get_mouse_pos()
             x = mouse_pos[0] + inventory.dragging_offset[0]
             y = mouse_pos[1] + inventory.dragging_offset[1]
             
@@ -423,7 +424,7 @@ class InventoryRenderer:
 
         # Draw Tooltip on top of everything
         if self.hovered_item and not inventory.dragging_item:
-            self.draw_tooltip(self.hovered_item, pygame.mouse.get_pos())
+            self.draw_tooltip(self.hovered_item, input_manager.get_mouse_pos())
             
         # Draw Dialog LAST so it's on top of everything
         self.draw_merge_dialog(inventory)
@@ -492,7 +493,7 @@ class InventoryRenderer:
             
             item = inventory.equipment[slot_name]
             if item:
-                if rect.collidepoint(pygame.mouse.get_pos()):
+                if rect.collidepoint(input_manager.get_mouse_pos()):
                     self.hovered_item = item
 
                 color = (200, 200, 200)
@@ -535,7 +536,7 @@ class InventoryRenderer:
                 text = settings.small_font.render("锁", True, (255, 100, 100))
                 self.screen.blit(text, text.get_rect(center=g_rect.center))
                 
-                if g_rect.collidepoint(pygame.mouse.get_pos()) and inventory.dragging_item and inventory.dragging_item.id == 'gene_potion':
+                if g_rect.collidepoint(input_manager.get_mouse_pos()) and inventory.dragging_item and inventory.dragging_item.id == 'gene_potion':
                     pygame.draw.rect(self.screen, (0, 255, 0), g_rect, 3)
         
         if inventory.heart_slot_rect:
@@ -551,7 +552,7 @@ class InventoryRenderer:
                     
                     pygame.draw.rect(self.screen, color, h_rect.inflate(-6, -6))
                     
-                    if h_rect.collidepoint(pygame.mouse.get_pos()):
+                    if h_rect.collidepoint(input_manager.get_mouse_pos()):
                         self.hovered_item = item
             else:
                 text = settings.small_font.render("心", True, (150, 50, 50))
@@ -584,7 +585,7 @@ class InventoryRenderer:
             else:
                 item = inventory.cells[slot_id]
                 if item and item is not inventory.dragging_item:
-                    if rect.collidepoint(pygame.mouse.get_pos()):
+                    if rect.collidepoint(input_manager.get_mouse_pos()):
                         self.hovered_item = item
     
                     icon_key = f"items_{item.id}"
@@ -7,7 +7,6 @@ from ui.hud import HUDRenderer
 from ui.inventory_ui import InventoryRenderer
 from ui.upgrade_ui import UpgradeRenderer
 from ui.menus import MenuRenderer
-from ui.dev_ui import DevUIRenderer
 from ui.splash import SplashRenderer
 
 # Get theme color helper
@@ -23,7 +22,7 @@ class GameRenderer:
         self.inventory_ui = InventoryRenderer(screen)
         self.upgrade_ui = UpgradeRenderer(screen)
         self.menu_ui = MenuRenderer(screen)
-        self.dev_ui = DevUIRenderer(screen)
+        self.dev_ui = None # 第一次打开开发者面板时创建
         self.splash_ui = SplashRenderer(screen)
 
     def draw_entity(self, entity):
@@ -173,12 +172,11 @@ class GameRenderer:
                 rect.center = screen_pos
                 pygame.draw.rect(self.screen, proj.color, rect)
 
-    def draw_pickup(self, pickup):
+    def draw_pickup(self, pickup, bob_offset=0.0):
         screen_pos = self.camera.apply(pickup.pos)
         
-        # Bobbing
-        offset_y = math.sin(pygame.time.get_ticks() * 0.005) * 5
-        screen_pos.y += offset_y
+        # Bobbing (由 PickupManager 按共享时钟统一计算)
+        screen_pos.y += bob_offset * self.camera.zoom
         
         img = resource_manager.get_image(f"pickup_{pickup.type}")
         if img:
@@ -253,6 +251,9 @@ class GameRenderer:
         self.upgrade_ui.draw_level_up_choices(choices, hovered)
 
     def draw_dev_panel(self, dev_manager):
+        if self.dev_ui is None:
+            from ui.dev_ui import DevUIRenderer
+            self.dev_ui = DevUIRenderer(self.screen)
         self.dev_ui.draw_dev_panel(dev_manager)
 
     # Menu delegates... usually called directly by main loop using menu_ui, 
@@ -1,18 +1,153 @@
 import pygame
 import os
 import time
+import queue
+import threading
+import collections
 import numpy as np
 import config.game_config as settings
 
-# Use moviepy for video + audio
-try:
-    from moviepy.editor import VideoFileClip
-except ImportError:
+# 预解码的视频帧数 / 音频段数
+VIDEO_BUFFER_FRAMES = 8
+AUDIO_BUFFER_CHUNKS = 4
+AUDIO_CHUNK_SECONDS = 0.25
+# SoundManager 保留了 0~3 号声道, 0~2 用于音乐 / 环境音, 3 号留给开场视频的声音
+SPLASH_AUDIO_CHANNEL = 3
+
+def _load_video_clip_class():
+    # Use moviepy for video + audio (在后台线程中导入, 不阻塞启动)
     try:
-        from moviepy import VideoFileClip
+        from moviepy.editor import VideoFileClip
     except ImportError:
-        print("Could not import VideoFileClip from moviepy. Make sure moviepy is installed correctly.")
-        VideoFileClip = None
+        try:
+            from moviepy import VideoFileClip
+        except ImportError:
+            print("Could not import VideoFileClip from moviepy. Make sure moviepy is installed correctly.")
+            return None
+    return VideoFileClip
+
+class SplashVideoStream:
+    """
+    开场视频流式播放:
+    - 后台线程打开视频, 按帧解码并缩放到屏幕分辨率, 放入容量为 VIDEO_BUFFER_FRAMES 的环形缓冲
+    - 另一个后台线程按段解码音频, 主线程每帧把下一段排到声道上 (不写临时文件)
+    主线程只做取帧和 blit。
+    """
+    def __init__(self, path, size):
+        self.path = path
+        self.size = size
+        self.clip = None
+        self.duration = 0.0
+        self.ready = False      # 第一帧已解码
+        self.failed = False
+        self.stopped = False
+
+        self.frames = collections.deque()
+        self.frames_cond = threading.Condition()
+        self.current = None     # (t, surface) 当前显示的帧
+
+        self.audio_chunks = queue.Queue(maxsize=AUDIO_BUFFER_CHUNKS)
+        self.audio_channel = None
+
+        self.thread = threading.Thread(target=self._video_worker, daemon=True)
+        self.thread.start()
+
+    def _video_worker(self):
+        try:
+            VideoFileClip = _load_video_clip_class()
+            if VideoFileClip is None:
+                self.failed = True
+                return
+            self.clip = VideoFileClip(self.path)
+            if self.clip.duration <= 0:
+                self.failed = True
+                return
+            self.duration = self.clip.duration
+            if self.clip.audio and pygame.mixer.get_init():
+                threading.Thread(target=self._audio_worker, daemon=True).start()
+
+            fps = self.clip.fps or 30
+            for index, frame in enumerate(self.clip.iter_frames(fps=fps, dtype='uint8')):
+                surf = pygame.surfarray.make_surface(frame.swapaxes(0, 1))
+                if surf.get_size() != self.size:
+                    surf = pygame.transform.scale(surf, self.size)
+                with self.frames_cond:
+                    while len(self.frames) >= VIDEO_BUFFER_FRAMES and not self.stopped:
+                        self.frames_cond.wait()
+                    if self.stopped:
+                        return
+                    self.frames.append((index / fps, surf))
+                self.ready = True
+        except Exception as e:
+            print(f"Error loading video: {e}")
+            if not self.ready:
+                self.failed = True
+
+    def _audio_worker(self):
+        try:
+            freq, _, channels = pygame.mixer.get_init()
+            chunk_size = int(freq * AUDIO_CHUNK_SECONDS)
+            for chunk in self.clip.audio.iter_chunks(chunksize=chunk_size, fps=freq, quantize=True, nbytes=2):
+                if chunk.ndim == 1:
+                    chunk = chunk[:, None]
+                if chunk.shape[1] != channels:
+                    chunk = np.repeat(chunk[:, :1], channels, axis=1)
+                sound = pygame.sndarray.make_sound(np.ascontiguousarray(chunk, dtype=np.int16))
+                while not self.stopped:
+                    try:
+                        self.audio_chunks.put(sound, timeout=0.1)
+                        break
+                    except queue.Full:
+                        pass
+                if self.stopped:
+                    return
+        except Exception as e:
+            print(f"Error decoding video audio: {e}")
+
+    def update_audio(self):
+        """ 主线程每帧调用: 声道上没有排队的段时接上下一段 """
+        if self.stopped or not pygame.mixer.get_init():
+            return
+        if self.audio_channel is None:
+            if self.audio_chunks.empty():
+                return
+            self.audio_channel = pygame.mixer.Channel(SPLASH_AUDIO_CHANNEL)
+        if self.audio_channel.get_busy() and self.audio_channel.get_queue() is not None:
+            return
+        try:
+            sound = self.audio_chunks.get_nowait()
+        except queue.Empty:
+            return
+        if self.audio_channel.get_busy():
+            self.audio_channel.queue(sound)
+        else:
+            self.audio_channel.play(sound)
+
+    def get_frame(self, t):
+        """ 返回时间 t 应显示的帧; 解码落后时保持上一帧 """
+        with self.frames_cond:
+            while self.frames and (self.current is None or self.frames[0][0] <= t):
+                self.current = self.frames.popleft()
+            self.frames_cond.notify()
+        return self.current[1] if self.current else None
+
+    def close(self):
+        self.stopped = True
+        with self.frames_cond:
+            self.frames.clear()
+            self.frames_cond.notify_all()
+        if self.audio_channel:
+            try:
+                self.audio_channel.stop()
+            except: pass
+            self.audio_channel = None
+        if self.thread.is_alive():
+            self.thread.join(timeout=1.0)
+        if self.clip:
+            try:
+                self.clip.close()
+            except: pass
+            self.clip = None
 
 class SplashRenderer:
     def __init__(self, screen):
@@ -57,100 +192,71 @@ class SplashRenderer:
                 video_path = p
                 break
         
+        # 视频在后台线程中打开和解码, 没准备好之前先按静态 logo 计时
+        self.total_duration = self.fade_duration + self.hold_duration
+        self.video_start = None
         if video_path and os.path.exists(video_path):
-            try:
-                self.clip = VideoFileClip(video_path)
-                if self.clip.duration > 0:
-                    # Extract and play audio immediately
-                    if self.clip.audio:
-                        temp_audio = "temp_splash_audio.mp3"
-                        self.clip.audio.write_audiofile(temp_audio, logger=None, fps=44100)
-                        pygame.mixer.music.load(temp_audio)
-                        pygame.mixer.music.play()
-                else:
-                    self.clip = None
-            except Exception as e:
-                print(f"Error loading video: {e}")
-                self.clip = None
-        
-        if not self.clip:
-            self.mode = 'static'
-            self.total_duration = self.fade_duration + self.hold_duration
+            self.clip = SplashVideoStream(video_path, (settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT))
         else:
-            self.mode = 'video'
-            # Video dictates duration, but at least fade_duration + hold_duration
-            self.total_duration = max(self.fade_duration + self.hold_duration, self.clip.duration)
+            self.mode = 'static'
 
     def update(self, dt):
         """
         Update animation state using dt (seconds)
         """
         self.timer += dt
+
+        if self.mode == 'video' and self.clip:
+            if self.clip.failed:
+                self.clip.close()
+                self.clip = None
+                self.mode = 'static'
+            elif self.clip.ready:
+                if self.video_start is None:
+                    # 第一帧准备好时开始计视频时间
+                    self.video_start = self.timer
+                    # Video dictates duration, but at least fade_duration + hold_duration
+                    self.total_duration = max(self.fade_duration + self.hold_duration, self.video_start + self.clip.duration)
+                self.clip.update_audio()
+            else:
+                # 还在加载: 延长等待
+                self.total_duration = max(self.total_duration, self.timer + self.hold_duration)
         
         if self.timer >= self.total_duration:
             self.finished = True
             self.cleanup()
 
-    def get_alpha(self):
+    def get_alpha(self, start=0.0):
         """
-        Calculate alpha based on timer for Fade In effect (0 -> 255)
+        Calculate alpha for Fade In effect (0 -> 255), measured from start (seconds on self.timer)
         """
-        if self.timer < self.fade_duration:
-            return int((self.timer / self.fade_duration) * 255)
+        elapsed = self.timer - start
+        if elapsed < self.fade_duration:
+            return int((max(0.0, elapsed) / self.fade_duration) * 255)
         else:
             return 255
 
     def draw(self):
         self.screen.fill(settings.BLACK)
         
-        alpha = self.get_alpha()
-        
-        if self.mode == 'video' and self.clip:
+        if self.mode == 'video' and self.clip and self.video_start is not None:
             # Video Frame Logic
-            # We sync video frame to self.timer
-            if self.timer < self.clip.duration:
-                try:
-                    frame_time = min(self.timer, self.clip.duration - 0.05)
-                    frame = self.clip.get_frame(frame_time)
-                    frame = frame.swapaxes(0, 1)
-                    surf = pygame.surfarray.make_surface(frame)
-                    
-                    if surf.get_width() != settings.SCREEN_WIDTH or surf.get_height() != settings.SCREEN_HEIGHT:
-                        surf = pygame.transform.scale(surf, (settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT))
-                    
-                    # Apply Alpha to Video Surface
-                    surf.set_alpha(alpha)
-                    self.screen.blit(surf, (0, 0))
-                except Exception as e:
-                    print(f"Error drawing video frame: {e}")
-            else:
-                # Video finished but still holding? Show last frame or black?
-                # Usually just black or last frame. Let's show last frame static if needed, 
-                # but usually video covers the whole duration.
-                pass
+            # 帧已经在后台解码并缩放好, 这里只按视频时间取帧; 淡入从视频开始时算起
+            surf = self.clip.get_frame(self.timer - self.video_start)
+            if surf:
+                # Apply Alpha to Video Surface
+                surf.set_alpha(self.get_alpha(self.video_start))
+                self.screen.blit(surf, (0, 0))
                 
         else:
-            # Static Logic
-            self.logo_surf.set_alpha(alpha)
+            # Static Logic (视频还在后台打开时也先显示静态 logo)
+            self.logo_surf.set_alpha(self.get_alpha())
             self.screen.blit(self.logo_surf, self.logo_rect)
 
     def cleanup(self):
-        if self.mode == 'video' and self.clip:
-            # Check if mixer is initialized before using it
-            if pygame.mixer.get_init():
-                try:
-                    pygame.mixer.music.stop()
-                except: pass
-            
-            try:
-                self.clip.close()
-            except: pass
+        if self.clip:
+            self.clip.close()
             self.clip = None
-            
-        if os.path.exists("temp_splash_audio.mp3"):
-            try:
-                os.remove("temp_splash_audio.mp3")
-            except: pass
 
     def __del__(self):
         self.cleanup()
@@ -10,6 +10,7 @@ if PROJECT_ROOT not in sys.path:
 import config.game_config as settings
 from utils.sound_manager import SoundManager
 from utils.resource_manager import resource_manager
+from utils.input_manager import input_manager
 
 # 引用 Settings 中的全局变量
 game_config = settings.game_config
@@ -133,7 +134,7 @@ class Button:
         img_normal = resource_manager.get_image("ui_button_normal")
         img_hover = resource_manager.get_image("ui_button_hover")
         
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = input_manager.get_mouse_pos()
         is_hover = draw_rect.collidepoint(mouse_pos)
         
         if img_normal and img_hover:
@@ -307,16 +308,17 @@ class Slider:
         self.value = self.min_val + ratio * (self.max_val - self.min_val)
 
 class SaveSlotButton(Button):
-    def __init__(self, x, y, width, height, slot_index, save_data, action):
+    def __init__(self, x, y, width, height, slot_index, save_data, action, title=None):
         super().__init__("", x, y, width, height, action)
         self.slot_index = slot_index
         self.save_data = save_data
+        self.title = title
         
     def draw(self, surface):
         super().draw(surface)
         
         # 绘制存档信息
-        title = f"存档 {self.slot_index + 1}"
+        title = self.title or f"存档 {self.slot_index + 1}"
         if self.save_data:
             info = f"Lv.{self.save_data.get('level', 1)} {self.save_data['char_name']}"
             
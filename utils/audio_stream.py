@@ -0,0 +1,129 @@
+import io
+import time
+import wave
+import pygame
+
+# 每次解码的时长 (秒): 声道上最多只有 "正在播放 + 排队" 两段
+STREAM_CHUNK_SECONDS = 1.0
+
+class StreamingTrack:
+    """
+    循环播放的音乐 / 环境音流。
+    - WAV 文件每次只读取一小段, 转成 Sound 后用 Channel.queue 接在当前段后面, 内存中始终只有两段
+    - 其他格式 (ogg / mp3) 无法分段读取, 退回到整段解码后循环播放
+    - 音量渐变 (交叉淡入淡出) 由 update() 逐帧处理, 淡出到 0 后自动停止
+    需要每帧调用 update() 补充下一段。
+    """
+    def __init__(self, path, chunk_seconds=STREAM_CHUNK_SECONDS):
+        self.path = path
+        self.chunk_seconds = chunk_seconds
+        self.reader = None
+        self.params = None
+        self.sound = None
+        self.channel = None
+
+        self.gain = 1.0          # 配置音量
+        self.volume = 0.0        # 渐变中的音量 (0~1)
+        self.target_volume = 0.0
+        self.fade_speed = 0.0    # 每秒变化量
+        self.last_update = 0.0
+
+    def start(self, channel, fade_sec=0.0):
+        self.stop()
+        self.channel = channel
+        self.volume = 0.0 if fade_sec > 0 else 1.0
+        self.fade_to(1.0, fade_sec)
+        self.last_update = time.time()
+
+        if self.path.lower().endswith('.wav'):
+            self.reader = wave.open(self.path, 'rb')
+            self.params = self.reader.getparams()
+            channel.play(self._next_chunk())
+        else:
+            if self.sound is None:
+                self.sound = pygame.mixer.Sound(self.path)
+            channel.play(self.sound, loops=-1)
+        self._apply_volume()
+
+    def stop(self):
+        if self.channel:
+            self.channel.stop()
+            self.channel = None
+        if self.reader:
+            self.reader.close()
+            self.reader = None
+
+    def is_playing(self):
+        return self.channel is not None
+
+    def fade_to(self, volume, seconds):
+        self.target_volume = volume
+        if seconds <= 0:
+            self.volume = volume
+            self.fade_speed = 0.0
+        else:
+            self.fade_speed = abs(volume - self.volume) / seconds
+
+    def fade_out(self, seconds):
+        self.fade_to(0.0, seconds)
+        if seconds <= 0:
+            self.stop()
+
+    def set_gain(self, gain):
+        self.gain = gain
+        self._apply_volume()
+
+    def _apply_volume(self):
+        if self.channel:
+            self.channel.set_volume(self.gain * self.volume)
+
+    def update(self):
+        if self.channel is None:
+            return
+        now = time.time()
+        dt_sec = now - self.last_update
+        self.last_update = now
+
+        if self.volume != self.target_volume:
+            step = self.fade_speed * dt_sec
+            if step <= 0 or abs(self.target_volume - self.volume) <= step:
+                self.volume = self.target_volume
+            elif self.target_volume > self.volume:
+                self.volume += step
+            else:
+                self.volume -= step
+            if self.volume <= 0 and self.target_volume <= 0:
+                self.stop()
+                return
+            self._apply_volume()
+
+        if self.reader is not None:
+            if not self.channel.get_busy():
+                # 卡顿太久, 已经播完了: 重新开始播放
+                self.channel.play(self._next_chunk())
+                self._apply_volume()
+            elif self.channel.get_queue() is None:
+                self.channel.queue(self._next_chunk())
+
+    def _next_chunk(self):
+        params = self.params
+        frame_size = params.nchannels * params.sampwidth
+        frames = max(1, int(params.framerate * self.chunk_seconds))
+        data = self.reader.readframes(frames)
+        while len(data) < frames * frame_size:
+            # 到结尾了, 从头接上 (循环)
+            self.reader.rewind()
+            more = self.reader.readframes(frames - len(data) // frame_size)
+            if not more:
+                break
+            data += more
+
+        # 包成内存中的 WAV, 采样率 / 格式由 mixer 负责转换
+        buf = io.BytesIO()
+        with wave.open(buf, 'wb') as writer:
+            writer.setnchannels(params.nchannels)
+            writer.setsampwidth(params.sampwidth)
+            writer.setframerate(params.framerate)
+            writer.writeframes(data)
+        buf.seek(0)
+        return pygame.mixer.Sound(file=buf)
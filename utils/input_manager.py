@@ -0,0 +1,297 @@
+import json
+import struct
+import random
+import pygame
+import config.game_config as settings
+
+# 录像文件格式 (小端):
+#   MAGIC | u32 头部长度 | 头部 JSON (utf-8)
+#   之后每一帧:
+#     u16 dt(ms) | i16 mouse_x | i16 mouse_y | u8 鼠标按键位 | u8 按下键数 | u8 事件数
+#     按下键数 * u16 键码
+#     事件数 * (u8 类型 | i32 key/button | i16 x | i16 y | u8 unicode 长度 | unicode utf-8)
+REPLAY_MAGIC = b"CURP1"
+REPLAY_VERSION = 1
+
+_FRAME_STRUCT = struct.Struct("<HhhBBB")
+_KEY_STRUCT = struct.Struct("<H")
+_EVENT_STRUCT = struct.Struct("<BihhB")
+_HEADER_LEN_STRUCT = struct.Struct("<I")
+
+# 只录制游戏逻辑会读取的事件类型
+_EVENT_CODES = {
+    pygame.QUIT: 0,
+    pygame.KEYDOWN: 1,
+    pygame.KEYUP: 2,
+    pygame.MOUSEBUTTONDOWN: 3,
+    pygame.MOUSEBUTTONUP: 4,
+    pygame.MOUSEMOTION: 5,
+}
+_EVENT_TYPES = {code: ev_type for ev_type, code in _EVENT_CODES.items()}
+
+# 键盘状态数组长度 (与 pygame.key.get_pressed() 的长度保持一致, 让 code < len(keys) 判断不变)
+_KEY_STATE_LEN = 512
+
+
+def _clamp_i16(v):
+    return max(-32768, min(32767, int(v)))
+
+
+def build_replay_header(seed=None):
+    """ 录像头部: 随机种子 + 影响游戏逻辑的配置 (分辨率影响瞄准和刷怪范围) """
+    if seed is None:
+        seed = random.randrange(2 ** 31)
+    return {
+        'version': REPLAY_VERSION,
+        'game_version': settings.GAME_VERSION,
+        'seed': seed,
+        'resolution': list(settings.game_config['resolution']),
+        'tutorial_completed': settings.game_config.get('tutorial_completed', False),
+        'key_bindings': dict(settings.game_config['key_bindings']),
+    }
+
+
+class KeyState:
+    """ 回放用的键盘状态, 行为与 pygame.key.get_pressed() 返回值一致 """
+    def __init__(self, pressed_codes):
+        self.pressed = frozenset(pressed_codes)
+
+    def __getitem__(self, code):
+        return code in self.pressed
+
+    def __len__(self):
+        return _KEY_STATE_LEN
+
+
+class InputFrame:
+    def __init__(self, dt, events, keys, mouse_pos, mouse_buttons):
+        self.dt = dt
+        self.events = events
+        self.keys = keys
+        self.mouse_pos = mouse_pos
+        self.mouse_buttons = mouse_buttons
+
+
+class InputRecorder:
+    def __init__(self, path, header):
+        self.path = path
+        self.file = open(path, "wb")
+        header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+        self.file.write(REPLAY_MAGIC)
+        self.file.write(_HEADER_LEN_STRUCT.pack(len(header_bytes)))
+        self.file.write(header_bytes)
+        self.frame_count = 0
+
+    def write_frame(self, frame):
+        # 只记录当前绑定到动作上的键盘按键, 其余按键游戏逻辑不会读取
+        pressed = []
+        for code in set(settings.game_config['key_bindings'].values()):
+            if 0 < code < len(frame.keys) and frame.keys[code]:
+                pressed.append(code)
+
+        buttons = 0
+        for i, down in enumerate(frame.mouse_buttons[:3]):
+            if down:
+                buttons |= 1 << i
+
+        events = []
+        for event in frame.events:
+            if event.type in _EVENT_CODES:
+                events.append(event)
+
+        chunks = [_FRAME_STRUCT.pack(
+            min(int(frame.dt), 65535),
+            _clamp_i16(frame.mouse_pos[0]), _clamp_i16(frame.mouse_pos[1]),
+            buttons, len(pressed), min(len(events), 255)
+        )]
+        for code in pressed:
+            chunks.append(_KEY_STRUCT.pack(code))
+        for event in events[:255]:
+            code = getattr(event, 'key', getattr(event, 'button', 0))
+            pos = getattr(event, 'pos', (0, 0))
+            text = getattr(event, 'unicode', '').encode("utf-8")[:255]
+            chunks.append(_EVENT_STRUCT.pack(
+                _EVENT_CODES[event.type], code, _clamp_i16(pos[0]), _clamp_i16(pos[1]), len(text)
+            ))
+            chunks.append(text)
+
+        self.file.write(b"".join(chunks))
+        self.frame_count += 1
+        # 崩溃复现需要保留崩溃前的全部输入, 每 60 帧落盘一次
+        if self.frame_count % 60 == 0:
+            self.file.flush()
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+            print(f"[Input] Recorded {self.frame_count} frames to {self.path}")
+
+
+class InputReplayer:
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            data = f.read()
+        if not data.startswith(REPLAY_MAGIC):
+            raise ValueError(f"Not a replay file: {path}")
+
+        offset = len(REPLAY_MAGIC)
+        (header_len,) = _HEADER_LEN_STRUCT.unpack_from(data, offset)
+        offset += _HEADER_LEN_STRUCT.size
+        self.header = json.loads(data[offset:offset + header_len].decode("utf-8"))
+        offset += header_len
+
+        self.frames = self._parse_frames(data, offset)
+        self.index = 0
+
+    def _parse_frames(self, data, offset):
+        frames = []
+        size = len(data)
+        while offset + _FRAME_STRUCT.size <= size:
+            dt, mx, my, buttons, n_keys, n_events = _FRAME_STRUCT.unpack_from(data, offset)
+            offset += _FRAME_STRUCT.size
+
+            pressed = []
+            for _ in range(n_keys):
+                pressed.append(_KEY_STRUCT.unpack_from(data, offset)[0])
+                offset += _KEY_STRUCT.size
+
+            events = []
+            for _ in range(n_events):
+                ev_code, code, ex, ey, text_len = _EVENT_STRUCT.unpack_from(data, offset)
+                offset += _EVENT_STRUCT.size
+                text = data[offset:offset + text_len].decode("utf-8", errors="ignore")
+                offset += text_len
+                events.append(self._make_event(_EVENT_TYPES[ev_code], code, (ex, ey), text))
+
+            mouse_buttons = (bool(buttons & 1), bool(buttons & 2), bool(buttons & 4))
+            frames.append(InputFrame(dt, events, KeyState(pressed), (mx, my), mouse_buttons))
+
+        if offset != size:
+            # 录制时崩溃可能留下半帧, 直接丢弃
+            print(f"[Input] Replay {self.path} ends with a truncated frame, ignored")
+        return frames
+
+    def _make_event(self, ev_type, code, pos, text):
+        if ev_type in (pygame.KEYDOWN, pygame.KEYUP):
+            return pygame.event.Event(ev_type, key=code, unicode=text, mod=0)
+        if ev_type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+            return pygame.event.Event(ev_type, button=code, pos=pos)
+        if ev_type == pygame.MOUSEMOTION:
+            return pygame.event.Event(ev_type, pos=pos, rel=(0, 0), buttons=(0, 0, 0))
+        return pygame.event.Event(ev_type)
+
+    def finished(self):
+        return self.index >= len(self.frames)
+
+    def next_frame(self):
+        frame = self.frames[self.index]
+        self.index += 1
+        return frame
+
+
+class InputManager:
+    """
+    输入抽象层: 游戏逻辑统一从这里读取事件 / 键盘 / 鼠标状态。
+    每帧由 begin_frame() 采样一次, 可以同时录制到文件, 或者从录像文件回放。
+    begin_frame() 从未调用过时 (例如脚本直接驱动 update) 直接读取 pygame。
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(InputManager, cls).__new__(cls)
+            cls._instance.frame = None
+            cls._instance.recorder = None
+            cls._instance.replayer = None
+        return cls._instance
+
+    # --- 录制 / 回放控制 ---
+    def start_recording(self, path, seed=None):
+        """ 开始录制。需要在创建 GameManager 之前调用, 这样随机种子才能覆盖地图生成 """
+        header = build_replay_header(seed)
+        random.seed(header['seed'])
+        self.recorder = InputRecorder(path, header)
+        print(f"[Input] Recording to {path} (seed={header['seed']})")
+        return header
+
+    def start_replay(self, path):
+        """ 加载录像并还原录制时的随机种子和配置。同样需要在创建 GameManager 之前调用 """
+        self.replayer = InputReplayer(path)
+        header = self.replayer.header
+        if header.get('version') != REPLAY_VERSION:
+            print(f"[Input] Warning: replay version {header.get('version')} != {REPLAY_VERSION}")
+
+        random.seed(header['seed'])
+        # 回放期间不写回 config.json
+        settings.CONFIG_READONLY = True
+        settings.game_config['resolution'] = tuple(header['resolution'])
+        settings.game_config['fullscreen'] = False
+        settings.game_config['tutorial_completed'] = header.get('tutorial_completed', False)
+        settings.game_config['key_bindings'].update(header['key_bindings'])
+        settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT = settings.game_config['resolution']
+        print(f"[Input] Replaying {path}: {len(self.replayer.frames)} frames (seed={header['seed']})")
+        return header
+
+    def is_replaying(self):
+        return self.replayer is not None
+
+    def stop(self):
+        if self.recorder:
+            self.recorder.close()
+            self.recorder = None
+        self.replayer = None
+        self.frame = None
+
+    # --- 每帧采样 ---
+    def begin_frame(self, dt):
+        """ 采样本帧输入。回放时返回录像中的 dt, 录像播放完毕返回 None """
+        if self.replayer:
+            if self.replayer.finished():
+                return None
+            self.frame = self.replayer.next_frame()
+            return self.frame.dt
+
+        self.frame = InputFrame(
+            dt,
+            pygame.event.get(),
+            pygame.key.get_pressed(),
+            pygame.mouse.get_pos(),
+            pygame.mouse.get_pressed(),
+        )
+        if self.recorder:
+            self.recorder.write_frame(self.frame)
+        return dt
+
+    def feed_frame(self, frame):
+        """ 直接提供本帧输入 (批量模拟的脚本策略使用), 不经过录制 / 回放 """
+        self.frame = frame
+        return frame.dt
+
+    # --- 查询接口 ---
+    def get_events(self):
+        if self.frame is None:
+            return pygame.event.get()
+        events = self.frame.events
+        # 事件只能被消费一次
+        self.frame.events = []
+        return events
+
+    def get_pressed(self):
+        if self.frame is None:
+            return pygame.key.get_pressed()
+        return self.frame.keys
+
+    def get_mouse_pos(self):
+        if self.frame is None:
+            return pygame.mouse.get_pos()
+        return self.frame.mouse_pos
+
+    def get_mouse_pressed(self):
+        if self.frame is None:
+            return pygame.mouse.get_pressed()
+        return self.frame.mouse_buttons
+
+# 全局实例
+input_manager = InputManager()
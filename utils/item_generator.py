@@ -1,6 +1,8 @@
 import random
 import copy
 from core.item import Equipment
+from utils.random_utils import weighted_choice
+from config.drop_config import DEFAULT_RARITY_WEIGHTS
 
 # --- Configuration ---
 
@@ -91,8 +93,7 @@ def generate_equipment(template, rarity=None):
     """
     if not rarity:
         # Default weighted random rarity
-        weights = {'white': 50, 'green': 30, 'blue': 15, 'purple': 4, 'orange': 1}
-        rarity = random.choices(list(weights.keys()), weights=list(weights.values()), k=1)[0]
+        rarity = weighted_choice(DEFAULT_RARITY_WEIGHTS)
         
     # 1. Base Info
     item_id = template['id']
@@ -0,0 +1,83 @@
+import random
+
+class AliasTable:
+    """
+    Walker/Vose 别名表: 构建 O(n), 每次抽样 O(1)。
+    抽样只使用 random 模块, 保证录像回放时结果可复现。
+    """
+    __slots__ = ('items', 'prob', 'alias', 'n')
+
+    def __init__(self, items, weights):
+        items = list(items)
+        weights = [max(0.0, float(w)) for w in weights]
+        total = sum(weights)
+        if not items or total <= 0:
+            raise ValueError("AliasTable needs at least one positive weight")
+
+        n = len(items)
+        scaled = [w * n / total for w in weights]
+        prob = [0.0] * n
+        alias = list(range(n))
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] = scaled[l] + scaled[s] - 1.0
+            if scaled[l] < 1.0:
+                small.append(l)
+            else:
+                large.append(l)
+        # 剩余的都是 (浮点误差下) 概率为 1 的格子
+        for i in large + small:
+            prob[i] = 1.0
+
+        self.items = items
+        self.prob = prob
+        self.alias = alias
+        self.n = n
+
+    def sample(self):
+        # 一个随机数同时决定格子和格内的硬币
+        u = random.random() * self.n
+        i = int(u)
+        if u - i < self.prob[i]:
+            return self.items[i]
+        return self.items[self.alias[i]]
+
+    def sample_n(self, count):
+        """ 批量抽样, 大量掉落同时结算时使用 """
+        items, prob, alias, n = self.items, self.prob, self.alias, self.n
+        rand = random.random
+        result = []
+        for _ in range(count):
+            u = rand() * n
+            i = int(u)
+            result.append(items[i] if u - i < prob[i] else items[alias[i]])
+        return result
+
+
+# 按权重内容缓存编译好的别名表 (权重字典通常是常量或按幸运值缓存的结果)
+_alias_cache = {}
+_ALIAS_CACHE_MAX = 256
+
+def get_alias_table(weights):
+    """ weights: dict {item: weight}。相同内容的权重只编译一次 """
+    key = tuple(weights.items())
+    table = _alias_cache.get(key)
+    if table is None:
+        if len(_alias_cache) >= _ALIAS_CACHE_MAX:
+            _alias_cache.clear()
+        table = AliasTable(weights.keys(), weights.values())
+        _alias_cache[key] = table
+    return table
+
+def weighted_choice(weights):
+    """ 等价于 random.choices(keys, weights=values, k=1)[0], 但使用缓存的别名表 """
+    return get_alias_table(weights).sample()
+
+def clear_alias_cache():
+    _alias_cache.clear()
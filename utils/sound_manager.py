@@ -3,6 +3,52 @@ import os
 import config.game_config as settings
 import time
 import random
+from utils.audio_stream import StreamingTrack
+
+# 音效类别: (名称前缀, 类别), 按顺序匹配, 未匹配的归入 'sfx'
+SOUND_CATEGORIES = (
+    ('hit_', 'hit'),
+    ('lightning_hit', 'hit'),
+    ('collision', 'hit'),
+    ('explosion', 'hit'),
+    ('death', 'death'),
+    ('ui_', 'ui'),
+    ('level_up', 'ui'),
+    ('error', 'ui'),
+    ('xp_pickup', 'pickup'),
+    ('step_', 'footstep'),
+)
+
+# 每个类别同时播放的最大声部数
+CATEGORY_VOICE_LIMITS = {'hit': 4, 'death': 4, 'ui': 4, 'pickup': 3, 'footstep': 1, 'sfx': 8}
+
+# 类别重要程度 (越大越优先)
+CATEGORY_PRIORITY = {'ui': 5, 'death': 4, 'sfx': 3, 'hit': 2, 'pickup': 1, 'footstep': 0}
+
+# 必须播放的音效, 没有空闲声道时抢占
+CRITICAL_SOUNDS = {'level_up', 'ui_upgrade', 'death_square', 'death_triangle', 'death_circle'}
+
+# 同名音效的最短间隔 (秒)
+THROTTLE_DEFAULT = 0.05
+THROTTLE_BY_CATEGORY = {'hit': 0.08, 'pickup': 0.08}
+
+# 同一帧内合并的事件每多一个, 音量增加的比例 (上限为 1.0)
+COALESCE_VOLUME_STEP = 0.15
+
+# 距离对优先级的影响: 超过这个距离的音效排在同类别最后
+PRIORITY_DISTANCE = 1500.0
+
+# 空间音效: 距离听者 SPATIAL_MIN_DIST 以内全音量, 之后线性衰减, SPATIAL_MAX_DIST 以外听不到 (不占用声道)
+SPATIAL_MIN_DIST = 400.0
+SPATIAL_MAX_DIST = 1600.0
+# 横向偏移达到 SPATIAL_PAN_RANGE 时完全偏向一侧声道
+SPATIAL_PAN_RANGE = 900.0
+# 低于这个音量的音效直接跳过
+MIN_AUDIBLE_VOLUME = 0.02
+
+# 这些目录下的长音轨 (音乐 / 环境音) 流式播放, 其余短音效整段解码为 Sound
+STREAM_FOLDERS = ('bgm', 'ambience')
+AMBIENCE_FADE_SECONDS = 1.0
 
 class SoundManager:
     _instance = None
@@ -20,17 +66,30 @@ class SoundManager:
         self.sounds = {}
         self.last_played = {} # {name: timestamp} for throttling
         self.initialized = True
+
+        # 音效事件总线: name -> [本帧次数, 离听者最近的距离平方, 最近一次的横向偏移 (无位置时为 None)]
+        self.pending_events = {}
+        self.categories = {} # name -> category 缓存
+        self.voices = {cat: [] for cat in CATEGORY_VOICE_LIMITS} # category -> [(priority, channel, sound)]
+        self.listener_pos = None
+
+        # 音量缓存 (配置变化时由 update_volumes 刷新)
+        self.sfx_volume = 1.0
+        self.bgm_volume = 1.0
+        self.ambient_volume = 1.0
         
+        self.stream_paths = {} # name -> path (流式播放的音轨)
+
         # Ambience State
         self.current_ambience = None
         self.ambience_channel = None
-        self.ambience_fade_start = 0
-        self.ambience_fade_duration = 2.0
-        self.target_ambience = None
         self.next_ambience_channel = None # For cross-fading
+        self.ambience_track = None
+        self.fading_ambience_track = None
         
         # BGM State
         self.bgm_channel = None
+        self.bgm_track = None
         
         # Initialize mixer if not already done
         if not pygame.mixer.get_init():
@@ -74,10 +133,15 @@ class SoundManager:
 
         print(f"Loading sounds from {sound_dir}...")
         for root, dirs, files in os.walk(sound_dir):
+            folder = os.path.relpath(root, sound_dir).split(os.sep)[0]
             for filename in files:
                 if filename.endswith(('.wav', '.ogg', '.mp3')):
                     name = os.path.splitext(filename)[0]
                     path = os.path.join(root, filename)
+                    if folder in STREAM_FOLDERS:
+                        # 播放时再分段解码
+                        self.stream_paths[name] = path
+                        continue
                     try:
                         sound = pygame.mixer.Sound(path)
                         self.sounds[name] = sound
@@ -85,105 +149,183 @@ class SoundManager:
                     except Exception as e:
                         print(f"Failed to load sound {filename}: {e}")
 
+    def _play_bgm(self, name):
+        if self.bgm_track:
+            self.bgm_track.stop()
+            self.bgm_track = None
+        if self.bgm_channel and name in self.stream_paths:
+            try:
+                self.bgm_track = StreamingTrack(self.stream_paths[name])
+                self.bgm_track.gain = self.bgm_volume * 0.5
+                self.bgm_track.start(self.bgm_channel)
+            except Exception as e:
+                print(f"Error playing bgm {name}: {e}")
+                self.bgm_track = None
+            return True
+        return False
+
     def play_game_bgm(self):
-        if self.bgm_channel and 'bgm_game' in self.sounds:
-            bgm_vol = settings.game_config.get('bgm_volume', 1.0) * settings.game_config.get('master_volume', 1.0)
-            self.bgm_channel.set_volume(bgm_vol * 0.5)
-            self.bgm_channel.play(self.sounds['bgm_game'], loops=-1)
+        self._play_bgm('bgm_game')
 
     def play_menu_bgm(self):
         # Placeholder for menu BGM
-        if self.bgm_channel and 'bgm_menu' in self.sounds:
-            bgm_vol = settings.game_config.get('bgm_volume', 1.0) * settings.game_config.get('master_volume', 1.0)
-            self.bgm_channel.set_volume(bgm_vol * 0.5)
-            self.bgm_channel.play(self.sounds['bgm_menu'], loops=-1)
-        else:
+        if not self._play_bgm('bgm_menu'):
             # If no menu bgm, maybe stop game bgm?
             if self.bgm_channel:
                 self.bgm_channel.stop()
 
-    def play_sound(self, name):
+    def update_streams(self):
+        """ 每帧调用: 给音乐 / 环境音补充下一段, 推进交叉淡入淡出 """
+        for track in (self.bgm_track, self.ambience_track, self.fading_ambience_track):
+            if track is not None:
+                try:
+                    track.update()
+                except Exception as e:
+                    print(f"Error streaming {track.path}: {e}")
+                    track.stop()
+        if self.fading_ambience_track and not self.fading_ambience_track.is_playing():
+            self.fading_ambience_track = None
+
+    def get_category(self, name):
+        category = self.categories.get(name)
+        if category is None:
+            category = 'sfx'
+            for prefix, cat in SOUND_CATEGORIES:
+                if name.startswith(prefix):
+                    category = cat
+                    break
+            self.categories[name] = category
+        return category
+
+    def set_listener(self, pos):
+        """ 听者位置 (玩家), 用于按距离排列音效优先级 """
+        self.listener_pos = pos
+
+    def play_sound(self, name, world_pos=None):
         """
         Play a sound by name.
+        只把事件记入本帧的事件总线, 由 flush_events() 在帧末统一合并 / 限制声部后播放。
+        world_pos: 世界坐标, 提供时按与听者的距离衰减并左右声道平衡, 太远直接跳过。
         """
-        if name in self.sounds:
+        if name not in self.sounds:
+            # Silent fail for missing sounds to avoid spamming console
+            return
+
+        dist_sq = 0.0
+        dx = None
+        if world_pos is not None and self.listener_pos is not None:
+            dx = world_pos[0] - self.listener_pos[0]
+            dy = world_pos[1] - self.listener_pos[1]
+            dist_sq = dx * dx + dy * dy
+            if dist_sq >= SPATIAL_MAX_DIST * SPATIAL_MAX_DIST:
+                return # 听不到, 不进入事件总线
+
+        event = self.pending_events.get(name)
+        if event is None:
+            self.pending_events[name] = [1, dist_sq, dx]
+        else:
+            event[0] += 1
+            if dist_sq < event[1]:
+                event[1] = dist_sq
+                event[2] = dx
+
+    def _priority(self, name, category, dist_sq):
+        score = CATEGORY_PRIORITY[category]
+        if name in CRITICAL_SOUNDS:
+            score += 10
+        # 同类别内越近越优先
+        return score + 0.99 * (1.0 - min(dist_sq ** 0.5 / PRIORITY_DISTANCE, 1.0))
+
+    def _active_voices(self, category):
+        voices = [v for v in self.voices[category] if v[1].get_busy() and v[1].get_sound() is v[2]]
+        self.voices[category] = voices
+        return voices
+
+    def flush_events(self):
+        """ 每帧调用一次: 合并同名事件, 按优先级播放, 每个类别不超过声部上限 """
+        if not self.pending_events:
+            return
+        events = self.pending_events
+        self.pending_events = {}
+
+        now = time.time()
+        queue = []
+        for name, (count, dist_sq, dx) in events.items():
+            category = self.get_category(name)
+            threshold = THROTTLE_BY_CATEGORY.get(category, THROTTLE_DEFAULT)
+            if now - self.last_played.get(name, 0) < threshold:
+                continue # Skip playing to prevent spam/starvation
+            gain = self._distance_gain(dist_sq) if dx is not None else 1.0
+            # 合并的事件越多音量越大
+            volume = min(1.0, self.sfx_volume * gain * (1.0 + COALESCE_VOLUME_STEP * (count - 1)))
+            if volume < MIN_AUDIBLE_VOLUME:
+                continue
+            queue.append((self._priority(name, category, dist_sq), name, category, volume, dx))
+        queue.sort(key=lambda item: item[0], reverse=True)
+
+        for priority, name, category, volume, dx in queue:
             try:
-                # 1. Throttling for high-frequency sounds
-                current_time = time.time()
-                last_time = self.last_played.get(name, 0)
-                
-                # Default throttle threshold
-                threshold = 0.05 
-                
-                # Stricter throttle for XP pickup and hits
-                if name == 'xp_pickup': threshold = 0.08
-                elif name.startswith('hit_'): threshold = 0.08
-                
-                if current_time - last_time < threshold:
-                    return # Skip playing to prevent spam/starvation
-                
-                self.last_played[name] = current_time
-
-                # 2. Volume Calculation
-                vol = settings.game_config.get('sfx_volume', 1.0)
-                master = settings.game_config.get('master_volume', 1.0)
-                final_vol = vol * master
-                
-                self.sounds[name].set_volume(final_vol)
-                
-                # 3. Priority Playback
-                # Force play for critical sounds
-                force_play = False
-                if name in ['level_up', 'ui_upgrade', 'death_square', 'death_triangle', 'death_circle']:
-                    force_play = True
-                
-                if force_play:
-                    # Try to find an available channel, or force grab one
-                    channel = pygame.mixer.find_channel(force=True)
-                    if channel:
-                        channel.play(self.sounds[name])
-                    else:
-                        # Fallback (should rarely happen with 32 channels and force=True)
-                        self.sounds[name].play()
-                else:
-                    # Normal play (finds empty channel automatically)
-                    self.sounds[name].play()
-                    
+                self._play_voice(priority, name, category, volume, dx)
+                self.last_played[name] = now
             except Exception as e:
                 print(f"Error playing sound {name}: {e}")
+
+    def _distance_gain(self, dist_sq):
+        if dist_sq <= SPATIAL_MIN_DIST * SPATIAL_MIN_DIST:
+            return 1.0
+        dist = dist_sq ** 0.5
+        return max(0.0, 1.0 - (dist - SPATIAL_MIN_DIST) / (SPATIAL_MAX_DIST - SPATIAL_MIN_DIST))
+
+    def _play_voice(self, priority, name, category, volume, dx):
+        voices = self._active_voices(category)
+        channel = None
+        if len(voices) >= CATEGORY_VOICE_LIMITS[category]:
+            # 类别已满: 抢占同类别中优先级最低的声部
+            lowest = min(voices, key=lambda v: v[0])
+            if lowest[0] >= priority:
+                return
+            voices.remove(lowest)
+            channel = lowest[1]
+            channel.stop()
+
+        if channel is None:
+            channel = pygame.mixer.find_channel(force=name in CRITICAL_SOUNDS)
+            if channel is None:
+                return
+
+        sound = self.sounds[name]
+        channel.play(sound)
+        # set_volume 需要在 play 之后调用 (play 会重置双声道音量)
+        if dx is None:
+            channel.set_volume(volume)
         else:
-            # Silent fail for missing sounds to avoid spamming console
-            pass
+            # 左右声道平衡: 正前方两侧都是原音量, 偏向一侧时另一侧减弱
+            pan = max(-1.0, min(1.0, dx / SPATIAL_PAN_RANGE))
+            channel.set_volume(volume * min(1.0, 1.0 - pan), volume * min(1.0, 1.0 + pan))
+        voices.append((priority, channel, sound))
 
     def update_volumes(self):
         """
-        Update volume for currently playing sounds (Music mainly, but here we handle global mixer too if needed)
-        Sound objects volume is set on play.
+        音量配置变化时调用: 刷新音量缓存和正在播放的音乐 / 环境音。
+        音效的音量在播放时设置到声道上, Sound 对象本身保持 1.0。
         """
-        # Update volume for all loaded sound objects immediately
-        sfx_vol = settings.game_config.get('sfx_volume', 1.0)
         master = settings.game_config.get('master_volume', 1.0)
-        bgm_vol = settings.game_config.get('bgm_volume', 1.0)
-        amb_vol = settings.game_config.get('ambient_volume', 1.0)
-        
-        final_sfx = sfx_vol * master
-        final_bgm = bgm_vol * master
-        final_amb = amb_vol * master
+        self.sfx_volume = settings.game_config.get('sfx_volume', 1.0) * master
+        self.bgm_volume = settings.game_config.get('bgm_volume', 1.0) * master
+        self.ambient_volume = settings.game_config.get('ambient_volume', 1.0) * master
         
         # Update SFX sounds
-        for name, sound in self.sounds.items():
-            if not name.startswith('bgm_') and not name.startswith('ambience_'):
-                sound.set_volume(final_sfx)
+        for sound in self.sounds.values():
+            sound.set_volume(1.0)
         
-        # Update BGM Channel
-        if self.bgm_channel:
-            self.bgm_channel.set_volume(final_bgm * 0.5)
+        # Update BGM Stream
+        if self.bgm_track:
+            self.bgm_track.set_gain(self.bgm_volume * 0.5)
             
-        # Update Ambience Channels
-        if self.ambience_channel:
-            self.ambience_channel.set_volume(final_amb)
-        if self.next_ambience_channel:
-            self.next_ambience_channel.set_volume(final_amb)
+        # Update Ambience Streams
+        for track in (self.ambience_track, self.fading_ambience_track):
+            if track:
+                track.set_gain(self.ambient_volume)
 
     def set_ambience(self, biome_type):
         target_name = None
@@ -198,40 +340,27 @@ class SoundManager:
             
         self.current_ambience = target_name
         
-        # Simple switch for now (Cross-fade logic is complex without per-frame update)
-        # We'll just stop current and play new if exists
-        
-        amb_vol = settings.game_config.get('ambient_volume', 1.0) * settings.game_config.get('master_volume', 1.0)
-        
-        # Crossfade:
-        # 1. Fade out current channel
-        if self.ambience_channel:
-            self.ambience_channel.fadeout(1000)
+        # Crossfade (per-frame volume ramp in update_streams):
+        # 1. Fade out current track
+        if self.fading_ambience_track:
+            self.fading_ambience_track.stop()
+        self.fading_ambience_track = self.ambience_track
+        self.ambience_track = None
+        if self.fading_ambience_track:
+            self.fading_ambience_track.fade_out(AMBIENCE_FADE_SECONDS)
         
-        # 2. Start new channel (if we have a sound)
-        if target_name and target_name in self.sounds:
-            # Swap channels for simple crossfade simulation
-            # We use next_ambience_channel as the "incoming" channel
-            
-            # Ensure next channel is free or stop it
-            # Actually, we should swap the references so self.ambience_channel ALWAYS points to the active one
-            
-            # Swap references
+        # 2. Start new track on the other channel (if we have a sound)
+        if target_name and target_name in self.stream_paths and self.ambience_channel:
+            # Swap references so self.ambience_channel ALWAYS points to the active one
             self.ambience_channel, self.next_ambience_channel = self.next_ambience_channel, self.ambience_channel
-            
-            # Stop whatever was on the new 'active' channel (it was the old 'next', possibly playing fading out sound?)
-            # No, if we swap, the 'old active' (now next) is fading out.
-            # The 'new active' (was next) might be free or busy.
-            
-            # Force stop new active channel to be sure
-            self.ambience_channel.stop()
-            
-            sound = self.sounds[target_name]
-            sound.set_volume(amb_vol)
-            self.ambience_channel.play(sound, loops=-1, fade_ms=1000)
-        else:
-            # If no target sound (e.g. silence), just fade out current and set current to None logic
-            pass
+            try:
+                self.ambience_track = StreamingTrack(self.stream_paths[target_name])
+                self.ambience_track.gain = self.ambient_volume
+                self.ambience_track.start(self.ambience_channel, fade_sec=AMBIENCE_FADE_SECONDS)
+            except Exception as e:
+                print(f"Error playing ambience {target_name}: {e}")
+                self.ambience_track = None
+        # If no target sound (e.g. silence), the current track just fades out
 
     def play_footstep(self, biome_type):
         sound_name = "step_grass"
@@ -0,0 +1,126 @@
+import sys
+import time
+import builtins
+import threading
+import contextlib
+import importlib.util
+
+class _ImportNode:
+    __slots__ = ('name', 'total', 'children')
+
+    def __init__(self, name):
+        self.name = name
+        self.total = 0.0
+        self.children = []
+
+    def self_time(self):
+        return self.total - sum(c.total for c in self.children)
+
+class StartupProfiler:
+    """
+    启动耗时分析 (python main.py --profile-startup):
+    - 替换 builtins.__import__, 记录每个模块导入的累计 / 自身耗时, 按导入关系组成树
+    - section(label) 记录各个初始化步骤的耗时, 可以嵌套
+    - report() 打印结果。未启用时 section() 几乎没有开销
+    只统计主线程的导入, 后台线程 (存档 / 开场视频) 的导入直接放行。
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(StartupProfiler, cls).__new__(cls)
+            cls._instance.initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self.initialized:
+            return
+        self.initialized = True
+        self.enabled = False
+        self.start_time = 0.0
+        self.root = _ImportNode('<startup>')
+        self.stack = []
+        self.sections = [] # [(depth, label, seconds)]
+        self.section_depth = 0
+        self.thread_id = None
+        self._original_import = None
+
+    def enable(self):
+        if self.enabled:
+            return
+        self.enabled = True
+        self.start_time = time.perf_counter()
+        self.thread_id = threading.get_ident()
+        self.stack = [self.root]
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._import
+
+    def disable(self):
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+        self.enabled = False
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original = self._original_import
+        if threading.get_ident() != self.thread_id:
+            return original(name, globals, locals, fromlist, level)
+
+        label = name
+        if level > 0 and globals:
+            try:
+                label = importlib.util.resolve_name('.' * level + name, globals.get('__package__'))
+            except Exception:
+                pass
+        node = _ImportNode(label)
+        before = len(sys.modules)
+        self.stack.append(node)
+        start = time.perf_counter()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            node.total = time.perf_counter() - start
+            self.stack.pop()
+            # 已经导入过的模块不计入
+            if len(sys.modules) != before:
+                self.stack[-1].children.append(node)
+
+    @contextlib.contextmanager
+    def section(self, label):
+        if not self.enabled:
+            yield
+            return
+        entry = [self.section_depth, label, 0.0]
+        self.sections.append(entry)
+        self.section_depth += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry[2] = time.perf_counter() - start
+            self.section_depth -= 1
+
+    def report(self, min_ms=1.0, max_depth=6):
+        """ 打印导入树 (累计 / 自身毫秒) 和初始化耗时, 低于 min_ms 或深于 max_depth 的节点不显示 """
+        if not self.enabled:
+            return
+        self.root.total = sum(c.total for c in self.root.children)
+        print("=" * 60)
+        print(f"Startup Profile: {(time.perf_counter() - self.start_time) * 1000:.1f} ms since enable()")
+        print(f"-- Imports (cumulative / self ms), total {self.root.total * 1000:.1f} ms --")
+        self._print_node(self.root, 0, min_ms, max_depth)
+        print("-- Initializers (ms) --")
+        for depth, label, seconds in self.sections:
+            print(f"{'  ' * depth}{label}: {seconds * 1000:.1f}")
+        print("=" * 60)
+
+    def _print_node(self, node, depth, min_ms, max_depth):
+        if depth >= max_depth:
+            return
+        for child in sorted(node.children, key=lambda c: c.total, reverse=True):
+            if child.total * 1000 < min_ms:
+                continue
+            print(f"{'  ' * depth}{child.name}: {child.total * 1000:.1f} / {child.self_time() * 1000:.1f}")
+            self._print_node(child, depth + 1, min_ms, max_depth)
+
+startup_profiler = StartupProfiler()